@@ -1,64 +1,556 @@
 """Universal interface for interacting with various AI APIs."""
 
-from typing import Any, Dict, Optional, Union, List, Type
-from .text.text import TextProvider
-from .image.image import ImageProvider
-from .audio.audio import AudioProvider
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import aclosing
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
+
 from .core.base import BaseProvider
+from .core.batch import BatchResult, build_call, run_batch
+from .core.bind import BoundCall
+from .core.breaker import breakers
+from .core.cache import Cache, is_cacheable, make_key
+from .core.concurrency import concurrency
+from .core.fallback import (
+    Route,
+    arun_chain,
+    as_hop,
+    fallback_policies,
+    hop_kwargs,
+    last_route,
+    run_chain,
+)
+from .core.hedge import hedger
+from .core.metrics import current_record, metrics
+from .core.pool import clients
+from .core.ratelimit import rate_limiter
+from .core.registry import registry
+from .core.retry import retry_policies
+from .core.router import router
+from .core.sink import is_path
+from .core.streaming import StreamEvent, is_stream
 
 
 class APICenter:
     """Universal class for managing AI API interactions."""
 
-    def __init__(self) -> None:
+    def __init__(self, max_workers: int = 16, cache: Optional[Cache] = None) -> None:
         """Initialize the APICenter with available providers for each mode."""
-        # Dictionary of supported providers for each mode
-        self.providers: Dict[str, Dict[str, Type[BaseProvider]]] = {
-            "text": {
-                "openai": TextProvider,
-                "anthropic": TextProvider,
-                "ollama": TextProvider,
-            },
-            "image": {
-                "openai": ImageProvider,
-                "stability": ImageProvider,
-            },
-            "audio": {
-                "elevenlabs": AudioProvider,
-            },
-        }
+        # Provider classes per mode, imported on first use; extended by entry points
+        self.registry = registry
+
+        # Shared pool of SDK clients reused across requests
+        self.clients = clients
+
+        # Retry policies applied around every provider call
+        self.retry_policies = retry_policies
+
+        # Client-side rate limits per provider, model and API key
+        self.rate_limiter = rate_limiter
+
+        # Opt-in adaptive concurrency limits per provider
+        self.concurrency = concurrency
+
+        # Opt-in circuit breakers per mode, provider and model
+        self.breakers = breakers
+
+        # Named failover chains usable with fallbacks="name"
+        self.fallbacks = fallback_policies
+
+        # Hedged text requests (hedge=True) and the latencies that time them
+        self.hedger = hedger
+
+        # Live latency, throughput and error stats used by route()
+        self.router = router
+
+        # Per-request records passed to hooks and aggregated for export
+        self.metrics = metrics
+
+        # Opt-in response cache; None disables caching
+        self.cache = cache
+
+        # Executor for submit(), created on first use
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
     def get_provider_class(self, mode: str, provider: str) -> Type[BaseProvider]:
         """Retrieve the appropriate provider class for the given mode and provider."""
-        # Check if mode is supported
-        if mode not in self.providers:
-            raise ValueError(f"Unsupported mode: {mode}")
+        # Raises ValueError for unsupported modes and providers
+        return self.registry.get(mode, provider)
+
+    def register_provider(
+        self, mode: str, provider: str, target: Union[Type[BaseProvider], str]
+    ) -> None:
+        """Add or replace a provider, given its class or a "module:ClassName" import path."""
+        self.registry.register(mode, provider, target)
+
+    def cache_key(
+        self, mode: str, provider: str, model: str, prompt: Any, kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """Return the cache key for a request, or None if it should bypass the cache.
+
+        cache=False skips the cache for one call; cache=True caches it even if it is
+        non-deterministic. cache_ttl is consumed here too.
+        """
+        use_cache = kwargs.pop("cache", None)
+        kwargs.pop("cache_ttl", None)
+        if self.cache is None or use_cache is False:
+            return None
+        if use_cache is None and not is_cacheable(mode, kwargs):
+            return None
+        return make_key(mode, provider, model, prompt, kwargs)
+
+    def execute(self, mode: str, provider: str, model: str, prompt: Any, **kwargs: Any) -> Any:
+        """Run a request for any mode, serving repeated requests from the cache when enabled."""
+        # fallbacks= runs the request along a chain of providers, each hop executed normally
+        fallbacks = kwargs.pop("fallbacks", None)
+        if fallbacks is not None:
+            return run_chain(
+                lambda hop, hop_kwargs: self.execute(
+                    mode, hop.provider, hop.model, prompt, **hop_kwargs
+                ),
+                self.fallbacks.resolve(fallbacks),
+                mode,
+                provider,
+                model,
+                kwargs,
+                idempotent=kwargs.get("sink") is None or is_path(kwargs["sink"]),
+            )
+
+        # Get provider class before touching the cache so invalid requests still fail fast
+        provider_class = self.get_provider_class(mode, provider)
+        ttl = kwargs.get("cache_ttl")
+        key = self.cache_key(mode, provider, model, prompt, kwargs)
 
-        # Check if provider is supported for this mode
-        if provider not in self.providers[mode]:
-            raise ValueError(f"Unsupported provider '{provider}' for mode '{mode}'")
+        record = self.metrics.start(mode, provider, model)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.metrics.finish(record, cached, cache_hit=True)
+                return cached
 
-        return self.providers[mode][provider]
+        started = time.monotonic()
+        token = current_record.set(record)
+        try:
+            response = provider_class(provider, model, prompt, **kwargs).get_response()
+        except Exception as e:
+            self.router.record(mode, provider, model, time.monotonic() - started, error=e)
+            self.metrics.finish(record, error=e)
+            raise
+        finally:
+            current_record.reset(token)
+        self.router.record(mode, provider, model, time.monotonic() - started, response)
+        self.metrics.finish(record, response)
+
+        # A stream can only be read once, so even cache=True leaves it out of the cache
+        if key is not None and response is not None and not is_stream(response):
+            self.cache.set(key, response, ttl=ttl)
+        return response
+
+    async def aexecute(
+        self, mode: str, provider: str, model: str, prompt: Any, **kwargs: Any
+    ) -> Any:
+        """Run a request for any mode asynchronously, using the cache when enabled."""
+        fallbacks = kwargs.pop("fallbacks", None)
+        if fallbacks is not None:
+            return await arun_chain(
+                lambda hop, hop_kwargs: self.aexecute(
+                    mode, hop.provider, hop.model, prompt, **hop_kwargs
+                ),
+                self.fallbacks.resolve(fallbacks),
+                mode,
+                provider,
+                model,
+                kwargs,
+                idempotent=kwargs.get("sink") is None or is_path(kwargs["sink"]),
+            )
+
+        # Get provider class before touching the cache so invalid requests still fail fast
+        provider_class = self.get_provider_class(mode, provider)
+        ttl = kwargs.get("cache_ttl")
+        key = self.cache_key(mode, provider, model, prompt, kwargs)
+
+        record = self.metrics.start(mode, provider, model)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.metrics.finish(record, cached, cache_hit=True)
+                return cached
+
+        started = time.monotonic()
+        token = current_record.set(record)
+        try:
+            response = await provider_class(provider, model, prompt, **kwargs).aget_response()
+        except Exception as e:
+            self.router.record(mode, provider, model, time.monotonic() - started, error=e)
+            self.metrics.finish(record, error=e)
+            raise
+        finally:
+            current_record.reset(token)
+        self.router.record(mode, provider, model, time.monotonic() - started, response)
+        self.metrics.finish(record, response)
+
+        # A stream can only be read once, so even cache=True leaves it out of the cache
+        if key is not None and response is not None and not is_stream(response):
+            self.cache.set(key, response, ttl=ttl)
+        return response
+
+    def open_stream(
+        self, mode: str, provider: str, model: str, prompt: Any, **kwargs: Any
+    ) -> Iterator[Any]:
+        """Start a streaming request for any mode, recording metrics as it is consumed."""
+        # Get provider class and start the streaming request
+        provider_class = self.get_provider_class(mode, provider)
+        instance = provider_class(provider, model, prompt, **kwargs)
+        record = self.metrics.start(mode, provider, model, stream=True)
+        token = current_record.set(record)
+        try:
+            events = instance.open_stream()
+        except Exception as e:
+            self.metrics.finish(record, error=e)
+            raise
+        finally:
+            current_record.reset(token)
+        return self.metrics.stream(record, events)
+
+    async def aopen_stream(
+        self, mode: str, provider: str, model: str, prompt: Any, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """Start an async streaming request for any mode and relay its events."""
+        # Get provider class and relay events from the async stream
+        provider_class = self.get_provider_class(mode, provider)
+        instance = provider_class(provider, model, prompt, **kwargs)
+        record = self.metrics.start(mode, provider, model, stream=True)
+        token = current_record.set(record)
+        try:
+            events = await instance.aopen_stream()
+        except Exception as e:
+            self.metrics.finish(record, error=e)
+            raise
+        finally:
+            current_record.reset(token)
+        try:
+            async for event in self.metrics.astream(record, events):
+                yield event
+        finally:
+            # Free the stream's slot as soon as the consumer stops reading
+            if hasattr(events, "aclose"):
+                await events.aclose()
 
     def text(self, provider: str, model: str, prompt: Any, **kwargs: Any) -> str:
         """Generate text using the specified AI provider and model."""
-        # Get provider class and create instance with parameters
-        provider_class = self.get_provider_class("text", provider)
-        return provider_class(provider, model, prompt, **kwargs).get_response()
+        # hedge= sends a backup request when this one is slower than usual
+        hedge = kwargs.pop("hedge", None)
+        if hedge:
+            return self.hedger.run(
+                self.hedger.resolve(hedge),
+                provider,
+                model,
+                kwargs,
+                lambda hop_provider, hop_model, hop_kwargs: self.execute(
+                    "text", hop_provider, hop_model, prompt, **hop_kwargs
+                ),
+            )
+        return self.execute("text", provider, model, prompt, **kwargs)
+
+    def text_stream(
+        self, provider: str, model: str, prompt: Any, **kwargs: Any
+    ) -> Iterator[StreamEvent]:
+        """Stream text deltas from the specified provider, ending with a summary event."""
+        # hedge= opens a backup stream when the first delta is slower than usual
+        hedge = kwargs.pop("hedge", None)
+        if hedge:
+            return self.hedger.stream(
+                self.hedger.resolve(hedge),
+                provider,
+                model,
+                kwargs,
+                lambda hop_provider, hop_model, hop_kwargs: self.text_stream(
+                    hop_provider, hop_model, prompt, **hop_kwargs
+                ),
+            )
+
+        return self.open_stream("text", provider, model, prompt, **kwargs)
 
     def image(
         self, provider: str, model: str, prompt: Any, **kwargs: Any
-    ) -> Union[str, bytes, List[str]]:
+    ) -> Union[str, bytes, List[str], int]:
         """Generate an image using the specified AI provider and model."""
-        # Get provider class and create instance with parameters
-        provider_class = self.get_provider_class("image", provider)
-        return provider_class(provider, model, prompt, **kwargs).get_response()
+        return self.execute("image", provider, model, prompt, **kwargs)
 
-    def audio(self, provider: str, model: str, prompt: Any, **kwargs: Any) -> bytes:
+    def audio(self, provider: str, model: str, prompt: Any, **kwargs: Any) -> Union[bytes, int]:
         """Generate audio using the specified AI provider and model."""
-        # Get provider class and create instance with parameters
-        provider_class = self.get_provider_class("audio", provider)
-        return provider_class(provider, model, prompt, **kwargs).get_response()
+        return self.execute("audio", provider, model, prompt, **kwargs)
+
+    def audio_stream(
+        self, provider: str, model: str, prompt: Any, **kwargs: Any
+    ) -> Iterator[bytes]:
+        """Stream audio chunks from the specified provider as they are synthesized."""
+        return self.open_stream("audio", provider, model, prompt, **kwargs)
+
+    def text_batch(
+        self,
+        requests: Iterable[Any],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        workers: int = 8,
+        ordered: bool = True,
+        **kwargs: Any,
+    ) -> Iterator[BatchResult]:
+        """Generate text for many requests concurrently, yielding a BatchResult for each."""
+        return self.batch("text", requests, provider, model, workers, ordered, **kwargs)
+
+    def image_batch(
+        self,
+        requests: Iterable[Any],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        workers: int = 8,
+        ordered: bool = True,
+        **kwargs: Any,
+    ) -> Iterator[BatchResult]:
+        """Generate images for many requests concurrently, yielding a BatchResult for each."""
+        return self.batch("image", requests, provider, model, workers, ordered, **kwargs)
+
+    def audio_batch(
+        self,
+        requests: Iterable[Any],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        workers: int = 8,
+        ordered: bool = True,
+        **kwargs: Any,
+    ) -> Iterator[BatchResult]:
+        """Generate audio for many requests concurrently, yielding a BatchResult for each."""
+        return self.batch("audio", requests, provider, model, workers, ordered, **kwargs)
+
+    def batch(
+        self,
+        mode: str,
+        requests: Iterable[Any],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        workers: int = 8,
+        ordered: bool = True,
+        **kwargs: Any,
+    ) -> Iterator[BatchResult]:
+        """Run requests for a mode on a bounded worker pool, consuming the input lazily.
+
+        Each request is a prompt or a dict of call arguments that override the defaults;
+        failures are captured on the BatchResult instead of aborting the batch.
+        """
+        # Validate the mode up front rather than once per item
+        if not self.registry.has_mode(mode):
+            raise ValueError(f"Unsupported mode: {mode}")
+        call = getattr(self, mode)
+        defaults = dict(kwargs, provider=provider, model=model)
+
+        def run(request: Any) -> Any:
+            """Execute one batch item."""
+            params = build_call(request, defaults)
+            return call(params.pop("provider"), params.pop("model"), params.pop("prompt"), **params)
+
+        return run_batch(run, requests, workers=workers, ordered=ordered)
+
+    def route(
+        self,
+        mode: str,
+        pool: Sequence[Any],
+        prompt: Any,
+        objective: str = "latency",
+        slo: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Send a request to the best (provider, model) in pool for the objective.
+
+        pool holds interchangeable (provider, model[, options]) candidates; objective is
+        "latency", "throughput" or "cost" (cheapest with average latency within slo).
+        """
+        hop = self.router.choose(mode, pool, objective=objective, slo=slo)
+        return self.execute(
+            mode,
+            hop.provider,
+            hop.model,
+            prompt,
+            **hop_kwargs(hop, as_hop(pool[0]).provider, kwargs),
+        )
+
+    async def aroute(
+        self,
+        mode: str,
+        pool: Sequence[Any],
+        prompt: Any,
+        objective: str = "latency",
+        slo: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Asynchronously send a request to the best (provider, model) in pool."""
+        hop = self.router.choose(mode, pool, objective=objective, slo=slo)
+        return await self.aexecute(
+            mode,
+            hop.provider,
+            hop.model,
+            prompt,
+            **hop_kwargs(hop, as_hop(pool[0]).provider, kwargs),
+        )
+
+    def bind(self, mode: str, provider: str, model: str, **defaults: Any) -> BoundCall:
+        """Return a callable for one provider and model that skips per-call setup.
+
+        Call it with a prompt and any extra options, or await its acall() method.
+        """
+        return BoundCall(self, mode, provider, model, **defaults)
+
+    def route_stats(self) -> Dict[str, Any]:
+        """Return per-model routing stats and the most recent routing decisions."""
+        return {"models": self.router.stats(), "decisions": self.router.decisions()}
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        """Return the shared executor used by submit(), creating it if needed."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="apicenter"
+                )
+            return self._executor
+
+    def submit(
+        self,
+        mode: str,
+        provider: str,
+        model: str,
+        prompt: Any,
+        callback: Optional[Callable[[Future], Any]] = None,
+        **kwargs: Any,
+    ) -> Future:
+        """Start a generation on the shared executor and return a Future for its result.
+
+        The optional callback receives the finished Future; queued work can be dropped
+        with Future.cancel().
+        """
+        # Reject unknown modes and providers before queueing anything
+        self.get_provider_class(mode, provider)
+        call = getattr(self, mode)
+
+        future = self.get_executor().submit(call, provider, model, prompt, **kwargs)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """Shut down the submit() executor; a later submit() starts a fresh one."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    async def atext(self, provider: str, model: str, prompt: Any, **kwargs: Any) -> str:
+        """Generate text asynchronously using the specified AI provider and model."""
+        hedge = kwargs.pop("hedge", None)
+        if hedge:
+            return await self.hedger.arun(
+                self.hedger.resolve(hedge),
+                provider,
+                model,
+                kwargs,
+                lambda hop_provider, hop_model, hop_kwargs: self.aexecute(
+                    "text", hop_provider, hop_model, prompt, **hop_kwargs
+                ),
+            )
+        return await self.aexecute("text", provider, model, prompt, **kwargs)
+
+    async def atext_stream(
+        self, provider: str, model: str, prompt: Any, **kwargs: Any
+    ) -> AsyncIterator[StreamEvent]:
+        """Asynchronously stream text deltas, ending with a summary event."""
+        hedge = kwargs.pop("hedge", None)
+        if hedge:
+            events = self.hedger.astream(
+                self.hedger.resolve(hedge),
+                provider,
+                model,
+                kwargs,
+                lambda hop_provider, hop_model, hop_kwargs: self.atext_stream(
+                    hop_provider, hop_model, prompt, **hop_kwargs
+                ),
+            )
+            async for event in events:
+                yield event
+            return
+
+        # Closing this stream closes the provider's, freeing its slot without waiting for GC
+        async with aclosing(self.aopen_stream("text", provider, model, prompt, **kwargs)) as events:
+            async for event in events:
+                yield event
+
+    async def aimage(
+        self, provider: str, model: str, prompt: Any, **kwargs: Any
+    ) -> Union[str, bytes, List[str], int]:
+        """Generate an image asynchronously using the specified AI provider and model."""
+        return await self.aexecute("image", provider, model, prompt, **kwargs)
+
+    async def aaudio(
+        self, provider: str, model: str, prompt: Any, **kwargs: Any
+    ) -> Union[bytes, int]:
+        """Generate audio asynchronously using the specified AI provider and model."""
+        return await self.aexecute("audio", provider, model, prompt, **kwargs)
+
+    async def aaudio_stream(
+        self, provider: str, model: str, prompt: Any, **kwargs: Any
+    ) -> AsyncIterator[bytes]:
+        """Asynchronously stream audio chunks as they are synthesized."""
+        async with aclosing(
+            self.aopen_stream("audio", provider, model, prompt, **kwargs)
+        ) as chunks:
+            async for chunk in chunks:
+                yield chunk
+
+    def rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return remaining capacity and wait counters for every rate limit bucket."""
+        return self.rate_limiter.stats()
+
+    def concurrency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the current adaptive concurrency limit and load for each provider."""
+        return self.concurrency.stats()
+
+    def last_route(self) -> Optional[Route]:
+        """Return the hops tried by the latest fallbacks= request in this thread or task."""
+        return last_route.get()
+
+    def hedge_stats(self) -> Dict[str, Any]:
+        """Return hedge counts, wins, budget denials and recent latency percentiles."""
+        return self.hedger.stats()
+
+    def breaker_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the state and recent failure rate of every circuit breaker."""
+        return self.breakers.stats()
+
+    def retry_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return retry counts and time spent backing off, per retry policy."""
+        return self.retry_policies.stats()
+
+    def close(self) -> None:
+        """Close all pooled provider clients and release their connections."""
+        self.clients.close()
+
+    async def aclose(self) -> None:
+        """Close all pooled clients, awaiting the shutdown of async clients."""
+        await self.clients.aclose()
 
 
 # Singleton instance for easy import and use
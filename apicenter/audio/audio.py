@@ -1,47 +1,203 @@
 """Audio generation provider implementations for various AI services."""
 
-from apicenter.core.credentials import credentials
-from .providers.elevenlabs import call_elevenlabs
-from typing import Any, Dict, Optional
-from ..core.base import BaseProvider, ProviderConfig
+from typing import Any, AsyncIterator, Dict, Iterator, Union
 
+from ..core.base import BaseProvider
+from ..core.errors import APICenterError
+from ..core.lazy import LazyProviders
+from ..core.sink import awrite_to_sink, is_path, write_to_sink
 
-class AudioProvider(BaseProvider[bytes]):
+# The provider module imports the ElevenLabs SDK, so it is only imported when first used
+providers = LazyProviders(
+    globals(),
+    {
+        "elevenlabs": (
+            "apicenter.audio.providers.elevenlabs",
+            {
+                "call_elevenlabs": "call_elevenlabs",
+                "acall_elevenlabs": "acall_elevenlabs",
+                "stream_elevenlabs": "stream_elevenlabs",
+                "astream_elevenlabs": "astream_elevenlabs",
+                "create_elevenlabs_client": "create_client",
+                "create_async_elevenlabs_client": "create_async_client",
+            },
+        ),
+    },
+)
+
+
+def __getattr__(name: str) -> Any:
+    """Import provider functions on first access, e.g. when a test patches them."""
+    return providers.resolve(name)
+
+
+class AudioProvider(BaseProvider[Union[bytes, Iterator[bytes], int]]):
     """Provider for text-to-speech conversion across multiple AI services."""
 
+    def __init__(self, provider: str, model: str, prompt: Any, **kwargs: Any) -> None:
+        """Initialize the provider, noting whether output is streamed or written to a sink."""
+        providers.load(provider)
+        self.streaming = bool(kwargs.pop("stream", False))
+        self.sink = kwargs.pop("sink", None)
+        self.fsync = bool(kwargs.pop("fsync", False))
+        self.atomic = bool(kwargs.pop("atomic", False))
+        super().__init__(provider, model, prompt, **kwargs)
+
+    def is_idempotent(self) -> bool:
+        """Return False when output goes to a caller's file object that a retry would corrupt."""
+        return self.sink is None or is_path(self.sink)
+
     def get_mode(self) -> str:
         """Return the mode identifier for this provider."""
         return "audio"
 
-    def call(self) -> bytes:
+    def call(self) -> Union[bytes, Iterator[bytes], int]:
         """Route the request to the appropriate provider implementation."""
-        # Map each provider to its implementation method
-        provider_methods = {"elevenlabs": self.call_elevenlabs}
+        # Write chunks straight to the destination when a sink was given
+        if self.sink is not None:
+            try:
+                return write_to_sink(self.stream(), self.sink, fsync=self.fsync, atomic=self.atomic)
+            except APICenterError:
+                raise
+            except Exception as e:
+                raise ValueError(f"Error calling {self.provider} audio API: {str(e)}")
+
+        # Hand back an iterator of chunks when streaming output was requested
+        if self.streaming:
+            return self.stream()
+
+        # Look up the provider's implementation method, e.g. call_elevenlabs
+        method = self.provider_method("call")
 
         try:
-            # Call the appropriate provider method if supported
-            if self.provider in provider_methods:
-                return provider_methods[self.provider]()
+            # Call the provider method if supported
+            if method is not None:
+                return method()
             else:
                 raise ValueError(f"Unsupported audio provider: {self.provider}")
+        except APICenterError:
+            raise
         except Exception as e:
             raise ValueError(f"Error calling {self.provider} audio API: {str(e)}")
 
-    def call_elevenlabs(self) -> bytes:
-        """Process request through ElevenLabs' text-to-speech API."""
+    async def acall(self) -> Union[bytes, AsyncIterator[bytes], int]:
+        """Route the request to the appropriate non-blocking provider implementation."""
+        # Write chunks straight to the destination when a sink was given
+        if self.sink is not None:
+            try:
+                return await awrite_to_sink(
+                    self.astream(), self.sink, fsync=self.fsync, atomic=self.atomic
+                )
+            except APICenterError:
+                raise
+            except Exception as e:
+                raise ValueError(f"Error calling {self.provider} audio API: {str(e)}")
+
+        # Hand back an async iterator of chunks when streaming output was requested
+        if self.streaming:
+            return self.astream()
+
+        # Look up the provider's async method, e.g. acall_elevenlabs
+        method = self.provider_method("acall")
+        if method is None and self.provider_method("call") is not None:
+            # Providers without a native async client run in a worker thread
+            return await super().acall()
+
+        try:
+            # Await the provider method if supported
+            if method is not None:
+                return await method()
+            else:
+                raise ValueError(f"Unsupported audio provider: {self.provider}")
+        except APICenterError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error calling {self.provider} audio API: {str(e)}")
+
+    def stream(self) -> Iterator[bytes]:
+        """Route a streaming request to the appropriate provider implementation."""
+        # Look up the provider's streaming method, e.g. stream_elevenlabs
+        method = self.provider_method("stream")
+        if method is None:
+            raise ValueError(f"Streaming is not supported for audio provider: {self.provider}")
+        return method()
+
+    def astream(self) -> AsyncIterator[bytes]:
+        """Route a streaming request to the appropriate async provider implementation."""
+        # Look up the provider's async streaming method, e.g. astream_elevenlabs
+        method = self.provider_method("astream")
+        if method is None:
+            raise ValueError(f"Streaming is not supported for audio provider: {self.provider}")
+        return method()
+
+    def get_elevenlabs_credentials(self) -> Dict[str, Any]:
+        """Build the ElevenLabs credentials dictionary from the loaded configuration."""
         # Prepare credentials dictionary
         credentials_dict = {"api_key": self.config.api_key}
 
         # Remove None values from credentials
-        credentials_dict = {k: v for k, v in credentials_dict.items() if v is not None}
+        return {k: v for k, v in credentials_dict.items() if v is not None}
+
+    def call_elevenlabs(self) -> bytes:
+        """Process request through ElevenLabs' text-to-speech API."""
+        credentials_dict = self.get_elevenlabs_credentials()
+
+        # Call the ElevenLabs implementation with a pooled client
+        return providers.resolve("call_elevenlabs")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_client(providers.resolve("create_elevenlabs_client"), credentials_dict),
+            **self.kwargs,
+        )
+
+    async def acall_elevenlabs(self) -> bytes:
+        """Process request through ElevenLabs' async text-to-speech API."""
+        credentials_dict = self.get_elevenlabs_credentials()
+
+        # Await the ElevenLabs implementation with a pooled async client
+        return await providers.resolve("acall_elevenlabs")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_async_client(
+                providers.resolve("create_async_elevenlabs_client"), credentials_dict
+            ),
+            **self.kwargs,
+        )
 
-        # Call the ElevenLabs implementation
-        return call_elevenlabs(
-            model=self.model, prompt=self.prompt, credentials=credentials_dict, **self.kwargs
+    def stream_elevenlabs(self) -> Iterator[bytes]:
+        """Stream audio chunks from ElevenLabs' text-to-speech API."""
+        credentials_dict = self.get_elevenlabs_credentials()
+        return providers.resolve("stream_elevenlabs")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_client(providers.resolve("create_elevenlabs_client"), credentials_dict),
+            **self.kwargs,
+        )
+
+    def astream_elevenlabs(self) -> AsyncIterator[bytes]:
+        """Stream audio chunks from ElevenLabs' async text-to-speech API."""
+        credentials_dict = self.get_elevenlabs_credentials()
+        return providers.resolve("astream_elevenlabs")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_async_client(
+                providers.resolve("create_async_elevenlabs_client"), credentials_dict
+            ),
+            **self.kwargs,
         )
 
 
-def audio(provider: str, model: str, prompt: Any, **kwargs: Any) -> bytes:
+def audio(provider: str, model: str, prompt: Any, **kwargs: Any) -> Union[bytes, int]:
     """Generate audio using any supported AI provider with a unified interface."""
     # Create provider instance and get response
     return AudioProvider(provider, model, prompt, **kwargs).get_response()
+
+
+async def aaudio(provider: str, model: str, prompt: Any, **kwargs: Any) -> Union[bytes, int]:
+    """Generate audio asynchronously using any supported AI provider."""
+    # Create provider instance and await response
+    return await AudioProvider(provider, model, prompt, **kwargs).aget_response()
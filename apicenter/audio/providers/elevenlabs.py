@@ -1,73 +1,195 @@
 """ElevenLabs text-to-speech provider implementation."""
 
-from elevenlabs.client import ElevenLabs
+import math
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from elevenlabs.client import AsyncElevenLabs, ElevenLabs
 from elevenlabs.types import VoiceSettings
-from typing import Dict, Any, List, Optional
 
+from apicenter.core.errors import translate_error
+
+# List of parameters for VoiceSettings object
+VOICE_SETTINGS_FIELDS = [
+    "stability",
+    "similarity_boost",
+    "style",
+    "use_speaker_boost",
+    "speed",
+]
+
+# List of valid parameters for the convert method
+VALID_PARAMS = [
+    "voice_id",
+    "output_format",
+    "model_id",
+    "optimize_streaming_latency",
+    "enable_logging",
+    "language_code",
+    "seed",
+    "previous_text",
+    "next_text",
+    "previous_request_ids",
+    "next_request_ids",
+    "use_pvc_as_ivc",
+    "apply_text_normalization",
+    "apply_language_text_normalization",
+]
+
+
+def create_client(credentials: Dict[str, Any]) -> ElevenLabs:
+    """Create an ElevenLabs client from a credentials dictionary."""
+    return ElevenLabs(**credentials)
+
+
+def create_async_client(credentials: Dict[str, Any]) -> AsyncElevenLabs:
+    """Create an asynchronous ElevenLabs client from a credentials dictionary."""
+    return AsyncElevenLabs(**credentials)
+
+
+def build_params(model: str, **kwargs: Any) -> Dict[str, Any]:
+    """Build text-to-speech parameters, grouping voice settings into a VoiceSettings object."""
+    # Set default parameters if not provided
+    kwargs.setdefault("voice_id", "JBFqnCBsd6RMkjVDRZzb")  # Default voice
+    kwargs.setdefault("output_format", "mp3_44100_128")  # Default format
 
-def call_elevenlabs(model: str, prompt: str, credentials: Dict[str, Any], **kwargs: Any) -> bytes:
+    # Separate parameters by destination
+    text_to_speech_params = {}
+    voice_settings_params = {}
+
+    # Extract voice settings parameters
+    for field in VOICE_SETTINGS_FIELDS:
+        if field in kwargs:
+            voice_settings_params[field] = kwargs.pop(field)
+
+    # Create VoiceSettings object if parameters were provided
+    if voice_settings_params:
+        voice_settings = VoiceSettings(**voice_settings_params)
+        text_to_speech_params["voice_settings"] = voice_settings
+
+    # Extract API-specific parameters
+    for param in VALID_PARAMS:
+        if param in kwargs:
+            text_to_speech_params[param] = kwargs.pop(param)
+
+    # RetryPolicy retries failed calls, so the SDK must not retry inside each attempt
+    request_options = text_to_speech_params.setdefault("request_options", {})
+    request_options.setdefault("max_retries", 0)
+
+    # The SDK takes timeouts in whole seconds through request_options
+    if kwargs.get("timeout") is not None:
+        request_options["timeout_in_seconds"] = max(1, math.ceil(kwargs.pop("timeout")))
+
+    # Set model ID - the API expects model_id but we use model for consistency
+    text_to_speech_params.setdefault("model_id", model)
+    return text_to_speech_params
+
+
+def call_elevenlabs(
+    model: str,
+    prompt: str,
+    credentials: Dict[str, Any],
+    client: Optional[ElevenLabs] = None,
+    **kwargs: Any,
+) -> bytes:
     """Handle text-to-speech conversion through ElevenLabs API."""
     try:
-        # Initialize ElevenLabs client with credentials
-        client = ElevenLabs(**credentials)
-
-        # Set default parameters if not provided
-        kwargs.setdefault("voice_id", "JBFqnCBsd6RMkjVDRZzb")  # Default voice
-        kwargs.setdefault("output_format", "mp3_44100_128")  # Default format
-
-        # Separate parameters by destination
-        text_to_speech_params = {}
-        voice_settings_params = {}
-
-        # List of parameters for VoiceSettings object
-        voice_settings_fields = [
-            "stability",
-            "similarity_boost",
-            "style",
-            "use_speaker_boost",
-            "speed",
-        ]
-
-        # Extract voice settings parameters
-        for field in voice_settings_fields:
-            if field in kwargs:
-                voice_settings_params[field] = kwargs.pop(field)
-
-        # Create VoiceSettings object if parameters were provided
-        if voice_settings_params:
-            voice_settings = VoiceSettings(**voice_settings_params)
-            text_to_speech_params["voice_settings"] = voice_settings
-
-        # List of valid parameters for the convert method
-        valid_params = [
-            "voice_id",
-            "output_format",
-            "model_id",
-            "optimize_streaming_latency",
-            "enable_logging",
-            "language_code",
-            "seed",
-            "previous_text",
-            "next_text",
-            "previous_request_ids",
-            "next_request_ids",
-            "use_pvc_as_ivc",
-            "apply_text_normalization",
-            "apply_language_text_normalization",
-        ]
-
-        # Extract API-specific parameters
-        for param in valid_params:
-            if param in kwargs:
-                text_to_speech_params[param] = kwargs.pop(param)
-
-        # Set model ID - the API expects model_id but we use model for consistency
-        text_to_speech_params.setdefault("model_id", model)
+        # Reuse the supplied client or initialize one with credentials
+        if client is None:
+            client = create_client(credentials)
 
         # Generate audio from text
-        audio_generator = client.text_to_speech.convert(text=prompt, **text_to_speech_params)
+        audio_generator = client.text_to_speech.convert(
+            text=prompt, **build_params(model, **kwargs)
+        )
 
         # Concatenate all audio chunks and return as bytes
         return b"".join(audio_generator)
     except Exception as e:
-        raise ValueError(f"ElevenLabs audio generation error: {str(e)}")
+        raise translate_error("elevenlabs", e, "ElevenLabs audio generation error") from e
+
+
+async def acall_elevenlabs(
+    model: str,
+    prompt: str,
+    credentials: Dict[str, Any],
+    client: Optional[AsyncElevenLabs] = None,
+    **kwargs: Any,
+) -> bytes:
+    """Handle text-to-speech conversion through ElevenLabs without blocking the event loop."""
+    try:
+        # Reuse the supplied client or initialize one with credentials
+        if client is None:
+            client = create_async_client(credentials)
+
+        # Collect audio chunks as the async generator produces them
+        chunks = []
+        async for chunk in client.text_to_speech.convert(
+            text=prompt, **build_params(model, **kwargs)
+        ):
+            chunks.append(chunk)
+
+        return b"".join(chunks)
+    except Exception as e:
+        raise translate_error("elevenlabs", e, "ElevenLabs audio generation error") from e
+
+
+def stream_elevenlabs(
+    model: str,
+    prompt: str,
+    credentials: Dict[str, Any],
+    client: Optional[ElevenLabs] = None,
+    use_streaming_endpoint: bool = False,
+    **kwargs: Any,
+) -> Iterator[bytes]:
+    """Yield audio chunks from ElevenLabs as they are synthesized.
+
+    With use_streaming_endpoint the dedicated /stream endpoint is used, which starts sending
+    audio sooner and honours optimize_streaming_latency.
+    """
+    try:
+        # Reuse the supplied client or initialize one with credentials
+        if client is None:
+            client = create_client(credentials)
+
+        # Older SDK releases name the streaming method convert_as_stream
+        tts = client.text_to_speech
+        if use_streaming_endpoint:
+            generate = getattr(tts, "stream", None) or tts.convert_as_stream
+        else:
+            generate = tts.convert
+
+        # Relay chunks as they arrive instead of buffering the whole clip
+        for chunk in generate(text=prompt, **build_params(model, **kwargs)):
+            if chunk:
+                yield chunk
+    except Exception as e:
+        raise translate_error("elevenlabs", e, "ElevenLabs audio generation error") from e
+
+
+async def astream_elevenlabs(
+    model: str,
+    prompt: str,
+    credentials: Dict[str, Any],
+    client: Optional[AsyncElevenLabs] = None,
+    use_streaming_endpoint: bool = False,
+    **kwargs: Any,
+) -> AsyncIterator[bytes]:
+    """Asynchronously yield audio chunks from ElevenLabs as they are synthesized."""
+    try:
+        # Reuse the supplied client or initialize one with credentials
+        if client is None:
+            client = create_async_client(credentials)
+
+        # Older SDK releases name the streaming method convert_as_stream
+        tts = client.text_to_speech
+        if use_streaming_endpoint:
+            generate = getattr(tts, "stream", None) or tts.convert_as_stream
+        else:
+            generate = tts.convert
+
+        # Relay chunks as they arrive instead of buffering the whole clip
+        async for chunk in generate(text=prompt, **build_params(model, **kwargs)):
+            if chunk:
+                yield chunk
+    except Exception as e:
+        raise translate_error("elevenlabs", e, "ElevenLabs audio generation error") from e
@@ -1,12 +1,20 @@
 """Base classes and interfaces for provider implementations."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, TypeVar, Generic, Union, List
 from dataclasses import dataclass
-import json
-import os
-from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Optional, Set, Tuple, TypeVar, Union
+
+from .breaker import CircuitBreaker, breakers
+from .concurrency import AdaptiveLimiter, concurrency, is_overload
 from .credentials import credentials as creds_provider
+from .errors import RequestTimeoutError
+from .metrics import record_attempt
+from .pool import ClientFactory, clients
+from .ratelimit import BLOCK, FAIL, TIMEOUT, RateLimit, estimate_tokens, rate_limiter
+from .retry import RetryPolicy, retry_policies
+from .streaming import guard_stream, is_stream
 
 # Generic type for provider responses
 T = TypeVar("T")
@@ -19,17 +27,53 @@ class ProviderConfig:
     api_key: Optional[str] = None
     organization: Optional[str] = None
     additional_params: Optional[Dict[str, Any]] = None
+    rate_limits: Optional[Dict[str, Any]] = None
+
+
+# Parsed configurations per (mode, provider), with the credentials entry each was built from
+_configs: Dict[Tuple[str, str], Tuple[Dict[str, Any], ProviderConfig]] = {}
+
+
+def forget_configs(changed: Set[Tuple[str, str]]) -> None:
+    """Drop cached configurations and pooled clients for providers whose credentials changed."""
+    for mode, provider in changed:
+        _configs.pop((mode, provider), None)
+    for provider in {provider for _, provider in changed}:
+        clients.invalidate(provider)
+
+
+# Clients built with a rotated key must not outlive it
+creds_provider.add_listener(forget_configs)
 
 
 class BaseProvider(ABC, Generic[T]):
     """Base abstract class for all AI service providers."""
 
+    # Set by open_stream() so attempts open the provider's stream instead of calling it
+    opens_stream = False
+
     def __init__(self, provider: str, model: str, prompt: Any, **kwargs: Any) -> None:
         """Initialize a provider with model, prompt and additional parameters."""
+        # retry=False disables retries for this call; a RetryPolicy replaces the default
+        self.retry: Union[RetryPolicy, bool, None] = kwargs.pop("retry", None)
+
+        # How to wait for client-side rate limit budget: "block", "timeout" or "fail"
+        self.rate_limit_mode: str = kwargs.pop("rate_limit", rate_limiter.mode)
+        self.rate_limit_timeout: Optional[float] = kwargs.pop(
+            "rate_limit_timeout", rate_limiter.timeout
+        )
+
+        # timeout caps each attempt; deadline caps the whole call, retries included
+        self.timeout: Optional[float] = kwargs.pop("timeout", None)
+        deadline: Optional[float] = kwargs.pop("deadline", None)
+        self.deadline_at = time.monotonic() + deadline if deadline is not None else None
         self.provider = provider
         self.model = model
         self.prompt = prompt
         self.kwargs = kwargs
+
+        # Lookups a bound call resolves once and shares across the requests it makes
+        self.resolved: Optional[Dict[Any, Any]] = None
         self.config = self.load_config()
 
     def load_config(self) -> ProviderConfig:
@@ -45,12 +89,20 @@ class BaseProvider(ABC, Generic[T]):
             if not provider_config and self.provider in ["ollama"]:
                 return ProviderConfig()
 
+            # Reuse the configuration built from this same credentials entry
+            cached = _configs.get((mode, self.provider))
+            if cached is not None and cached[0] is provider_config:
+                return cached[1]
+
             # Create provider configuration with available settings
-            return ProviderConfig(
+            config = ProviderConfig(
                 api_key=provider_config.get("api_key"),
                 organization=provider_config.get("organization"),
                 additional_params=provider_config.get("additional_params", {}),
+                rate_limits=provider_config.get("rate_limits"),
             )
+            _configs[(mode, self.provider)] = (provider_config, config)
+            return config
         except ValueError as e:
             # Provide a more helpful error message
             raise ValueError(
@@ -59,6 +111,41 @@ class BaseProvider(ABC, Generic[T]):
                 f"For local providers like 'ollama', no credentials are needed."
             ) from e
 
+    def get_client(self, factory: ClientFactory, credentials: Dict[str, Any]) -> Any:
+        """Fetch a pooled SDK client for this provider, creating it on first use."""
+        if self.resolved is not None and factory in self.resolved:
+            return self.resolved[factory]
+
+        # Allow a custom endpoint to be configured alongside the credentials
+        base_url = (self.config.additional_params or {}).get("base_url")
+        client = clients.get(self.provider, factory, credentials, base_url=base_url)
+        if concurrency.get(self.provider) is not None:
+            concurrency.instrument(self.provider, client)
+        if self.resolved is not None:
+            self.resolved[factory] = client
+        return client
+
+    def get_async_client(self, factory: ClientFactory, credentials: Dict[str, Any]) -> Any:
+        """Fetch a pooled async SDK client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self.resolved is not None and (factory, loop) in self.resolved:
+            return self.resolved[(factory, loop)]
+
+        # Async clients hold loop-bound connections, so pool them per event loop
+        base_url = (self.config.additional_params or {}).get("base_url")
+        client = clients.get(
+            self.provider,
+            factory,
+            credentials,
+            base_url=base_url,
+            scope=loop,
+        )
+        if concurrency.get(self.provider) is not None:
+            concurrency.instrument(self.provider, client)
+        if self.resolved is not None:
+            self.resolved[(factory, loop)] = client
+        return client
+
     @abstractmethod
     def get_mode(self) -> str:
         """Return the mode this provider handles (text, image, audio)."""
@@ -69,6 +156,255 @@ class BaseProvider(ABC, Generic[T]):
         """Make the actual API call and return the response."""
         pass
 
+    async def acall(self) -> T:
+        """Make the API call without blocking the event loop.
+
+        Providers with native async SDKs override this; the default runs call() in a
+        worker thread so every provider can be awaited.
+        """
+        return await asyncio.to_thread(self.call)
+
+    def invoke(self) -> Any:
+        """Call the provider, or open its stream for open_stream()."""
+        return self.stream() if self.opens_stream else self.call()
+
+    async def ainvoke(self) -> Any:
+        """Await the provider call, or open its async stream for aopen_stream()."""
+        if self.opens_stream:
+            return self.astream()
+        return await self.acall()
+
+    def provider_method(self, prefix: str) -> Optional[Callable[[], Any]]:
+        """Return this class's method for the provider, e.g. call_openai, or None.
+
+        Mode classes implement each provider as call_<provider>, acall_<provider>,
+        stream_<provider> and astream_<provider>, so supporting a provider in an existing
+        mode only takes the methods plus a registry entry.
+        """
+        return getattr(self, f"{prefix}_{self.provider}", None)
+
+    def get_rate_limit(self) -> Optional[RateLimit]:
+        """Return the shared rate limit for this provider, model and API key, if any."""
+        # Custom providers may not load a configuration at all
+        if self.config is None:
+            return None
+        if self.resolved is not None and "rate_limit" in self.resolved:
+            return self.resolved["rate_limit"]
+
+        limit = rate_limiter.get(
+            self.provider, self.model, self.config.api_key, self.config.rate_limits
+        )
+        if self.resolved is not None:
+            self.resolved["rate_limit"] = limit
+        return limit
+
+    def rate_limit_wait(self) -> Tuple[str, Optional[float]]:
+        """Return the rate limit mode and timeout, bounding any wait by the deadline."""
+        mode, timeout = self.rate_limit_mode, self.rate_limit_timeout
+        remaining = self.remaining_time()
+        if remaining is None or mode == FAIL:
+            return mode, timeout
+        if mode == BLOCK or timeout is None:
+            return TIMEOUT, remaining
+        return TIMEOUT, min(timeout, remaining)
+
+    def acquire_rate_limit(self) -> None:
+        """Wait for rate limit budget for one request, or raise RateLimitExceeded."""
+        limit = self.get_rate_limit()
+        if limit is not None:
+            mode, timeout = self.rate_limit_wait()
+            limit.acquire(estimate_tokens(self.prompt, self.kwargs), mode=mode, timeout=timeout)
+
+    async def aacquire_rate_limit(self) -> None:
+        """Wait for rate limit budget without blocking the event loop."""
+        limit = self.get_rate_limit()
+        if limit is not None:
+            mode, timeout = self.rate_limit_wait()
+            await limit.aacquire(
+                estimate_tokens(self.prompt, self.kwargs), mode=mode, timeout=timeout
+            )
+
+    def release_concurrency(
+        self, limiter: AdaptiveLimiter, started: float, error: Optional[BaseException] = None
+    ) -> None:
+        """Return a concurrency slot and report how the attempt went."""
+        if error is not None:
+            limiter.observe_headers(getattr(error, "headers", None))
+        limiter.release(
+            time.monotonic() - started,
+            overloaded=error is not None and is_overload(error),
+            failed=error is not None,
+        )
+
+    def deadline_exceeded(self, waiting_for: str) -> RequestTimeoutError:
+        """Build the error raised when the deadline passes before the provider is called."""
+        return RequestTimeoutError(
+            f"Deadline exceeded {waiting_for} {self.provider}/{self.model}",
+            provider=self.provider,
+            retryable=False,
+        )
+
+    def remaining_time(self) -> Optional[float]:
+        """Return the time left before the deadline, or raise if it has passed."""
+        if self.deadline_at is None:
+            return None
+        remaining = self.deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise self.deadline_exceeded("before calling")
+        return remaining
+
+    def attempt_timeout(self) -> Optional[float]:
+        """Return the time the next attempt may take, or raise if the deadline has passed."""
+        remaining = self.remaining_time()
+        if remaining is None:
+            return self.timeout
+        return remaining if self.timeout is None else min(self.timeout, remaining)
+
+    def apply_timeout(self) -> None:
+        """Pass the time left for this attempt to the provider call as timeout=."""
+        timeout = self.attempt_timeout()
+        if timeout is not None:
+            self.kwargs["timeout"] = timeout
+
+    def attempt(self) -> T:
+        """Make one attempt at the request once rate limit budget and a slot are available."""
+        queued = time.monotonic()
+        self.acquire_rate_limit()
+        limiter = concurrency.get(self.provider)
+        if limiter is None:
+            self.apply_timeout()
+            record_attempt(queued)
+            return self.invoke()
+
+        # Time spent queueing for a slot counts against the deadline
+        if not limiter.acquire(self.remaining_time()):
+            raise self.deadline_exceeded("waiting for a concurrency slot for")
+        started = time.monotonic()
+        record_attempt(queued, started)
+        try:
+            self.apply_timeout()
+            result = self.invoke()
+        except BaseException as e:
+            self.release_concurrency(limiter, started, e)
+            raise
+        if is_stream(result):
+            # A streamed response holds its slot until it has been read
+            return guard_stream(
+                result, lambda error: self.release_concurrency(limiter, started, error)
+            )
+        self.release_concurrency(limiter, started)
+        return result
+
+    async def aattempt(self) -> T:
+        """Make one asynchronous attempt once rate limit budget and a slot are available."""
+        queued = time.monotonic()
+        await self.aacquire_rate_limit()
+        limiter = concurrency.get(self.provider)
+        if limiter is None:
+            self.apply_timeout()
+            record_attempt(queued)
+            return await self.ainvoke()
+
+        # Time spent queueing for a slot counts against the deadline
+        if not await limiter.aacquire(self.remaining_time()):
+            raise self.deadline_exceeded("waiting for a concurrency slot for")
+        started = time.monotonic()
+        record_attempt(queued, started)
+        try:
+            self.apply_timeout()
+            result = await self.ainvoke()
+        except BaseException as e:
+            self.release_concurrency(limiter, started, e)
+            raise
+        if is_stream(result):
+            # A streamed response holds its slot until it has been read
+            return guard_stream(
+                result, lambda error: self.release_concurrency(limiter, started, error)
+            )
+        self.release_concurrency(limiter, started)
+        return result
+
+    def get_retry_policy(self) -> Optional[RetryPolicy]:
+        """Return the retry policy for this call, or None if retries are disabled."""
+        if self.retry is False:
+            return None
+        if isinstance(self.retry, RetryPolicy):
+            return self.retry
+        return retry_policies.get(self.provider)
+
+    def is_idempotent(self) -> bool:
+        """Return True if a failed call can safely be repeated from the start."""
+        return True
+
+    def get_breaker(self) -> Optional[CircuitBreaker]:
+        """Return the circuit breaker for this mode, provider and model, if enabled."""
+        return breakers.get(self.get_mode(), self.provider, self.model)
+
     def get_response(self) -> T:
-        """Process the request and return the provider response."""
-        return self.call()
+        """Process the request and return the provider response, retrying transient errors."""
+        breaker = self.get_breaker()
+        if breaker is None:
+            return self.retry_response()
+
+        # Fail fast while the provider is down instead of waiting for its timeouts
+        breaker.before_call()
+        try:
+            result = self.retry_response()
+        except BaseException as e:
+            breaker.record(e)
+            raise
+        if is_stream(result):
+            # A streamed response only succeeds once it has been read without errors
+            return guard_stream(result, breaker.record)
+        breaker.record()
+        return result
+
+    async def aget_response(self) -> T:
+        """Process the request asynchronously and return the provider response."""
+        breaker = self.get_breaker()
+        if breaker is None:
+            return await self.aretry_response()
+
+        breaker.before_call()
+        try:
+            result = await self.aretry_response()
+        except BaseException as e:
+            breaker.record(e)
+            raise
+        if is_stream(result):
+            # A streamed response only succeeds once it has been read without errors
+            return guard_stream(result, breaker.record)
+        breaker.record()
+        return result
+
+    def open_stream(self) -> Any:
+        """Start a streaming request through the same limits, breaker and retries as a call.
+
+        The stream holds its concurrency slot until it is exhausted, fails or is closed.
+        Retries cover opening the stream, not failures once it is being read.
+        """
+        self.opens_stream = True
+        return self.get_response()
+
+    async def aopen_stream(self) -> Any:
+        """Start an async streaming request through the same limits, breaker and retries."""
+        self.opens_stream = True
+        return await self.aget_response()
+
+    def retry_response(self) -> T:
+        """Make attempts at the request according to the retry policy."""
+        policy = self.get_retry_policy()
+        if policy is None:
+            return self.attempt()
+        return policy.call(
+            self.attempt, idempotent=self.is_idempotent(), deadline_at=self.deadline_at
+        )
+
+    async def aretry_response(self) -> T:
+        """Make asynchronous attempts at the request according to the retry policy."""
+        policy = self.get_retry_policy()
+        if policy is None:
+            return await self.aattempt()
+        return await policy.acall(
+            self.aattempt, idempotent=self.is_idempotent(), deadline_at=self.deadline_at
+        )
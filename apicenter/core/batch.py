@@ -0,0 +1,95 @@
+"""Bounded-concurrency execution of many requests over a lazily consumed iterable."""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import count, islice
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch item: its input position, the request and a result or error."""
+
+    index: int
+    request: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the request completed without raising."""
+        return self.error is None
+
+
+def _run_one(func: Callable[[Any], Any], index: int, request: Any) -> BatchResult:
+    """Run a single request, capturing any exception instead of propagating it."""
+    try:
+        return BatchResult(index, request, result=func(request))
+    except Exception as e:
+        return BatchResult(index, request, error=e)
+
+
+def run_batch(
+    func: Callable[[Any], Any],
+    requests: Iterable[Any],
+    workers: int = 8,
+    ordered: bool = True,
+    max_pending: Optional[int] = None,
+) -> Iterator[BatchResult]:
+    """Apply func to each request on a thread pool, yielding BatchResult objects.
+
+    At most max_pending requests (twice the worker count by default) are pulled from the
+    iterable at a time, so a slow consumer or a huge generator never grows memory.
+    Results come back in input order, or as soon as they finish when ordered is False.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if max_pending is None:
+        max_pending = workers * 2
+    max_pending = max(max_pending, workers)
+
+    items = zip(count(), iter(requests))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="apicenter-batch")
+
+    def submit(batch: Iterable[Tuple[int, Any]]) -> Iterator[Future]:
+        """Submit each (index, request) pair and yield its future."""
+        for index, request in batch:
+            yield executor.submit(_run_one, func, index, request)
+
+    try:
+        if ordered:
+            # A FIFO window keeps input order; only the head is ever waited on
+            window: Deque[Future] = deque(submit(islice(items, max_pending)))
+            while window:
+                result = window.popleft().result()
+                window.extend(submit(islice(items, 1)))
+                yield result
+        else:
+            pending = set(submit(islice(items, max_pending)))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                pending |= set(submit(islice(items, len(done))))
+                for future in done:
+                    yield future.result()
+    finally:
+        # Drop queued work if the consumer stops early
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def build_call(request: Any, defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge a batch item with default arguments into keyword arguments for a mode call.
+
+    Items are either a prompt (string or message list) or a dict of call arguments.
+    """
+    params = dict(defaults)
+    if isinstance(request, dict):
+        params.update(request)
+    else:
+        params["prompt"] = request
+
+    # Every call needs a provider, model and prompt
+    for field in ("provider", "model", "prompt"):
+        if params.get(field) is None:
+            raise ValueError(f"Batch request is missing '{field}'")
+    return params
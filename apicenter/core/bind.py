@@ -0,0 +1,156 @@
+"""Pre-bound calls that resolve a provider, model and defaults once for hot loops."""
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from .base import BaseProvider
+from .metrics import RequestRecord, current_record
+
+if TYPE_CHECKING:
+    from ..apicenter import APICenter
+
+# Options that need the full request path: caching, chains, hedging and output handling
+SLOW_PATH_OPTIONS = frozenset(
+    {
+        "cache",
+        "cache_ttl",
+        "fallbacks",
+        "hedge",
+        "sink",
+        "fsync",
+        "atomic",
+        "stream",
+        "retry",
+        "rate_limit",
+        "rate_limit_timeout",
+        "timeout",
+        "deadline",
+    }
+)
+
+# Options consumed when the provider is resolved, so they can be bound as defaults
+BINDABLE_OPTIONS = frozenset({"retry", "rate_limit", "rate_limit_timeout", "timeout", "deadline"})
+
+
+class BoundCall:
+    """A callable for one mode, provider and model with default options applied.
+
+    The provider class, configuration, pooled client and rate limit are resolved once and
+    reused, so each call only builds the request and sends it. Retries, rate limits,
+    circuit breakers, concurrency limits and timeouts still apply. Resolved state is
+    refreshed every refresh_interval seconds, so rotated keys and configuration changes
+    are picked up. Calls that need the full request path, because of their options or
+    an enabled response cache, go through APICenter as usual.
+    """
+
+    def __init__(
+        self,
+        center: "APICenter",
+        mode: str,
+        provider: str,
+        model: str,
+        refresh_interval: float = 1.0,
+        **defaults: Any,
+    ) -> None:
+        """Validate the target and defaults and resolve the provider once."""
+        self.center = center
+        self.mode = mode
+        self.provider = provider
+        self.model = model
+        self.refresh_interval = refresh_interval
+        self.defaults = defaults
+        self.provider_class = center.get_provider_class(mode, provider)
+
+        # Deadlines are relative to each call, so they are applied per request
+        self.deadline: Optional[float] = defaults.get("deadline")
+        self.fast = not (defaults.keys() & (SLOW_PATH_OPTIONS - BINDABLE_OPTIONS))
+        self._template: Optional[BaseProvider] = None
+        self._resolved_at = 0.0
+        self._lock = threading.Lock()
+        self.resolve()
+
+    def resolve(self) -> BaseProvider:
+        """Build the provider instance each request is copied from."""
+        options = {k: v for k, v in self.defaults.items() if k != "deadline"}
+        template = self.provider_class(self.provider, self.model, None, **options)
+        template.resolved = {}
+        with self._lock:
+            self._template = template
+            self._resolved_at = time.monotonic()
+        return template
+
+    def prepare(self, prompt: Any, kwargs: Dict[str, Any]) -> BaseProvider:
+        """Return a provider instance for one request, refreshing resolved state if due."""
+        template = self._template
+        if time.monotonic() - self._resolved_at >= self.refresh_interval:
+            template = self.resolve()
+
+        # A shallow copy without copy.copy's dispatch overhead
+        instance = object.__new__(type(template))
+        instance.__dict__.update(template.__dict__)
+        instance.prompt = prompt
+        instance.kwargs = {**template.kwargs, **kwargs} if kwargs else dict(template.kwargs)
+        if self.deadline is not None:
+            instance.deadline_at = time.monotonic() + self.deadline
+        return instance
+
+    def uses_fast_path(self, kwargs: Dict[str, Any]) -> bool:
+        """Return True if a call with these options can skip the full request path."""
+        return self.fast and self.center.cache is None and not (kwargs.keys() & SLOW_PATH_OPTIONS)
+
+    def __call__(self, prompt: Any, **kwargs: Any) -> Any:
+        """Send a request with the bound defaults, overridden by any options given."""
+        if not self.uses_fast_path(kwargs):
+            method = getattr(self.center, self.mode)
+            return method(self.provider, self.model, prompt, **{**self.defaults, **kwargs})
+
+        instance = self.prepare(prompt, kwargs)
+        record = self.center.metrics.start(self.mode, self.provider, self.model)
+        token = current_record.set(record)
+        started = time.monotonic()
+        try:
+            response = instance.get_response()
+        except Exception as e:
+            self.record(started, record, error=e)
+            raise
+        finally:
+            current_record.reset(token)
+        self.record(started, record, response)
+        return response
+
+    async def acall(self, prompt: Any, **kwargs: Any) -> Any:
+        """Send a request asynchronously with the bound defaults."""
+        if not self.uses_fast_path(kwargs):
+            method = getattr(self.center, f"a{self.mode}")
+            return await method(self.provider, self.model, prompt, **{**self.defaults, **kwargs})
+
+        instance = self.prepare(prompt, kwargs)
+        record = self.center.metrics.start(self.mode, self.provider, self.model)
+        token = current_record.set(record)
+        started = time.monotonic()
+        try:
+            response = await instance.aget_response()
+        except Exception as e:
+            self.record(started, record, error=e)
+            raise
+        finally:
+            current_record.reset(token)
+        self.record(started, record, response)
+        return response
+
+    def record(
+        self,
+        started: float,
+        record: Optional[RequestRecord],
+        response: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Report the call to the router and metrics hooks, as APICenter.execute does."""
+        latency = time.monotonic() - started
+        self.center.router.record(self.mode, self.provider, self.model, latency, response, error)
+        self.center.metrics.finish(record, response, error)
+
+    def __repr__(self) -> str:
+        """Show the bound target and defaults."""
+        return f"BoundCall({self.mode!r}, {self.provider!r}, {self.model!r}, {self.defaults!r})"
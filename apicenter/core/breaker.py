@@ -0,0 +1,252 @@
+"""Circuit breakers that fail fast while a provider, model or endpoint is down."""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Type
+
+from .errors import APIConnectionError, CircuitOpenError, RequestTimeoutError, ServerError
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Errors that indicate the provider itself is unhealthy; bad requests and auth errors do not
+DEFAULT_FAILURE_ON: Tuple[Type[BaseException], ...] = (
+    ServerError,
+    APIConnectionError,
+    RequestTimeoutError,
+)
+
+# Called with (key, old_state, new_state) whenever a breaker changes state
+StateListener = Callable[[Tuple[str, str, str], str, str], None]
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for one (mode, provider, model).
+
+    Closed: calls pass and outcomes fill a window of the last ``window`` calls. Once at
+    least ``min_calls`` are recorded and the failure share reaches ``failure_rate``, the
+    breaker opens and rejects calls for ``cooldown`` seconds. It then turns half-open and
+    lets ``half_open_probes`` calls through at a time; that many successes close it
+    again, while any failure reopens it.
+    """
+
+    def __init__(
+        self,
+        key: Tuple[str, str, str] = ("", "", ""),
+        failure_rate: float = 0.5,
+        min_calls: int = 10,
+        window: int = 20,
+        cooldown: float = 30.0,
+        half_open_probes: int = 1,
+        failure_on: Tuple[Type[BaseException], ...] = DEFAULT_FAILURE_ON,
+        on_state_change: Optional[StateListener] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a closed breaker with its thresholds."""
+        self.key = key
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.half_open_probes = max(1, half_open_probes)
+        self.failure_on = failure_on
+        self.on_state_change = on_state_change
+        self.clock = clock
+        self.state = CLOSED
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+        self.rejected = 0
+        self.transitions: Dict[str, int] = {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str) -> Optional[Tuple[str, str]]:
+        """Move to a new state; caller holds the lock and notifies listeners afterwards."""
+        if state == self.state:
+            return None
+        old, self.state = self.state, state
+        self.transitions[state] += 1
+        self.probes = 0
+        self.probe_successes = 0
+        if state == OPEN:
+            self.opened_at = self.clock()
+        elif state == CLOSED:
+            self.outcomes.clear()
+        return old, state
+
+    def _notify(self, change: Optional[Tuple[str, str]]) -> None:
+        """Report a state change to the listener outside the lock."""
+        if change is not None and self.on_state_change is not None:
+            self.on_state_change(self.key, *change)
+
+    def before_call(self) -> None:
+        """Admit a call, or raise CircuitOpenError if the breaker is rejecting calls."""
+        change = None
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self.opened_at + self.cooldown - self.clock()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        f"Circuit open for {'/'.join(self.key)}; retry in {remaining:.1f}s",
+                        provider=self.key[1] or None,
+                        retry_after=remaining,
+                    )
+                change = self._transition(HALF_OPEN)
+
+            if self.state == HALF_OPEN:
+                if self.probes >= self.half_open_probes:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        f"Circuit half-open for {'/'.join(self.key)}; probe in progress",
+                        provider=self.key[1] or None,
+                    )
+                self.probes += 1
+        self._notify(change)
+
+    def is_failure(self, error: BaseException) -> bool:
+        """Return True if an error counts against the provider's health."""
+        return isinstance(error, self.failure_on)
+
+    def record(self, error: Optional[BaseException] = None) -> None:
+        """Record how an admitted call ended; errors that are not failures are neutral."""
+        failed = error is not None and self.is_failure(error)
+        neutral = error is not None and not failed
+        change = None
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.probes = max(0, self.probes - 1)
+                if failed:
+                    change = self._transition(OPEN)
+                elif not neutral:
+                    self.probe_successes += 1
+                    if self.probe_successes >= self.half_open_probes:
+                        change = self._transition(CLOSED)
+            elif self.state == CLOSED and not neutral:
+                self.outcomes.append(failed)
+                failures = sum(self.outcomes)
+                if (
+                    len(self.outcomes) >= self.min_calls
+                    and failures / len(self.outcomes) >= self.failure_rate
+                ):
+                    change = self._transition(OPEN)
+        self._notify(change)
+
+    def reset(self) -> None:
+        """Close the breaker and forget recorded outcomes."""
+        with self._lock:
+            change = self._transition(CLOSED)
+            self.outcomes.clear()
+        self._notify(change)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the state, recent failure rate and rejection counters."""
+        with self._lock:
+            calls = len(self.outcomes)
+            return {
+                "state": self.state,
+                "recent_calls": calls,
+                "failure_rate": round(sum(self.outcomes) / calls, 3) if calls else 0.0,
+                "rejected": self.rejected,
+                "opened": self.transitions[OPEN],
+            }
+
+
+class CircuitBreakers:
+    """Registry of circuit breakers keyed by (mode, provider, model).
+
+    Breakers are opt-in: enable() them for one provider or for all of them. State changes
+    are reported to every listener added with add_listener().
+    """
+
+    def __init__(self) -> None:
+        """Start with circuit breaking disabled."""
+        self._breakers: Dict[Tuple[str, str, str], CircuitBreaker] = {}
+        self._options: Dict[str, Dict[str, Any]] = {}
+        self._default: Optional[Dict[str, Any]] = None
+        self._listeners: List[StateListener] = []
+        self._lock = threading.Lock()
+
+    def enable(self, provider: Optional[str] = None, **options: Any) -> None:
+        """Enable breakers for one provider, or all when provider is None.
+
+        Options are passed to CircuitBreaker (failure_rate, min_calls, cooldown, ...).
+        """
+        with self._lock:
+            if provider is None:
+                self._default = options
+                self._breakers.clear()
+            else:
+                self._options[provider] = options
+                for key in [k for k in self._breakers if k[1] == provider]:
+                    del self._breakers[key]
+
+    def disable(self, provider: Optional[str] = None) -> None:
+        """Disable breakers for one provider, or entirely."""
+        with self._lock:
+            if provider is None:
+                self._default = None
+                self._options.clear()
+                self._breakers.clear()
+            else:
+                self._options.pop(provider, None)
+                for key in [k for k in self._breakers if k[1] == provider]:
+                    del self._breakers[key]
+
+    def add_listener(self, listener: StateListener) -> None:
+        """Call listener(key, old_state, new_state) on every breaker state change."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: StateListener) -> None:
+        """Stop reporting state changes to a listener."""
+        self._listeners.remove(listener)
+
+    def _notify(self, key: Tuple[str, str, str], old: str, new: str) -> None:
+        """Fan a state change out to every listener."""
+        for listener in list(self._listeners):
+            listener(key, old, new)
+
+    def get(self, mode: str, provider: str, model: str) -> Optional[CircuitBreaker]:
+        """Return the breaker for a model, or None if breakers are not enabled for it."""
+        key = (mode, provider, model)
+        breaker = self._breakers.get(key)
+        if breaker is not None:
+            return breaker
+
+        with self._lock:
+            options = self._options.get(provider, self._default)
+            if options is None:
+                return None
+            if key not in self._breakers:
+                options = dict(options)
+                callback = options.pop("on_state_change", None)
+
+                def on_state_change(key: Tuple[str, str, str], old: str, new: str) -> None:
+                    if callback is not None:
+                        callback(key, old, new)
+                    self._notify(key, old, new)
+
+                self._breakers[key] = CircuitBreaker(
+                    key=key, on_state_change=on_state_change, **options
+                )
+            return self._breakers[key]
+
+    def reset(self) -> None:
+        """Close every breaker."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        for breaker in breakers:
+            breaker.reset()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return statistics for every breaker, keyed by mode/provider/model."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {"/".join(key): breaker.stats() for key, breaker in breakers.items()}
+
+
+# Singleton registry shared by every provider
+breakers = CircuitBreakers()
@@ -0,0 +1,171 @@
+"""Opt-in response cache keyed by a canonical hash of the request."""
+
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Protocol
+
+# Call options that change how a result is delivered rather than what it contains
+UNCACHEABLE_OPTIONS = ("sink", "stream")
+
+# Options that control how a request is sent rather than what it asks for
+TRANSPORT_OPTIONS = ("timeout", "deadline", "retry", "rate_limit", "rate_limit_timeout")
+
+
+def make_key(mode: str, provider: str, model: str, prompt: Any, kwargs: Dict[str, Any]) -> str:
+    """Return a stable hash of a request that ignores keyword argument order."""
+    payload = {
+        "mode": mode,
+        "provider": provider,
+        "model": model,
+        "prompt": prompt,
+        "kwargs": {k: v for k, v in kwargs.items() if k not in TRANSPORT_OPTIONS},
+    }
+
+    # Sorted keys make message dicts and kwargs order-independent; repr covers SDK objects
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(mode: str, kwargs: Dict[str, Any]) -> bool:
+    """Return True if a request is deterministic enough to serve from the cache by default.
+
+    Text is only cached with temperature 0 or a fixed seed; streamed or sunk output never is.
+    """
+    if any(kwargs.get(option) for option in UNCACHEABLE_OPTIONS):
+        return False
+    if mode == "text":
+        return kwargs.get("temperature") == 0 or kwargs.get("seed") is not None
+    return True
+
+
+def size_of(value: Any) -> int:
+    """Estimate the memory held by a cached response in bytes."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (list, tuple)):
+        return sum(size_of(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class Cache(Protocol):
+    """What APICenter needs from a response cache: ResponseCache, DiskCache or your own."""
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached response for a key, or None."""
+        ...
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a response under a key, expiring after ttl seconds if given."""
+        ...
+
+
+@dataclass
+class CacheEntry:
+    """A cached response with its size and expiry time."""
+
+    value: Any
+    size: int
+    expires_at: Optional[float] = None
+
+
+class ResponseCache:
+    """Thread-safe in-memory LRU cache bounded by entry count, total bytes and TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        ttl: Optional[float] = 3600.0,
+    ) -> None:
+        """Initialize the cache with entry, byte and age limits (None disables a limit)."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached response for a key, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at is not None:
+                if entry.expires_at <= time.monotonic():
+                    self._remove(key)
+                    entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            # Mark as most recently used
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a response, evicting least recently used entries to stay within limits."""
+        size = size_of(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(value, size, expires_at)
+            self.total_bytes += size
+
+            # Evict from the least recently used end
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and its byte count; the caller must hold the lock."""
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry if present."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss, eviction and size counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
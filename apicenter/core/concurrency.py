@@ -0,0 +1,278 @@
+"""Adaptive (AIMD) concurrency limits driven by latency, overload errors and rate-limit headers."""
+
+import asyncio
+import inspect
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from .errors import RateLimitError, RateLimitExceeded, ServerError
+from .retry import reset_delay
+
+# Response headers reporting how many requests are left in the current window
+REMAINING_REQUEST_HEADERS = (
+    "x-ratelimit-remaining-requests",
+    "anthropic-ratelimit-requests-remaining",
+)
+REMAINING_TOKEN_HEADERS = (
+    "x-ratelimit-remaining-tokens",
+    "anthropic-ratelimit-tokens-remaining",
+)
+
+# Server statuses that mean "too busy" rather than "broken"
+OVERLOAD_STATUSES = (503, 529)
+
+# How often async waiters re-check for a free slot
+POLL_INTERVAL = 0.01
+
+
+def is_overload(error: BaseException) -> bool:
+    """Return True if an error means the provider wants less traffic."""
+    if isinstance(error, RateLimitExceeded):
+        return False
+    if isinstance(error, RateLimitError):
+        return True
+    return isinstance(error, ServerError) and error.status_code in OVERLOAD_STATUSES
+
+
+def _header_int(headers: Mapping[str, str], names: Any) -> Optional[int]:
+    """Return the smallest integer value among the named headers, if any is present."""
+    values = []
+    for name in names:
+        try:
+            values.append(int(float(headers[name])))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return min(values) if values else None
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that grows additively while healthy and shrinks multiplicatively.
+
+    Each healthy completion adds increase/limit (about +increase per round of requests);
+    an overload response multiplies the limit by decrease, and latency above
+    latency_tolerance times the baseline by latency_decrease. Rate-limit headers pace
+    new requests so the remaining budget lasts until the window resets.
+    """
+
+    def __init__(
+        self,
+        initial: float = 8,
+        min_limit: float = 1,
+        max_limit: float = 256,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_decrease: float = 0.9,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.05,
+    ) -> None:
+        """Initialize the limit, its bounds and how quickly it adapts."""
+        self.limit = float(initial)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_decrease = latency_decrease
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.baseline: Optional[float] = None
+        self.in_flight = 0
+        self.interval = 0.0
+        self.next_slot = 0.0
+        self.paused_until = 0.0
+        self.successes = 0
+        self.overloads = 0
+        self.slow = 0
+        self._cond = threading.Condition()
+
+    def _try_acquire(self) -> Optional[float]:
+        """Take a slot if allowed now, else return how long to wait; caller holds the lock."""
+        now = time.monotonic()
+        gate = max(self.paused_until, self.next_slot)
+        if now < gate:
+            return gate - now
+        if self.in_flight >= max(1, int(self.limit)):
+            return None
+        self.in_flight += 1
+        self.next_slot = now + self.interval
+        return 0.0
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a slot is free; return False if timeout expires first."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while True:
+                wait = self._try_acquire()
+                if wait == 0.0:
+                    return True
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                # Slot waits are woken by release(); pacing waits by the clock
+                waits = [w for w in (wait, remaining) if w is not None]
+                self._cond.wait(min(waits) if waits else None)
+
+    async def aacquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a slot without blocking the event loop; return False on timeout."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._cond:
+                wait = self._try_acquire()
+            if wait == 0.0:
+                return True
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                return False
+            wait = POLL_INTERVAL if wait is None else wait
+            await asyncio.sleep(wait if remaining is None else min(wait, remaining))
+
+    def release(self, latency: float, overloaded: bool = False, failed: bool = False) -> None:
+        """Free a slot and adapt the limit to how the request went."""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+
+            if overloaded:
+                self.overloads += 1
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+            elif not failed:
+                self.successes += 1
+                if self.baseline is not None and latency > self.baseline * self.latency_tolerance:
+                    # Queueing at the provider shows up as latency before it shows up as 429s
+                    self.slow += 1
+                    self.limit = max(self.min_limit, self.limit * self.latency_decrease)
+                else:
+                    self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+
+                # Track typical latency slowly so a burst of slow calls does not become normal
+                if self.baseline is None:
+                    self.baseline = latency
+                else:
+                    self.baseline += self.smoothing * (latency - self.baseline)
+
+            self._cond.notify_all()
+
+    def observe_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """Pace future requests from x-ratelimit-remaining-* style response headers."""
+        if not headers:
+            return
+        headers = {k.lower(): v for k, v in dict(headers).items()}
+        requests_left = _header_int(headers, REMAINING_REQUEST_HEADERS)
+        tokens_left = _header_int(headers, REMAINING_TOKEN_HEADERS)
+        if requests_left is None and tokens_left is None:
+            return
+        reset = reset_delay(headers) or 0.0
+
+        with self._cond:
+            now = time.monotonic()
+            if requests_left == 0 or tokens_left == 0:
+                # The window is spent: hold new requests until it resets
+                self.paused_until = max(self.paused_until, now + reset)
+                self.interval = 0.0
+            elif requests_left is not None and requests_left < self.limit and reset > 0:
+                # Spread the requests that are left over the rest of the window
+                self.interval = reset / requests_left
+            else:
+                self.interval = 0.0
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current limit, load and adaptation counters."""
+        with self._cond:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "baseline_latency": self.baseline,
+                "pacing_interval": self.interval,
+                "paused_for": max(0.0, self.paused_until - time.monotonic()),
+                "successes": self.successes,
+                "overloads": self.overloads,
+                "slow": self.slow,
+            }
+
+
+class ConcurrencyControl:
+    """Registry of adaptive limiters, one per provider, enabled per provider or globally."""
+
+    def __init__(self) -> None:
+        """Start with adaptive concurrency disabled for every provider."""
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._options: Dict[str, Dict[str, Any]] = {}
+        self._default: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def enable(self, provider: Optional[str] = None, **options: Any) -> None:
+        """Enable adaptive concurrency for one provider, or all when provider is None.
+
+        Options are passed to AdaptiveLimiter (initial, min_limit, max_limit, ...).
+        """
+        with self._lock:
+            if provider is None:
+                self._default = options
+                self._limiters.clear()
+            else:
+                self._options[provider] = options
+                self._limiters.pop(provider, None)
+
+    def disable(self, provider: Optional[str] = None) -> None:
+        """Disable adaptive concurrency for one provider, or entirely."""
+        with self._lock:
+            if provider is None:
+                self._default = None
+                self._options.clear()
+                self._limiters.clear()
+            else:
+                self._options.pop(provider, None)
+                self._limiters.pop(provider, None)
+
+    def get(self, provider: str) -> Optional[AdaptiveLimiter]:
+        """Return the limiter for a provider, or None if it is not enabled."""
+        limiter = self._limiters.get(provider)
+        if limiter is not None:
+            return limiter
+
+        with self._lock:
+            options = self._options.get(provider, self._default)
+            if options is None:
+                return None
+            return self._limiters.setdefault(provider, AdaptiveLimiter(**options))
+
+    def observe_headers(self, provider: str, headers: Optional[Mapping[str, str]]) -> None:
+        """Feed rate-limit headers from a provider response to its limiter."""
+        limiter = self.get(provider)
+        if limiter is not None:
+            limiter.observe_headers(headers)
+
+    def instrument(self, provider: str, client: Any) -> None:
+        """Attach a response hook to an SDK client's httpx client to read rate-limit headers.
+
+        Works with SDKs that keep their httpx client in ``_client`` (OpenAI, Anthropic);
+        other clients are left untouched.
+        """
+        http = getattr(client, "_client", None)
+        hooks = getattr(http, "event_hooks", None)
+        if not isinstance(hooks, dict) or getattr(http, "_apicenter_instrumented", False):
+            return
+
+        if inspect.iscoroutinefunction(getattr(http, "send", None)):
+
+            async def hook(response: Any) -> None:
+                self.observe_headers(provider, response.headers)
+
+        else:
+
+            def hook(response: Any) -> None:
+                self.observe_headers(provider, response.headers)
+
+        hooks.setdefault("response", []).append(hook)
+        http.event_hooks = hooks
+        http._apicenter_instrumented = True
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return statistics for every active limiter."""
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {provider: limiter.stats() for provider, limiter in limiters.items()}
+
+
+# Singleton registry shared by every provider
+concurrency = ConcurrencyControl()
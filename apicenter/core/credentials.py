@@ -2,17 +2,56 @@
 
 import json
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Called with the (mode, provider) pairs whose credentials changed on reload
+ReloadListener = Callable[[Set[Tuple[str, str]]], None]
+
+# Identifies a version of the credentials file: (inode, modification time, size)
+FileStamp = Optional[Tuple[int, int, int]]
 
 
 class CredentialsProvider:
-    """Provider for loading and managing API credentials across services."""
+    """Provider for loading and managing API credentials across services.
+
+    The credentials file is located and parsed on first use rather than at import. After
+    that, at most once every check_interval seconds, a stat() of the file detects edits or
+    replacement (a changed inode, modification time or size) and the file is reloaded,
+    so keys can be rotated without restarting the process.
+    """
+
+    def __init__(self, check_interval: float = 1.0) -> None:
+        """Initialize the provider without touching the filesystem."""
+        self.check_interval = check_interval
+        self.version = 0
+        self._path: Optional[Path] = None
+        self._credentials: Optional[Dict[str, Any]] = None
+        self._stamp: FileStamp = None
+        self._checked_at = 0.0
+        self._listeners: List[ReloadListener] = []
+        self._lock = threading.RLock()
+
+    @property
+    def credentials_path(self) -> Path:
+        """Return the credentials file in use, locating it on first access."""
+        if self._path is None:
+            self._path = self.find_credentials_file()
+        return self._path
+
+    @property
+    def credentials(self) -> Dict[str, Any]:
+        """Return the parsed credentials, loading or reloading the file if needed."""
+        self.refresh()
+        return self._credentials
 
-    def __init__(self) -> None:
-        """Initialize credentials by locating and loading the credentials file."""
-        self.credentials_path = self.find_credentials_file()
-        self.credentials = self.load_credentials()
+    @credentials.setter
+    def credentials(self, value: Dict[str, Any]) -> None:
+        """Replace the credentials in memory, e.g. from a secrets manager."""
+        with self._lock:
+            self._apply(value, self.file_stamp())
 
     def find_credentials_file(self) -> Path:
         """Locate credentials file in standard locations or from environment variable."""
@@ -57,6 +96,78 @@ class CredentialsProvider:
                 f"Credentials file at {self.credentials_path} is not a valid JSON file."
             )
 
+    def file_stamp(self) -> FileStamp:
+        """Return the credentials file's identity and version, or None if it is missing."""
+        try:
+            stat = os.stat(self.credentials_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _checked_recently(self, now: float) -> bool:
+        """Return True if the credentials are loaded and the file was checked lately."""
+        return self._credentials is not None and now - self._checked_at < self.check_interval
+
+    def refresh(self, force: bool = False) -> bool:
+        """Load the credentials on first use and reload them if the file changed.
+
+        Returns True if the credentials were (re)loaded.
+        """
+        now = time.monotonic()
+        if not force and self._checked_recently(now):
+            return False
+
+        with self._lock:
+            if not force and self._checked_recently(now):
+                return False
+            self._checked_at = now
+            stamp = self.file_stamp()
+            if not force and self._credentials is not None and stamp == self._stamp:
+                return False
+
+            try:
+                loaded = self.load_credentials()
+            except ValueError:
+                # Keep serving the old keys while the file is being rewritten
+                if self._credentials is None:
+                    raise
+                return False
+            self._apply(loaded, stamp)
+            return True
+
+    def reload(self) -> None:
+        """Locate and reload the credentials file now."""
+        with self._lock:
+            self._path = None
+            self.refresh(force=True)
+
+    def _apply(self, loaded: Dict[str, Any], stamp: FileStamp) -> None:
+        """Install newly loaded credentials and tell listeners which providers changed."""
+        previous = self._credentials
+        self._credentials = loaded
+        self._stamp = stamp
+        self.version += 1
+        if previous is None:
+            return
+
+        changed = {
+            key
+            for key in _provider_keys(previous) | _provider_keys(loaded)
+            if _provider_entry(previous, *key) != _provider_entry(loaded, *key)
+        }
+        if changed:
+            for listener in list(self._listeners):
+                listener(changed)
+
+    def add_listener(self, listener: ReloadListener) -> None:
+        """Call listener with the changed (mode, provider) pairs after each reload."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: ReloadListener) -> None:
+        """Stop notifying a listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
     def get_credentials(self, mode: str, provider: str) -> Dict[str, Any]:
         """Retrieve credentials for a specific provider in a given mode."""
         # No credentials needed for local providers
@@ -70,5 +181,20 @@ class CredentialsProvider:
             raise ValueError(f"No credentials found for {provider} in {mode} mode")
 
 
-# Singleton instance for global access
+def _provider_keys(credentials: Dict[str, Any]) -> Set[Tuple[str, str]]:
+    """Return every (mode, provider) pair configured in a credentials document."""
+    keys = set()
+    for mode, section in (credentials.get("modes") or {}).items():
+        for provider in (section or {}).get("providers") or {}:
+            keys.add((mode, provider))
+    return keys
+
+
+def _provider_entry(credentials: Dict[str, Any], mode: str, provider: str) -> Any:
+    """Return one provider's entry from a credentials document, or None."""
+    section = (credentials.get("modes") or {}).get(mode) or {}
+    return (section.get("providers") or {}).get(provider)
+
+
+# Singleton instance for global access; the file is read on first use
 credentials = CredentialsProvider()
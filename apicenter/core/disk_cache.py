@@ -0,0 +1,280 @@
+"""Persistent response cache stored in SQLite, shareable across worker processes."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .cache import size_of
+from .sink import write_to_sink
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value BLOB,
+    path TEXT,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+
+-- Running total of entry sizes, kept by triggers so writes don't have to sum the table
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM entries;
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET bytes = bytes - OLD.size WHERE id = 0;
+END;
+"""
+
+
+def default_cache_path() -> Path:
+    """Return the cache database path from the environment or the user's home directory."""
+    env_path = os.getenv("APICENTER_CACHE_PATH")
+    if env_path:
+        return Path(env_path)
+    return Path.home() / ".apicenter" / "cache.db"
+
+
+def encode_value(value: Any) -> Tuple[str, bytes]:
+    """Serialize a response into a kind tag and raw bytes."""
+    if isinstance(value, (bytes, bytearray)):
+        return "bytes", bytes(value)
+    if isinstance(value, str):
+        return "text", value.encode("utf-8")
+    return "json", json.dumps(value).encode("utf-8")
+
+
+def decode_value(kind: str, data: bytes) -> Any:
+    """Deserialize raw bytes stored under a kind tag."""
+    if kind == "bytes":
+        return data
+    if kind == "text":
+        return data.decode("utf-8")
+    return json.loads(data.decode("utf-8"))
+
+
+class DiskCache:
+    """SQLite-backed LRU response cache with TTLs, a byte budget and optional blob files.
+
+    Uses WAL journaling so many processes can read while one writes. Binary values at
+    least blob_threshold bytes long are kept as files under blob_dir when it is set.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, os.PathLike]] = None,
+        max_bytes: Optional[int] = 1024 * 1024 * 1024,
+        ttl: Optional[float] = 7 * 24 * 3600.0,
+        blob_dir: Optional[Union[str, os.PathLike]] = None,
+        blob_threshold: int = 256 * 1024,
+    ) -> None:
+        """Open (or create) the cache database and blob directory."""
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.blob_dir = Path(blob_dir) if blob_dir is not None else None
+        self.blob_threshold = blob_threshold
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.blob_dir is not None:
+            self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.connection.executescript(SCHEMA)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it in WAL mode on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def blob_path(self, key: str) -> Path:
+        """Return the side file path for a key, fanned out over subdirectories."""
+        return self.blob_dir / key[:2] / key
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached response for a key, or None on a miss or expired entry."""
+        now = time.time()
+        row = self.connection.execute(
+            "SELECT kind, value, path, expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+
+        value = None
+        if row is not None:
+            kind, data, path, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self.delete(key)
+            else:
+                try:
+                    if path is not None:
+                        data = Path(path).read_bytes()
+                    value = decode_value(kind, data)
+                except OSError:
+                    # The side file was removed behind our back
+                    self.delete(key)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        # Record the access for least-recently-used eviction
+        self.connection.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a response, evicting least recently used entries to stay within budget."""
+        kind, data = encode_value(value)
+        size = size_of(data)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+
+        # Large binary payloads go to side files so the database stays small
+        path = None
+        if self.blob_dir is not None and kind == "bytes" and size >= self.blob_threshold:
+            blob_path = self.blob_path(key)
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            write_to_sink([data], blob_path, atomic=True)
+            path, data = str(blob_path), None
+
+        previous = self.connection.execute(
+            "SELECT path FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        # Upsert rather than REPLACE, whose implicit delete would skip the size triggers
+        self.connection.execute(
+            "INSERT INTO entries "
+            "(key, kind, value, path, size, created_at, accessed_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET kind = excluded.kind, value = excluded.value, "
+            "path = excluded.path, size = excluded.size, created_at = excluded.created_at, "
+            "accessed_at = excluded.accessed_at, expires_at = excluded.expires_at",
+            (key, kind, data, path, size, now, now, expires_at),
+        )
+        if previous is not None and previous[0] and previous[0] != path:
+            Path(previous[0]).unlink(missing_ok=True)
+
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+
+    def _delete_rows(self, rows: List[Tuple[str, Optional[str]]]) -> int:
+        """Delete (key, path) rows and their side files, returning the number removed."""
+        for key, path in rows:
+            self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            if path:
+                Path(path).unlink(missing_ok=True)
+        return len(rows)
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry if present."""
+        rows = self.connection.execute(
+            "SELECT key, path FROM entries WHERE key = ?", (key,)
+        ).fetchall()
+        self._delete_rows(rows)
+
+    def evict(self, max_bytes: int) -> int:
+        """Remove least recently used entries until the total size fits max_bytes."""
+        # The running total makes the common under-budget case a single-row read
+        removed = 0
+        total = self.total_bytes()
+        while total > max_bytes:
+            rows = self.connection.execute(
+                "SELECT key, path, size FROM entries ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, path, size in rows:
+                if total <= max_bytes:
+                    break
+                removed += self._delete_rows([(key, path)])
+                total -= size
+
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+    def prune(self, max_bytes: Optional[int] = None, vacuum: bool = False) -> Dict[str, int]:
+        """Delete expired entries, then evict down to the byte budget; optionally VACUUM."""
+        rows = self.connection.execute(
+            "SELECT key, path FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time(),),
+        ).fetchall()
+        expired = self._delete_rows(rows)
+
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        evicted = self.evict(budget) if budget is not None else 0
+
+        if vacuum:
+            self.connection.execute("VACUUM")
+        return {"expired": expired, "evicted": evicted}
+
+    def total_bytes(self) -> int:
+        """Return the combined size of all cached responses."""
+        return self.connection.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove every entry and side file."""
+        rows = self.connection.execute("SELECT key, path FROM entries").fetchall()
+        self._delete_rows(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry counts and sizes from the database plus this process's counters."""
+        entries, total, blobs, expired = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COUNT(path), "
+            "COALESCE(SUM(expires_at IS NOT NULL AND expires_at <= ?), 0) FROM entries",
+            (time.time(),),
+        ).fetchone()
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": str(self.path),
+                "entries": entries,
+                "bytes": total,
+                "blob_files": blobs,
+                "expired": expired,
+                "database_bytes": self.path.stat().st_size if self.path.exists() else 0,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        """Close this thread's database connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
@@ -0,0 +1,200 @@
+"""Typed errors raised by every provider, carrying status and retry metadata."""
+
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Type
+
+# Phrases providers use when a prompt or output is blocked by a safety system
+CONTENT_FILTER_MARKERS = (
+    "content_policy",
+    "content policy",
+    "content_filter",
+    "safety system",
+    "moderation",
+    "invalid_prompts",
+)
+
+
+class APICenterError(ValueError):
+    """Base class for provider errors, with the HTTP status and retry hints when known.
+
+    Subclasses ValueError so existing ``except ValueError`` handlers keep working.
+    """
+
+    retryable = False
+
+    def __init__(
+        self,
+        message: str,
+        provider: Optional[str] = None,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        response: Any = None,
+        retryable: Optional[bool] = None,
+    ) -> None:
+        """Initialize the error with its message and any metadata from the response."""
+        super().__init__(message)
+        self.provider = provider
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.headers: Dict[str, str] = {k.lower(): v for k, v in dict(headers or {}).items()}
+        self.response = response
+        if retryable is not None:
+            self.retryable = retryable
+
+
+class RateLimitError(APICenterError):
+    """The provider throttled the request (HTTP 429)."""
+
+    retryable = True
+
+
+class RateLimitExceeded(RateLimitError):
+    """The client-side rate limit budget was exhausted before the request was sent."""
+
+    retryable = False
+
+
+class RequestTimeoutError(APICenterError):
+    """The request did not complete in time."""
+
+    retryable = True
+
+
+class ServerError(APICenterError):
+    """The provider failed or was overloaded (HTTP 5xx)."""
+
+    retryable = True
+
+
+class APIConnectionError(APICenterError):
+    """The provider could not be reached."""
+
+    retryable = True
+
+
+class CircuitOpenError(APICenterError):
+    """Calls to a failing provider are being rejected until its circuit breaker recovers."""
+
+
+class AuthenticationError(APICenterError):
+    """The API key is missing, invalid or lacks permission (HTTP 401/403)."""
+
+
+class InvalidRequestError(APICenterError):
+    """The provider rejected the request parameters (HTTP 4xx)."""
+
+
+class ContentFilterError(APICenterError):
+    """The prompt or output was blocked by the provider's safety system."""
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Return the delay in seconds requested by Retry-After style headers, if any."""
+    if not headers:
+        return None
+    headers = {k.lower(): v for k, v in dict(headers).items()}
+
+    # Non-standard millisecond header sent by OpenAI and Anthropic
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(0.0, float(value) / 1000.0)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    # Retry-After may also be an HTTP date
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def error_class_for_status(status_code: Optional[int], message: str = "") -> Type[APICenterError]:
+    """Choose the error type for an HTTP status code and error message."""
+    lowered = message.lower()
+    if any(marker in lowered for marker in CONTENT_FILTER_MARKERS):
+        return ContentFilterError
+    if status_code is None:
+        return APICenterError
+    if status_code in (401, 403):
+        return AuthenticationError
+    if status_code == 408:
+        return RequestTimeoutError
+    if status_code == 429:
+        return RateLimitError
+    if status_code >= 500:
+        return ServerError
+    if status_code >= 400:
+        return InvalidRequestError
+    return APICenterError
+
+
+def error_from_status(
+    provider: str,
+    message: str,
+    status_code: Optional[int],
+    headers: Optional[Mapping[str, str]] = None,
+    response: Any = None,
+) -> APICenterError:
+    """Build a typed error for an HTTP error response."""
+    if not isinstance(headers, Mapping):
+        headers = None
+    error_class = error_class_for_status(status_code, message)
+
+    # An exhausted quota also comes back as 429 but will not recover by waiting
+    retryable = None
+    if error_class is RateLimitError and "insufficient_quota" in message:
+        retryable = False
+
+    return error_class(
+        message,
+        provider=provider,
+        status_code=status_code,
+        retry_after=parse_retry_after(headers),
+        headers=headers,
+        response=response,
+        retryable=retryable,
+    )
+
+
+def translate_error(
+    provider: str, error: BaseException, prefix: str, hint: str = ""
+) -> APICenterError:
+    """Convert an SDK or transport exception into a typed APICenterError.
+
+    Reads the status code, headers and response from the exception where the SDK provides
+    them (OpenAI, Anthropic, ElevenLabs, Ollama, httpx and requests all expose some).
+    """
+    if isinstance(error, APICenterError):
+        return error
+
+    message = f"{prefix}: {str(error)}{hint}"
+    response = getattr(error, "response", None)
+    status_code = getattr(error, "status_code", None)
+    if not isinstance(status_code, int):
+        status_code = getattr(response, "status_code", None)
+    if not isinstance(status_code, int):
+        status_code = None
+
+    headers = getattr(error, "headers", None) or getattr(response, "headers", None)
+    if not isinstance(headers, Mapping):
+        headers = None
+
+    # Timeouts and connection failures carry no status code
+    names = " ".join(cls.__name__ for cls in type(error).__mro__)
+    if status_code is None and (isinstance(error, TimeoutError) or "Timeout" in names):
+        return RequestTimeoutError(message, provider=provider, response=response)
+    if status_code is None and (isinstance(error, ConnectionError) or "Connect" in names):
+        return APIConnectionError(message, provider=provider, response=response)
+
+    return error_from_status(provider, message, status_code, headers, response)
@@ -0,0 +1,339 @@
+"""Failover chains that move a request to the next provider and model when one fails."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from .errors import (
+    APIConnectionError,
+    CircuitOpenError,
+    RateLimitError,
+    RequestTimeoutError,
+    ServerError,
+)
+
+# Errors that move a request on to the next hop
+DEFAULT_FALLBACK_ON: Tuple[Type[BaseException], ...] = (
+    RateLimitError,
+    ServerError,
+    APIConnectionError,
+    RequestTimeoutError,
+    CircuitOpenError,
+)
+
+# Option names each provider expects in place of the equivalents other providers use
+KWARG_ALIASES: Dict[str, Dict[str, str]] = {
+    "openai": {
+        "num_predict": "max_tokens",
+        "stop_sequences": "stop",
+        "samples": "n",
+    },
+    "anthropic": {
+        "num_predict": "max_tokens",
+        "max_completion_tokens": "max_tokens",
+        "stop": "stop_sequences",
+    },
+    "ollama": {
+        "max_tokens": "num_predict",
+        "max_completion_tokens": "num_predict",
+        "stop_sequences": "stop",
+    },
+    "stability": {
+        "n": "samples",
+    },
+}
+
+# Options a provider rejects outright and that are safe to leave out on a fallback hop
+UNSUPPORTED_OPTIONS: Dict[str, Tuple[str, ...]] = {
+    # Stability AI image options with no OpenAI equivalent
+    "openai": (
+        "height",
+        "width",
+        "cfg_scale",
+        "steps",
+        "style_preset",
+        "negative_prompt",
+        "accept",
+    ),
+    "anthropic": ("seed", "frequency_penalty", "presence_penalty", "response_format", "n"),
+    "ollama": ("response_format", "n"),
+    # OpenAI image options with no Stability AI equivalent
+    "stability": ("size", "quality", "style", "response_format", "output_format", "user"),
+}
+
+
+@dataclass
+class Hop:
+    """One (provider, model) in a fallback chain, with options that apply only to it."""
+
+    provider: str
+    model: str
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Route:
+    """Which hops a request tried and which one served it."""
+
+    mode: str
+    tried: List[Tuple[str, str]] = field(default_factory=list)
+    errors: List[Tuple[str, str, str]] = field(default_factory=list)
+    served_by: Optional[Tuple[str, str]] = None
+
+    @property
+    def fallbacks(self) -> int:
+        """Return how many hops failed before the request was served."""
+        return len(self.errors)
+
+
+HopSpec = Union[Hop, Tuple[Any, ...], Dict[str, Any]]
+
+# The route taken by the most recent chained request in this thread or task
+last_route: ContextVar[Optional[Route]] = ContextVar("apicenter_last_route", default=None)
+
+
+def as_hop(spec: HopSpec) -> Hop:
+    """Build a Hop from a Hop, a (provider, model[, options]) tuple or a dict."""
+    if isinstance(spec, Hop):
+        return spec
+    if isinstance(spec, dict):
+        options = dict(spec)
+        try:
+            return Hop(options.pop("provider"), options.pop("model"), options)
+        except KeyError as e:
+            raise ValueError(f"Fallback hop is missing '{e.args[0]}'") from e
+    if isinstance(spec, (tuple, list)) and len(spec) in (2, 3):
+        return Hop(spec[0], spec[1], dict(spec[2]) if len(spec) == 3 else {})
+    raise ValueError(f"Invalid fallback hop: {spec!r}")
+
+
+def translate_kwargs(provider: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Rename options to the names a provider expects and drop ones it rejects."""
+    aliases = KWARG_ALIASES.get(provider, {})
+    unsupported = UNSUPPORTED_OPTIONS.get(provider, ())
+    translated: Dict[str, Any] = {}
+    for name, value in kwargs.items():
+        if name in unsupported:
+            continue
+        target = aliases.get(name, name)
+        # An option given under the provider's own name wins over a translated one
+        if target != name and target in kwargs:
+            continue
+        translated[target] = value
+    return translated
+
+
+def hop_kwargs(hop: Hop, provider: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a hop's options: kwargs written for provider, translated if needed, plus its own."""
+    if hop.provider != provider:
+        kwargs = translate_kwargs(hop.provider, kwargs)
+    return {**kwargs, **hop.options}
+
+
+class FallbackPolicy:
+    """Ordered hops to try after the requested provider and model fail.
+
+    A hop failing with one of fallback_on moves the request to the next hop. deadline caps
+    the time spent across the whole chain, and hop_timeout abandons a hop that has not
+    answered in time and moves on.
+    """
+
+    def __init__(
+        self,
+        hops: Sequence[HopSpec],
+        fallback_on: Tuple[Type[BaseException], ...] = DEFAULT_FALLBACK_ON,
+        deadline: Optional[float] = None,
+        hop_timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize the chain of hops and when to move along it."""
+        self.hops = [as_hop(hop) for hop in hops]
+        self.fallback_on = fallback_on
+        self.deadline = deadline
+        self.hop_timeout = hop_timeout
+
+    def chain(self, provider: str, model: str) -> List[Hop]:
+        """Return the hops for a request: the requested model first, then the fallbacks."""
+        hops = [Hop(provider, model)]
+        hops.extend(h for h in self.hops if (h.provider, h.model) != (provider, model))
+        return hops
+
+    def should_fallback(self, error: BaseException, idempotent: bool = True) -> bool:
+        """Return True if an error should move the request to the next hop."""
+        if not isinstance(error, self.fallback_on):
+            return False
+        # Output already written somewhere can't be redone, but rejected requests never started
+        return idempotent or isinstance(error, (RateLimitError, CircuitOpenError))
+
+    def time_left(self, started: float) -> Optional[float]:
+        """Return the time a hop may take, or None if it is unbounded."""
+        limits = []
+        if self.deadline is not None:
+            limits.append(self.deadline - (time.monotonic() - started))
+        if self.hop_timeout is not None:
+            limits.append(self.hop_timeout)
+        return min(limits) if limits else None
+
+
+class FallbackPolicies:
+    """Registry of named fallback policies."""
+
+    def __init__(self) -> None:
+        """Start with no named policies."""
+        self._policies: Dict[str, FallbackPolicy] = {}
+
+    def set(self, name: str, policy: Union[FallbackPolicy, Sequence[HopSpec]]) -> None:
+        """Register a policy, or a plain list of hops, under a name."""
+        if not isinstance(policy, FallbackPolicy):
+            policy = FallbackPolicy(policy)
+        self._policies[name] = policy
+
+    def remove(self, name: str) -> None:
+        """Forget a named policy."""
+        self._policies.pop(name, None)
+
+    def resolve(self, fallbacks: Union[str, FallbackPolicy, Sequence[HopSpec]]) -> FallbackPolicy:
+        """Return the policy for a per-call fallbacks= value: a name, a policy or hops."""
+        if isinstance(fallbacks, FallbackPolicy):
+            return fallbacks
+        if isinstance(fallbacks, str):
+            if fallbacks not in self._policies:
+                raise ValueError(f"Unknown fallback policy: {fallbacks}")
+            return self._policies[fallbacks]
+        return FallbackPolicy(fallbacks)
+
+
+# Worker threads for hops run under a timeout; a hop that overruns is left to finish here
+TIMED_HOP_WORKERS = 16
+_timed_executor: Optional[ThreadPoolExecutor] = None
+_timed_executor_lock = threading.Lock()
+
+
+def _get_timed_executor() -> ThreadPoolExecutor:
+    """Return the executor that runs hops under a timeout, creating it on first use."""
+    global _timed_executor
+    with _timed_executor_lock:
+        if _timed_executor is None:
+            _timed_executor = ThreadPoolExecutor(
+                max_workers=TIMED_HOP_WORKERS, thread_name_prefix="apicenter-fallback"
+            )
+        return _timed_executor
+
+
+def _overrun(hop: Hop, timeout: float) -> RequestTimeoutError:
+    """Build the error recorded for a hop that did not answer in time."""
+    return RequestTimeoutError(
+        f"{hop.provider}/{hop.model} did not respond within {timeout:.2f}s",
+        provider=hop.provider,
+    )
+
+
+def run_chain(
+    execute: Callable[[Hop, Dict[str, Any]], Any],
+    policy: FallbackPolicy,
+    mode: str,
+    provider: str,
+    model: str,
+    kwargs: Dict[str, Any],
+    idempotent: bool = True,
+) -> Any:
+    """Call execute(hop, kwargs) along the chain until a hop succeeds.
+
+    Non-idempotent requests (writing into a caller's file object) only fall back when the
+    failed hop never started, and are never abandoned mid-flight.
+    """
+    route = Route(mode)
+    last_route.set(route)
+    started = time.monotonic()
+    hops = policy.chain(provider, model)
+    deadline = kwargs.get("deadline")
+
+    for index, hop in enumerate(hops):
+        timeout = policy.time_left(started) if idempotent else None
+        options = hop_kwargs(hop, provider, kwargs)
+        route.tried.append((hop.provider, hop.model))
+
+        # Each hop gets what is left of the caller's deadline, not a fresh budget
+        if deadline is not None:
+            options["deadline"] = deadline - (time.monotonic() - started)
+        # The hop also stops itself at its timeout, so an abandoned hop frees its worker
+        if timeout is not None and timeout > 0:
+            options["deadline"] = min(options.get("deadline", timeout), timeout)
+        try:
+            if timeout is None:
+                result = execute(hop, options)
+            elif timeout <= 0:
+                raise _overrun(hop, 0.0)
+            else:
+                # Run the hop in a worker so an overrun can be abandoned for the next hop
+                context = copy_context()
+                future = _get_timed_executor().submit(context.run, execute, hop, options)
+                try:
+                    result = future.result(timeout)
+                except FutureTimeoutError:
+                    future.cancel()
+                    raise _overrun(hop, timeout) from None
+        except Exception as e:
+            route.errors.append((hop.provider, hop.model, repr(e)))
+            if index == len(hops) - 1 or not policy.should_fallback(e, idempotent):
+                raise
+            # A spent caller deadline leaves no time for the remaining hops
+            if deadline is not None and time.monotonic() - started >= deadline:
+                raise
+            continue
+        route.served_by = (hop.provider, hop.model)
+        return result
+
+
+async def arun_chain(
+    execute: Callable[[Hop, Dict[str, Any]], Awaitable[Any]],
+    policy: FallbackPolicy,
+    mode: str,
+    provider: str,
+    model: str,
+    kwargs: Dict[str, Any],
+    idempotent: bool = True,
+) -> Any:
+    """Await execute(hop, kwargs) along the chain until a hop succeeds."""
+    route = Route(mode)
+    last_route.set(route)
+    started = time.monotonic()
+    hops = policy.chain(provider, model)
+    deadline = kwargs.get("deadline")
+
+    for index, hop in enumerate(hops):
+        timeout = policy.time_left(started) if idempotent else None
+        options = hop_kwargs(hop, provider, kwargs)
+        route.tried.append((hop.provider, hop.model))
+
+        # Each hop gets what is left of the caller's deadline, not a fresh budget
+        if deadline is not None:
+            options["deadline"] = deadline - (time.monotonic() - started)
+        # Hops that run in a worker thread cannot be cancelled, so they stop at the timeout too
+        if timeout is not None and timeout > 0:
+            options["deadline"] = min(options.get("deadline", timeout), timeout)
+        try:
+            if timeout is not None and timeout <= 0:
+                raise _overrun(hop, 0.0)
+            try:
+                result = await asyncio.wait_for(execute(hop, options), timeout)
+            except asyncio.TimeoutError:
+                raise _overrun(hop, timeout) from None
+        except Exception as e:
+            route.errors.append((hop.provider, hop.model, repr(e)))
+            if index == len(hops) - 1 or not policy.should_fallback(e, idempotent):
+                raise
+            # A spent caller deadline leaves no time for the remaining hops
+            if deadline is not None and time.monotonic() - started >= deadline:
+                raise
+            continue
+        route.served_by = (hop.provider, hop.model)
+        return result
+
+
+# Singleton registry of named policies
+fallback_policies = FallbackPolicies()
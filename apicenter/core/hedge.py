@@ -0,0 +1,424 @@
+"""Hedged requests: send a backup request when the first one is slower than usual."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .fallback import Hop, HopSpec, as_hop, hop_kwargs
+
+# Latency samples are kept per (kind, provider, model); kind is "latency" or "ttft"
+LatencyKey = Tuple[str, str, str]
+
+
+class LatencyTracker:
+    """Recent latencies per key, used to pick a hedge delay from a percentile."""
+
+    def __init__(self, window: int = 500) -> None:
+        """Keep the last window samples for each key."""
+        self.window = window
+        self._samples: Dict[LatencyKey, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: LatencyKey, seconds: float) -> None:
+        """Add one latency sample."""
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def keys(self) -> List[LatencyKey]:
+        """Return every key with samples."""
+        with self._lock:
+            return list(self._samples)
+
+    def count(self, key: LatencyKey) -> int:
+        """Return how many samples are held for a key."""
+        with self._lock:
+            return len(self._samples.get(key, ()))
+
+    def percentile(self, key: LatencyKey, percentile: float) -> Optional[float]:
+        """Return the given percentile (0-100) of recent samples, or None without data."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100.0))
+        return samples[index]
+
+
+class HedgeBudget:
+    """Caps hedges to a fraction of requests: each request earns ratio, a hedge costs one."""
+
+    def __init__(self, ratio: float = 0.1, burst: float = 5.0) -> None:
+        """Start with a full burst allowance."""
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        """Credit one request."""
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one hedge from the budget if it allows it."""
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class HedgePolicy:
+    """When to hedge a request and where to send the backup.
+
+    The backup is sent once the first request has taken longer than the given percentile
+    of recent latencies (or time to first token for streams). Until min_samples are seen,
+    initial_delay is used. budget_ratio caps hedges to that share of requests. The backup
+    goes to the same provider and model unless ``to`` names another hop.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.05,
+        max_delay: float = 30.0,
+        budget_ratio: float = 0.1,
+        budget_burst: float = 5.0,
+        to: Optional[HopSpec] = None,
+    ) -> None:
+        """Initialize the delay percentile, its bounds, the hedge budget and backup hop."""
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget = HedgeBudget(budget_ratio, budget_burst)
+        self.to = as_hop(to) if to is not None else None
+
+    def backup(self, provider: str, model: str, kwargs: Dict[str, Any]) -> Tuple[Hop, Dict]:
+        """Return the hop to hedge to and its options."""
+        hop = self.to if self.to is not None else Hop(provider, model)
+        return hop, hop_kwargs(hop, provider, kwargs)
+
+
+class Hedger:
+    """Runs hedged requests and tracks the latencies and counters behind them.
+
+    Sync requests run in a pool of max_workers threads, created on first use.
+    """
+
+    def __init__(self, default: Optional[HedgePolicy] = None, max_workers: int = 16) -> None:
+        """Initialize the default policy, worker count, latency tracker and counters."""
+        self.default = default if default is not None else HedgePolicy()
+        self.max_workers = max_workers
+        self.latencies = LatencyTracker()
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def resolve(self, hedge: Union[bool, HedgePolicy]) -> HedgePolicy:
+        """Return the policy for a per-call hedge= value."""
+        return hedge if isinstance(hedge, HedgePolicy) else self.default
+
+    def delay(self, policy: HedgePolicy, key: LatencyKey) -> float:
+        """Return how long to wait for the first request before hedging."""
+        if self.latencies.count(key) < policy.min_samples:
+            return policy.initial_delay
+        delay = self.latencies.percentile(key, policy.percentile)
+        return min(policy.max_delay, max(policy.min_delay, delay))
+
+    def should_hedge(self, policy: HedgePolicy) -> bool:
+        """Spend a hedge from the policy's budget, counting denials."""
+        allowed = policy.budget.try_spend()
+        with self._lock:
+            if allowed:
+                self.hedges += 1
+            else:
+                self.budget_denied += 1
+        return allowed
+
+    def start(self, policy: HedgePolicy) -> None:
+        """Count a hedge-enabled request."""
+        policy.budget.earn()
+        with self._lock:
+            self.requests += 1
+
+    def won(self, hedged: bool) -> None:
+        """Count a request served by its backup."""
+        if hedged:
+            with self._lock:
+                self.hedge_wins += 1
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        """Return the executor that runs hedged sync requests, creating it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="apicenter-hedge"
+                )
+            return self._executor
+
+    def _submit(
+        self, kind: str, hop: Hop, func: Callable[[], Any]
+    ) -> Tuple[Future, threading.Event]:
+        """Run func in a worker and record its latency when it succeeds.
+
+        Returns the future and an event set once a worker picks func up, so time spent
+        queued for a worker counts neither towards the hedge delay nor the latency.
+        """
+        running = threading.Event()
+        started: List[float] = []
+
+        def timed() -> Any:
+            """Mark the request as running, then run it."""
+            started.append(time.monotonic())
+            running.set()
+            return func()
+
+        def record(done: Future) -> None:
+            if started and not done.cancelled() and done.exception() is None:
+                seconds = time.monotonic() - started[0]
+                self.latencies.record((kind, hop.provider, hop.model), seconds)
+
+        future = self.get_executor().submit(copy_context().run, timed)
+        future.add_done_callback(record)
+        return future, running
+
+    def _race(
+        self, kind: str, policy: HedgePolicy, hops: Dict[str, Hop], run: Callable[[str], Any]
+    ) -> Tuple[Future, Optional[Future]]:
+        """Start the primary, hedge to the backup after the delay, and return (winner, loser).
+
+        run(label) performs the work for the "primary" or "backup" hop. If both fail the
+        primary's future is returned as the winner so its error is raised.
+        """
+        self.start(policy)
+        primary = hops["primary"]
+        first, running = self._submit(kind, primary, lambda: run("primary"))
+        # The hedge delay starts once the primary leaves the queue, not while it waits
+        running.wait()
+        done, _ = wait([first], timeout=self.delay(policy, (kind, primary.provider, primary.model)))
+        if done or not self.should_hedge(policy):
+            return first, None
+
+        second, _ = self._submit(kind, hops["backup"], lambda: run("backup"))
+        done, _ = wait([first, second], return_when=FIRST_COMPLETED)
+        succeeded = [
+            future for future in (first, second) if future in done and not future.exception()
+        ]
+        if not succeeded:
+            # Give the other request its chance before giving up
+            wait([first, second])
+            succeeded = [future for future in (first, second) if not future.exception()]
+            if not succeeded:
+                return first, None
+
+        winner = succeeded[0]
+        self.won(winner is second)
+        return winner, second if winner is first else first
+
+    def run(
+        self,
+        policy: HedgePolicy,
+        provider: str,
+        model: str,
+        kwargs: Dict[str, Any],
+        call: Callable[[str, str, Dict[str, Any]], Any],
+    ) -> Any:
+        """Call call(provider, model, kwargs), hedging to the backup if it is slow."""
+        backup, backup_kwargs = policy.backup(provider, model, kwargs)
+        hops = {"primary": Hop(provider, model), "backup": backup}
+        options = {"primary": kwargs, "backup": backup_kwargs}
+
+        winner, loser = self._race(
+            "latency",
+            policy,
+            hops,
+            lambda label: call(hops[label].provider, hops[label].model, dict(options[label])),
+        )
+        if loser is not None:
+            # Drop the slower request if it has not started; otherwise its result is ignored
+            loser.cancel()
+        return winner.result()
+
+    def stream(
+        self,
+        policy: HedgePolicy,
+        provider: str,
+        model: str,
+        kwargs: Dict[str, Any],
+        open_stream: Callable[[str, str, Dict[str, Any]], Iterator[Any]],
+    ) -> Iterator[Any]:
+        """Stream from open_stream(provider, model, kwargs), hedging on a slow first event."""
+        backup, backup_kwargs = policy.backup(provider, model, kwargs)
+        hops = {"primary": Hop(provider, model), "backup": backup}
+        options = {"primary": kwargs, "backup": backup_kwargs}
+        streams: Dict[str, Iterator[Any]] = {}
+
+        def first_event(label: str) -> Tuple[str, Any]:
+            """Open the stream for a hop and wait for its first event."""
+            hop = hops[label]
+            streams[label] = open_stream(hop.provider, hop.model, dict(options[label]))
+            return label, next(streams[label], None)
+
+        winner, loser = self._race("ttft", policy, hops, first_event)
+        if loser is not None:
+            # Close the slower stream once it has opened, or drop it if it never started
+            loser.add_done_callback(lambda done: self._close(streams, winner, done))
+            loser.cancel()
+
+        label, event = winner.result()
+        if event is not None:
+            yield event
+        yield from streams[label]
+
+    def _close(self, streams: Dict[str, Iterator[Any]], winner: Future, loser: Future) -> None:
+        """Close the losing stream after its first event arrived."""
+        if loser.cancelled() or loser.exception() is not None:
+            return
+        label, _ = loser.result()
+        stream = streams.get(label)
+        if stream is not None and hasattr(stream, "close"):
+            stream.close()
+
+    async def _arace(
+        self,
+        kind: str,
+        policy: HedgePolicy,
+        hops: Dict[str, Hop],
+        run: Callable[[str], Awaitable[Any]],
+    ) -> Tuple[Any, Optional[str]]:
+        """Await the primary, hedging to the backup after the delay; return (result, loser).
+
+        The losing task is cancelled; loser names its label if it had been started.
+        """
+        self.start(policy)
+
+        async def timed(label: str) -> Any:
+            hop = hops[label]
+            started = time.monotonic()
+            result = await run(label)
+            self.latencies.record((kind, hop.provider, hop.model), time.monotonic() - started)
+            return result
+
+        primary = hops["primary"]
+        first = asyncio.ensure_future(timed("primary"))
+        tasks = [first]
+        try:
+            delay = self.delay(policy, (kind, primary.provider, primary.model))
+            done, _ = await asyncio.wait([first], timeout=delay)
+            if done or not self.should_hedge(policy):
+                return await first, None
+
+            second = asyncio.ensure_future(timed("backup"))
+            tasks.append(second)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.won(task is second)
+                        return task.result(), "primary" if task is second else "backup"
+            # Both failed: report the primary's error
+            return first.result(), None
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            # Let cancelled requests unwind so their streams and connections are released
+            await asyncio.gather(*losers, return_exceptions=True)
+
+    async def arun(
+        self,
+        policy: HedgePolicy,
+        provider: str,
+        model: str,
+        kwargs: Dict[str, Any],
+        call: Callable[[str, str, Dict[str, Any]], Awaitable[Any]],
+    ) -> Any:
+        """Await call(provider, model, kwargs), hedging to the backup if it is slow."""
+        backup, backup_kwargs = policy.backup(provider, model, kwargs)
+        hops = {"primary": Hop(provider, model), "backup": backup}
+        options = {"primary": kwargs, "backup": backup_kwargs}
+
+        result, _ = await self._arace(
+            "latency",
+            policy,
+            hops,
+            lambda label: call(hops[label].provider, hops[label].model, dict(options[label])),
+        )
+        return result
+
+    async def astream(
+        self,
+        policy: HedgePolicy,
+        provider: str,
+        model: str,
+        kwargs: Dict[str, Any],
+        open_stream: Callable[[str, str, Dict[str, Any]], AsyncIterator[Any]],
+    ) -> AsyncIterator[Any]:
+        """Relay an async stream, hedging when its first event is slow to arrive."""
+        backup, backup_kwargs = policy.backup(provider, model, kwargs)
+        hops = {"primary": Hop(provider, model), "backup": backup}
+        options = {"primary": kwargs, "backup": backup_kwargs}
+        streams: Dict[str, AsyncIterator[Any]] = {}
+
+        async def first_event(label: str) -> Tuple[str, Any]:
+            """Open the stream for a hop and wait for its first event."""
+            hop = hops[label]
+            streams[label] = open_stream(hop.provider, hop.model, dict(options[label]))
+            return label, await streams[label].__anext__()
+
+        (label, event), loser = await self._arace("ttft", policy, hops, first_event)
+        if loser is not None and hasattr(streams.get(loser), "aclose"):
+            await streams[loser].aclose()
+
+        yield event
+        async for event in streams[label]:
+            yield event
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hedge counters and the current p50/p95 latencies per provider and model."""
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "budget_denied": self.budget_denied,
+            }
+        stats["latency"] = {
+            "/".join(key): {
+                "p50": self.latencies.percentile(key, 50),
+                "p95": self.latencies.percentile(key, 95),
+            }
+            for key in self.latencies.keys()
+        }
+        return stats
+
+
+# Singleton used by APICenter for hedge=True requests
+hedger = Hedger()
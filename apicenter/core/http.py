@@ -0,0 +1,133 @@
+"""Shared keep-alive HTTP transport for providers that talk to REST APIs directly."""
+
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HTTPSession:
+    """Keep-alive HTTP session with connection pooling, timeouts and retry adapters."""
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 120.0,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        status_forcelist: Iterable[int] = (),
+        keep_alive: bool = True,
+    ) -> None:
+        """Initialize the session with pool sizes, timeouts and retry behaviour."""
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self.max_retries = max_retries
+        self._requests = 0
+        self._lock = threading.Lock()
+
+        # Retry connection failures, but never re-send a request after the server may already
+        # have read it (read=0) since generations are billed. Throttling and server errors are
+        # left to the retry engine unless status_forcelist is given
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=tuple(status_forcelist),
+            allowed_methods=None,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+
+        # Mount a pooled adapter for both schemes
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+        # Ask the server to close the connection after each request when keep-alive is off
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """Return the default (connect, read) timeout pair."""
+        return (self.connect_timeout, self.read_timeout)
+
+    def request_timeout(self, timeout: Optional[float] = None) -> Tuple[float, float]:
+        """Return the (connect, read) timeout pair for a request, capped by a per-call timeout."""
+        if timeout is None:
+            return self.timeout
+        return (min(self.connect_timeout, timeout), min(self.read_timeout, timeout))
+
+    def async_timeout(self, timeout: Optional[float] = None) -> httpx.Timeout:
+        """Return the httpx timeout for a request, capped by a per-call timeout."""
+        connect, read = self.request_timeout(timeout)
+        return httpx.Timeout(read, connect=connect)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request through the pooled session with default timeouts."""
+        kwargs.setdefault("timeout", self.timeout)
+        with self._lock:
+            self._requests += 1
+        return self.session.post(url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request through the pooled session with default timeouts."""
+        kwargs.setdefault("timeout", self.timeout)
+        with self._lock:
+            self._requests += 1
+        return self.session.get(url, **kwargs)
+
+    def create_async_client(self) -> httpx.AsyncClient:
+        """Create an asynchronous HTTP client with the same pool size and timeouts."""
+        # httpx transports only retry failed connection attempts, matching read=0 above
+        limits = httpx.Limits(
+            max_connections=self.pool_maxsize,
+            max_keepalive_connections=self.pool_maxsize if self.keep_alive else 0,
+        )
+        return httpx.AsyncClient(
+            timeout=self.async_timeout(),
+            transport=httpx.AsyncHTTPTransport(limits=limits, retries=self.max_retries),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request and connection counters, including the connection reuse rate."""
+        connections = 0
+        pool_requests = 0
+
+        # Sum counters kept by each urllib3 host pool
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += getattr(pool, "num_connections", 0)
+            pool_requests += getattr(pool, "num_requests", 0)
+
+        reuse_rate = 1.0 - connections / pool_requests if pool_requests else 0.0
+        return {
+            "requests": self._requests,
+            "host_pools": len(pools),
+            "connections_opened": connections,
+            "pooled_requests": pool_requests,
+            "connection_reuse_rate": max(0.0, reuse_rate),
+            "pool_maxsize": self.pool_maxsize,
+            "connect_timeout": self.connect_timeout,
+            "read_timeout": self.read_timeout,
+        }
+
+    def close(self) -> None:
+        """Close the session and every pooled connection."""
+        self.session.close()
@@ -0,0 +1,48 @@
+"""Deferred imports so provider SDKs are only loaded by processes that use them."""
+
+import importlib
+from types import ModuleType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+# Provider name -> (module path, {name in the mode module: name in the provider module})
+ProviderExports = Dict[str, Tuple[str, Dict[str, str]]]
+
+# Marks a name the mode module does not define itself
+_MISSING = object()
+
+
+class LazyProviders:
+    """Looks up provider functions for a mode module, importing each provider on first use.
+
+    Provider modules import their SDKs at the top, so a mode module (text, image, audio)
+    lists what it needs from each provider here instead of importing it, and fetches each
+    function with resolve(). A name set on the mode module itself (e.g. patched in tests)
+    takes precedence over the provider's function; the namespace is only read.
+    """
+
+    def __init__(self, namespace: Mapping[str, Any], exports: ProviderExports) -> None:
+        """Remember the mode module's namespace and what each provider exports to it."""
+        self.namespace = namespace
+        self.exports = exports
+        self.modules: Dict[str, ModuleType] = {}
+        self._owners = {
+            name: provider for provider, (_, names) in exports.items() for name in names
+        }
+
+    def load(self, provider: str) -> Optional[ModuleType]:
+        """Import a provider's module once and return it, or None for unknown providers."""
+        module = self.modules.get(provider)
+        if module is None and provider in self.exports:
+            module = self.modules[provider] = importlib.import_module(self.exports[provider][0])
+        return module
+
+    def resolve(self, name: str) -> Any:
+        """Return an exported name, importing the provider that owns it if needed."""
+        value = self.namespace.get(name, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        provider = self._owners.get(name)
+        if provider is None:
+            raise AttributeError(f"module {self.namespace['__name__']!r} has no attribute {name!r}")
+        return getattr(self.load(provider), self.exports[provider][1][name])
@@ -0,0 +1,557 @@
+"""Per-request metrics: records, hooks, in-memory aggregation and a Prometheus exporter."""
+
+import math
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .sketch import DEFAULT_QUANTILES, DDSketch
+from .streaming import StreamSummary, TextDelta, guard_stream
+
+# Upper bounds of the request duration histogram buckets, in seconds
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, math.inf)
+
+# Distributions tracked per model with percentile sketches
+SKETCHES = ("latency", "ttfb", "tokens_per_second")
+
+SeriesKey = Tuple[str, str, str]
+
+# Sketches per series, keyed "mode/provider/model", in their JSON-serializable form
+SketchSnapshot = Dict[str, Dict[str, Dict[str, Any]]]
+
+
+@dataclass
+class RequestRecord:
+    """What happened during one request, handed to every metrics hook when it ends.
+
+    Times are in seconds. queue_wait is time spent waiting for rate limit budget and
+    concurrency slots, ttfb the time until the first stream event (or the whole response
+    for non-streaming calls). Token counts are None when the provider did not report them.
+    """
+
+    mode: str
+    provider: str
+    model: str
+    stream: bool = False
+    latency: float = 0.0
+    queue_wait: float = 0.0
+    ttfb: Optional[float] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    response_bytes: Optional[int] = None
+    attempts: int = 0
+    cache_hit: bool = False
+    error: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+    started: float = field(default_factory=time.monotonic, repr=False)
+
+    @property
+    def retries(self) -> int:
+        """Return how many attempts were repeats of an earlier one."""
+        return max(0, self.attempts - 1)
+
+
+# Called with each finished request
+MetricsHook = Callable[[RequestRecord], None]
+
+# The record of the request running in this thread or task, if metrics are enabled
+current_record: ContextVar[Optional[RequestRecord]] = ContextVar(
+    "apicenter_request_record", default=None
+)
+
+
+def record_attempt(
+    queued: float, now: Optional[float] = None, record: Optional[RequestRecord] = None
+) -> None:
+    """Count an attempt of a request (the current one by default) and how long it waited."""
+    if record is None:
+        record = current_record.get()
+    if record is not None:
+        record.attempts += 1
+        record.queue_wait += (time.monotonic() if now is None else now) - queued
+
+
+def report_usage(input_tokens: Any = None, output_tokens: Any = None) -> None:
+    """Attach the token counts a provider reported to the current request's record."""
+    record = current_record.get()
+    if record is None:
+        return
+    # Ignore anything that is not a count, e.g. a missing usage block
+    if isinstance(input_tokens, int) and not isinstance(input_tokens, bool):
+        record.input_tokens = input_tokens
+    if isinstance(output_tokens, int) and not isinstance(output_tokens, bool):
+        record.output_tokens = output_tokens
+
+
+def response_size(response: Any) -> Optional[int]:
+    """Return the size of a response in bytes, or None if it has no natural size."""
+    if isinstance(response, (bytes, bytearray)):
+        return len(response)
+    if isinstance(response, str):
+        return len(response.encode("utf-8"))
+    # Sinks report how many bytes they wrote
+    if isinstance(response, int) and not isinstance(response, bool):
+        return response
+    return None
+
+
+def tokens_per_second(record: RequestRecord) -> Optional[float]:
+    """Return a request's output tokens per second of generation, if it reported them.
+
+    For streams the clock starts at the first event, so queueing and prompt processing
+    do not count against generation speed.
+    """
+    if not record.output_tokens or record.cache_hit or record.error is not None:
+        return None
+    elapsed = record.latency - (record.ttfb or 0.0) if record.stream else record.latency
+    return record.output_tokens / elapsed if elapsed > 0 else None
+
+
+class SeriesStats:
+    """Running totals for one mode, provider and model."""
+
+    def __init__(self) -> None:
+        """Start with all totals at zero."""
+        self.requests = 0
+        self.errors: Dict[str, int] = {}
+        self.cache_hits = 0
+        self.retries = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.queue_wait_sum = 0.0
+        self.ttfb_sum = 0.0
+        self.ttfb_count = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.response_bytes = 0
+
+        # Latency, time to first byte and output tokens per second, for percentiles
+        self.sketches: Dict[str, DDSketch] = {name: DDSketch() for name in SKETCHES}
+
+    def add(self, record: RequestRecord) -> None:
+        """Fold one request into the totals."""
+        self.requests += 1
+        if record.error is not None:
+            self.errors[record.error] = self.errors.get(record.error, 0) + 1
+        self.cache_hits += record.cache_hit
+        self.retries += record.retries
+        self.latency_sum += record.latency
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if record.latency <= bound:
+                self.latency_buckets[i] += 1
+                break
+        self.queue_wait_sum += record.queue_wait
+        if record.ttfb is not None:
+            self.ttfb_sum += record.ttfb
+            self.ttfb_count += 1
+        self.input_tokens += record.input_tokens or 0
+        self.output_tokens += record.output_tokens or 0
+        self.response_bytes += record.response_bytes or 0
+
+        self.sketches["latency"].add(record.latency)
+        if record.ttfb is not None:
+            self.sketches["ttfb"].add(record.ttfb)
+        rate = tokens_per_second(record)
+        if rate is not None:
+            self.sketches["tokens_per_second"].add(rate)
+
+    def copy(self) -> "SeriesStats":
+        """Return an independent copy of the totals."""
+        clone = SeriesStats()
+        clone.__dict__.update(self.__dict__)
+        clone.errors = dict(self.errors)
+        clone.latency_buckets = list(self.latency_buckets)
+        clone.sketches = {name: sketch.copy() for name, sketch in self.sketches.items()}
+        return clone
+
+    def cumulative_buckets(self) -> List[int]:
+        """Return the histogram counts as Prometheus expects them, each including the last."""
+        counts, total = [], 0
+        for count in self.latency_buckets:
+            total += count
+            counts.append(total)
+        return counts
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the totals and averages."""
+        answered = self.requests - self.cache_hits
+        return {
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "cache_hits": self.cache_hits,
+            "retries": self.retries,
+            "avg_latency": round(self.latency_sum / self.requests, 4) if self.requests else None,
+            "avg_queue_wait": round(self.queue_wait_sum / answered, 4) if answered else None,
+            "avg_ttfb": round(self.ttfb_sum / self.ttfb_count, 4) if self.ttfb_count else None,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "response_bytes": self.response_bytes,
+        }
+
+
+class MetricsAggregator:
+    """Per-model totals built from request records without locking the request path.
+
+    add() only appends to a deque, which is atomic in CPython. Pending records are
+    folded into the totals when they are read, or by a request that finds more than
+    fold_every of them waiting and the lock free; no request ever waits for the lock.
+    """
+
+    def __init__(self, fold_every: int = 1024) -> None:
+        """Start with no records."""
+        self.fold_every = fold_every
+        self._pending: Deque[RequestRecord] = deque()
+        self._series: Dict[SeriesKey, SeriesStats] = {}
+        self._lock = threading.Lock()
+
+    def add(self, record: RequestRecord) -> None:
+        """Queue a finished request; used as a metrics hook."""
+        self._pending.append(record)
+        if len(self._pending) >= self.fold_every and self._lock.acquire(blocking=False):
+            try:
+                self._fold()
+            finally:
+                self._lock.release()
+
+    def _fold(self) -> None:
+        """Move pending records into the totals; the caller holds the lock."""
+        while True:
+            try:
+                record = self._pending.popleft()
+            except IndexError:
+                return
+            key = (record.mode, record.provider, record.model)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = SeriesStats()
+            series.add(record)
+
+    def series(self) -> Dict[SeriesKey, SeriesStats]:
+        """Return the totals per (mode, provider, model), including every finished request."""
+        with self._lock:
+            self._fold()
+            return {key: series.copy() for key, series in self._series.items()}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return totals and averages per mode/provider/model."""
+        return {"/".join(key): series.as_dict() for key, series in self.series().items()}
+
+    def percentiles(
+        self, quantiles: Iterable[float] = DEFAULT_QUANTILES
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Return latency, ttfb and tokens/second percentiles per mode/provider/model."""
+        return snapshot_percentiles(self.snapshot(), quantiles)
+
+    def snapshot(self) -> SketchSnapshot:
+        """Return every series' sketches in a JSON-serializable form for merge_snapshots()."""
+        return {
+            "/".join(key): {name: sketch.to_dict() for name, sketch in series.sketches.items()}
+            for key, series in self.series().items()
+        }
+
+    def reset(self) -> None:
+        """Forget all records."""
+        with self._lock:
+            self._pending.clear()
+            self._series.clear()
+
+
+def merge_snapshots(snapshots: Iterable[SketchSnapshot]) -> SketchSnapshot:
+    """Combine sketch snapshots, e.g. from several worker processes, into one."""
+    merged: Dict[str, Dict[str, DDSketch]] = {}
+    for snapshot in snapshots:
+        for series, sketches in snapshot.items():
+            target = merged.setdefault(series, {})
+            for name, data in sketches.items():
+                sketch = DDSketch.from_dict(data)
+                if name in target:
+                    target[name].merge(sketch)
+                else:
+                    target[name] = sketch
+    return {
+        series: {name: sketch.to_dict() for name, sketch in sketches.items()}
+        for series, sketches in merged.items()
+    }
+
+
+def snapshot_percentiles(
+    snapshot: SketchSnapshot, quantiles: Iterable[float] = DEFAULT_QUANTILES
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Return the percentiles of every sketch in a snapshot."""
+    quantiles = tuple(quantiles)
+    return {
+        series: {
+            name: DDSketch.from_dict(data).percentiles(quantiles) for name, data in sketches.items()
+        }
+        for series, sketches in snapshot.items()
+    }
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(key: SeriesKey, **extra: str) -> str:
+    """Format the labels for one series."""
+    pairs = dict(zip(("mode", "provider", "model"), key), **extra)
+    return "{" + ",".join(f'{name}="{_escape(str(v))}"' for name, v in pairs.items()) + "}"
+
+
+def _number(value: float) -> str:
+    """Format a sample value."""
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class PrometheusExporter:
+    """Renders aggregated request metrics in the Prometheus text exposition format."""
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, aggregator: MetricsAggregator, namespace: str = "apicenter") -> None:
+        """Export the given aggregator's totals under a metric name prefix."""
+        self.aggregator = aggregator
+        self.namespace = namespace
+
+    def render(self) -> str:
+        """Return every metric as exposition text."""
+        series = sorted(self.aggregator.series().items())
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str) -> str:
+            """Write a metric's HELP and TYPE lines and return its full name."""
+            full = f"{self.namespace}_{name}"
+            lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} {kind}")
+            return full
+
+        counters = (
+            ("requests_total", "requests", "Requests finished, including cache hits and errors."),
+            ("cache_hits_total", "cache_hits", "Requests answered from the response cache."),
+            ("retries_total", "retries", "Attempts repeated after a failure."),
+            ("input_tokens_total", "input_tokens", "Prompt tokens reported by providers."),
+            ("output_tokens_total", "output_tokens", "Generated tokens reported by providers."),
+            ("response_bytes_total", "response_bytes", "Bytes of responses returned."),
+            ("queue_wait_seconds_total", "queue_wait_sum", "Time spent waiting for limits."),
+        )
+        for name, attribute, help_text in counters:
+            full = metric(name, "counter", help_text)
+            for key, stats in series:
+                lines.append(f"{full}{_labels(key)} {_number(getattr(stats, attribute))}")
+
+        full = metric("errors_total", "counter", "Failed requests by error class.")
+        for key, stats in series:
+            for error, count in sorted(stats.errors.items()):
+                lines.append(f"{full}{_labels(key, error=error)} {count}")
+
+        full = metric("request_duration_seconds", "histogram", "Request latency.")
+        for key, stats in series:
+            for bound, count in zip(LATENCY_BUCKETS, stats.cumulative_buckets()):
+                lines.append(f"{full}_bucket{_labels(key, le=_number(bound))} {count}")
+            lines.append(f"{full}_sum{_labels(key)} {_number(stats.latency_sum)}")
+            lines.append(f"{full}_count{_labels(key)} {stats.requests}")
+
+        full = metric("time_to_first_byte_seconds", "summary", "Time until the first byte.")
+        for key, stats in series:
+            lines.append(f"{full}_sum{_labels(key)} {_number(stats.ttfb_sum)}")
+            lines.append(f"{full}_count{_labels(key)} {stats.ttfb_count}")
+
+        quantile_metrics = (
+            ("latency", "request_latency_quantile_seconds", "Request latency percentiles."),
+            ("ttfb", "time_to_first_byte_quantile_seconds", "Time to first byte percentiles."),
+            ("tokens_per_second", "tokens_per_second_quantile", "Output tokens/s percentiles."),
+        )
+        for sketch_name, name, help_text in quantile_metrics:
+            full = metric(name, "gauge", help_text)
+            for key, stats in series:
+                sketch = stats.sketches[sketch_name]
+                for q in DEFAULT_QUANTILES:
+                    value = sketch.quantile(q)
+                    if value is not None:
+                        labels = _labels(key, quantile=f"{q:g}")
+                        lines.append(f"{full}{labels} {_number(float(value))}")
+
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve the metrics over HTTP from a daemon thread, for a local scraper."""
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Answers every GET with the current metrics."""
+
+            def do_GET(self) -> None:
+                """Send the exposition text."""
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", exporter.content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                """Keep scrapes out of the application's stderr."""
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="apicenter-metrics", daemon=True).start()
+        return server
+
+
+class Metrics:
+    """Creates a record for each request and hands finished records to the hooks.
+
+    The built-in aggregator is installed as the first hook. Hooks run on the thread
+    that made the request, so they should be quick; errors they raise are ignored.
+    """
+
+    def __init__(self) -> None:
+        """Enable metrics with the in-memory aggregator as the only hook."""
+        self.enabled = True
+        self.aggregator = MetricsAggregator()
+        self.exporter = PrometheusExporter(self.aggregator)
+
+        # Replaced rather than mutated, so requests can iterate it without a lock
+        self.hooks: Tuple[MetricsHook, ...] = (self.aggregator.add,)
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: MetricsHook) -> None:
+        """Call hook with the RequestRecord of every finished request."""
+        with self._lock:
+            self.hooks = self.hooks + (hook,)
+
+    def remove_hook(self, hook: MetricsHook) -> None:
+        """Stop calling a hook."""
+        with self._lock:
+            self.hooks = tuple(h for h in self.hooks if h != hook)
+
+    def start(
+        self, mode: str, provider: str, model: str, stream: bool = False
+    ) -> Optional[RequestRecord]:
+        """Return a new record for a request, or None while metrics are off."""
+        if not self.enabled or not self.hooks:
+            return None
+        return RequestRecord(mode, provider, model, stream=stream)
+
+    def finish(
+        self,
+        record: Optional[RequestRecord],
+        response: Any = None,
+        error: Optional[BaseException] = None,
+        cache_hit: bool = False,
+    ) -> None:
+        """Complete a record with the outcome of its request and pass it to the hooks."""
+        if record is None:
+            return
+        record.latency = time.monotonic() - record.started
+        if record.ttfb is None and error is None and not record.stream:
+            record.ttfb = record.latency
+        if response is not None and record.response_bytes is None:
+            record.response_bytes = response_size(response)
+        record.cache_hit = cache_hit
+        if error is not None:
+            record.error = type(error).__name__
+        for hook in self.hooks:
+            try:
+                hook(record)
+            except Exception:
+                pass
+
+    def stream(self, record: Optional[RequestRecord], events: Iterator[Any]) -> Iterator[Any]:
+        """Relay a stream, timing its first event and finishing the record at its end.
+
+        Closing or dropping the relay, even before it is read, closes events too.
+        """
+
+        def observed() -> Iterator[Any]:
+            """Yield each event after timing it."""
+            for event in events:
+                if record is not None:
+                    observe_event(record, event)
+                yield event
+
+        def end(error: Optional[Exception]) -> None:
+            """Close the source stream and finish the record."""
+            try:
+                close = getattr(events, "close", None)
+                if callable(close):
+                    close()
+            finally:
+                self.finish(record, error=error)
+
+        return guard_stream(observed(), end)
+
+    async def astream(
+        self, record: Optional[RequestRecord], events: AsyncIterator[Any]
+    ) -> AsyncIterator[Any]:
+        """Relay an async stream, timing its first event and finishing the record at its end."""
+        error: Optional[BaseException] = None
+        try:
+            async for event in events:
+                if record is not None:
+                    observe_event(record, event)
+                yield event
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.finish(record, error=error if isinstance(error, Exception) else None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return aggregated totals and averages per mode/provider/model."""
+        return self.aggregator.stats()
+
+    def percentiles(
+        self, quantiles: Iterable[float] = DEFAULT_QUANTILES
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Return latency, ttfb and tokens/second percentiles per mode/provider/model."""
+        return self.aggregator.percentiles(quantiles)
+
+    def snapshot(self) -> SketchSnapshot:
+        """Return this process's percentile sketches, to merge with other processes'."""
+        return self.aggregator.snapshot()
+
+    def prometheus(self) -> str:
+        """Return aggregated metrics in the Prometheus text format."""
+        return self.exporter.render()
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve the Prometheus metrics over HTTP for local scraping."""
+        return self.exporter.serve(port, host)
+
+    def reset(self) -> None:
+        """Forget all aggregated metrics."""
+        self.aggregator.reset()
+
+
+def observe_event(record: RequestRecord, event: Any) -> None:
+    """Update a stream's record with one event or chunk."""
+    if record.ttfb is None:
+        record.ttfb = time.monotonic() - record.started
+    if isinstance(event, TextDelta):
+        record.response_bytes = (record.response_bytes or 0) + len(event.text.encode("utf-8"))
+    elif isinstance(event, StreamSummary):
+        record.input_tokens = event.usage.get("input_tokens", record.input_tokens)
+        record.output_tokens = event.usage.get("output_tokens", record.output_tokens)
+    elif isinstance(event, (bytes, bytearray)):
+        record.response_bytes = (record.response_bytes or 0) + len(event)
+
+
+# Singleton metrics hub fed by every request
+metrics = Metrics()
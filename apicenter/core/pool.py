@@ -0,0 +1,280 @@
+"""Shared pool of provider SDK clients reused across requests."""
+
+import asyncio
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+# Factories receive the credentials dictionary and return a ready-to-use SDK client
+ClientFactory = Callable[[Dict[str, Any]], Any]
+
+# Close tasks scheduled on a running loop, kept referenced until they finish
+_closing: Set["asyncio.Task[Any]"] = set()
+
+
+@dataclass
+class PooledClient:
+    """A cached SDK client together with its usage bookkeeping."""
+
+    client: Any
+    provider: str
+    created_at: float
+    last_used: float
+    uses: int = 0
+    scope: Optional[Hashable] = None
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert credential values into a hashable, order-independent form."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def run_on_loop(coro: Any, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Run an async client's close coroutine on the event loop its connections belong to."""
+    try:
+        if loop is None or loop.is_closed():
+            # Without a usable loop there is nothing left to await it on
+            coro.close()
+        elif not loop.is_running():
+            loop.run_until_complete(coro)
+        elif _running_loop() is loop:
+            task = loop.create_task(coro)
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(coro, loop)
+    except Exception:
+        # e.g. another loop is running in this thread
+        coro.close()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Return the event loop running in this thread, if any."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def close_client(client: Any, scope: Optional[Hashable] = None) -> None:
+    """Close an SDK client's underlying HTTP resources if it supports closing.
+
+    Async clients are closed on the event loop they were pooled for, given as the scope.
+    """
+    close = getattr(client, "close", None)
+    if not callable(close):
+        return
+
+    try:
+        result = close()
+        if inspect.iscoroutine(result):
+            loop = scope if isinstance(scope, asyncio.AbstractEventLoop) else None
+            run_on_loop(result, loop)
+    except Exception:
+        # Closing is best-effort; a broken client must not break shutdown
+        pass
+
+
+class ClientPool:
+    """Thread-safe LRU pool of SDK clients keyed by provider, credentials and base URL.
+
+    Clients dropped from the pool by LRU or idle eviction and invalidate() are not closed,
+    since in-flight calls and open streams may still be using them; their connections are
+    released once the last user lets go of them. close() and aclose() close every client.
+    """
+
+    def __init__(self, max_size: int = 32, idle_timeout: Optional[float] = 300.0) -> None:
+        """Initialize the pool with a size limit and idle eviction timeout in seconds."""
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._entries: "OrderedDict[Tuple, PooledClient]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Keys whose client is being built, set once it is in the pool or the build failed
+        self._building: Dict[Tuple, threading.Event] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        factory: ClientFactory,
+        credentials: Dict[str, Any],
+        base_url: Optional[str] = None,
+        scope: Optional[Hashable] = None,
+    ) -> Tuple:
+        """Build the pool key for a provider, client factory, credentials and base URL."""
+        return (provider, factory, base_url, _freeze(credentials), scope)
+
+    def get(
+        self,
+        provider: str,
+        factory: ClientFactory,
+        credentials: Dict[str, Any],
+        base_url: Optional[str] = None,
+        scope: Optional[Hashable] = None,
+    ) -> Any:
+        """Return a pooled client for the given key, creating it with the factory if needed.
+
+        The optional scope separates clients that must not be shared, such as async clients
+        bound to different event loops.
+        """
+        key = self.make_key(provider, factory, credentials, base_url, scope)
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._pop_idle(now)
+
+                entry = self._entries.get(key)
+                if entry is not None:
+                    # Mark as most recently used
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return self._use(entry, now)
+
+                pending = self._building.get(key)
+                if pending is None:
+                    pending = self._building[key] = threading.Event()
+                    break
+
+            # Another caller is building this client; check again once it is done
+            pending.wait()
+
+        # Build the client outside the lock so a slow factory doesn't block other keys,
+        # passing the base URL through when one is configured
+        client_credentials = dict(credentials)
+        if base_url is not None:
+            client_credentials["base_url"] = base_url
+        try:
+            client = factory(client_credentials)
+        except BaseException:
+            with self._lock:
+                del self._building[key]
+            pending.set()
+            raise
+
+        with self._lock:
+            del self._building[key]
+            now = time.monotonic()
+            entry = PooledClient(
+                client=client, provider=provider, created_at=now, last_used=now, scope=scope
+            )
+            self._entries[key] = entry
+            self._misses += 1
+
+            # Evict least recently used clients beyond the size limit
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+            client = self._use(entry, now)
+        pending.set()
+        return client
+
+    @staticmethod
+    def _use(entry: PooledClient, now: float) -> Any:
+        """Record a use of a pooled client and return it."""
+        entry.last_used = now
+        entry.uses += 1
+        return entry.client
+
+    def _pop_idle(self, now: float) -> List[PooledClient]:
+        """Remove entries idle longer than the timeout; caller must hold the lock."""
+        if self.idle_timeout is None:
+            return []
+
+        expired = [
+            key for key, entry in self._entries.items() if now - entry.last_used > self.idle_timeout
+        ]
+        self._evictions += len(expired)
+        return [self._entries.pop(key) for key in expired]
+
+    def evict_idle(self) -> int:
+        """Remove clients that have been idle longer than the timeout."""
+        with self._lock:
+            return len(self._pop_idle(time.monotonic()))
+
+    def invalidate(
+        self, provider: Optional[str] = None, credentials: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Remove clients matching the provider and/or credentials."""
+        frozen = _freeze(credentials) if credentials is not None else None
+
+        with self._lock:
+            matching = [
+                key
+                for key in self._entries
+                if (provider is None or key[0] == provider) and (frozen is None or key[3] == frozen)
+            ]
+            for key in matching:
+                del self._entries[key]
+
+        return len(matching)
+
+    def close(self) -> None:
+        """Close every pooled client and empty the pool."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+
+        for entry in entries:
+            close_client(entry.client, entry.scope)
+
+    async def aclose(self) -> None:
+        """Close every pooled client, awaiting async clients' close coroutines."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+
+        loop = asyncio.get_running_loop()
+        for entry in entries:
+            # Clients pooled for another event loop must be closed on that loop
+            if isinstance(entry.scope, asyncio.AbstractEventLoop) and entry.scope is not loop:
+                close_client(entry.client, entry.scope)
+                continue
+
+            # SDK clients expose an async close(), bare httpx clients only aclose()
+            close = getattr(entry.client, "close", None) or getattr(entry.client, "aclose", None)
+            if not callable(close):
+                continue
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                # Closing is best-effort; keep releasing the remaining clients
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def __len__(self) -> int:
+        """Return the number of pooled clients."""
+        return len(self._entries)
+
+
+# Singleton pool shared by all providers
+clients = ClientPool()
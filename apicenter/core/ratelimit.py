@@ -0,0 +1,257 @@
+"""Client-side token-bucket rate limiting per provider, model and API key."""
+
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .errors import RateLimitExceeded
+
+# How callers wait when a bucket is empty
+BLOCK = "block"
+TIMEOUT = "timeout"
+FAIL = "fail"
+MODES = (BLOCK, TIMEOUT, FAIL)
+
+# Rough characters-per-token ratio used to estimate prompt size
+CHARS_PER_TOKEN = 4
+
+# Keyword arguments that cap the number of generated tokens
+MAX_TOKEN_OPTIONS = ("max_tokens", "max_completion_tokens", "max_output_tokens", "num_predict")
+
+
+def prompt_text(prompt: Any) -> str:
+    """Flatten a string or message-list prompt into its text content."""
+    if isinstance(prompt, str):
+        return prompt
+    if isinstance(prompt, list):
+        parts = []
+        for message in prompt:
+            content = message.get("content") if isinstance(message, dict) else message
+            parts.append(content if isinstance(content, str) else str(content or ""))
+        return "\n".join(parts)
+    return str(prompt)
+
+
+def estimate_tokens(prompt: Any, kwargs: Dict[str, Any]) -> int:
+    """Estimate the tokens a request will consume: prompt tokens plus the output cap."""
+    estimate = len(prompt_text(prompt)) // CHARS_PER_TOKEN + 1
+    for option in MAX_TOKEN_OPTIONS:
+        if isinstance(kwargs.get(option), int):
+            estimate += kwargs[option]
+            break
+    return estimate
+
+
+def key_fingerprint(api_key: Optional[str]) -> str:
+    """Return a short, non-reversible identifier for an API key."""
+    if not api_key:
+        return "-"
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+class TokenBucket:
+    """Bucket refilled continuously at rate units per second up to capacity.
+
+    Not thread-safe on its own; RateLimit guards it with a lock.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Start with a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Return how long until amount tokens are available (0 if they are now)."""
+        # A request larger than the bucket can only ever wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+
+class RateLimit:
+    """Requests-per-minute and tokens-per-minute budgets for one (provider, model, key)."""
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None) -> None:
+        """Create buckets for whichever limits are set."""
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = TokenBucket(rpm / 60.0, rpm) if rpm else None
+        self.tokens = TokenBucket(tpm / 60.0, tpm) if tpm else None
+        self.acquired = 0
+        self.waits = 0
+        self.rejections = 0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Take one request and the tokens if both are available, else return the wait time."""
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+                if bucket is not None:
+                    bucket.refill(now)
+                    wait = max(wait, bucket.wait_time(amount))
+            if wait > 0:
+                return wait
+
+            # Deduct from both buckets together so neither is spent on a request that waits
+            if self.requests is not None:
+                self.requests.tokens -= 1
+            if self.tokens is not None:
+                self.tokens.tokens -= min(tokens, self.tokens.capacity)
+            self.acquired += 1
+            return 0.0
+
+    def _next_wait(self, tokens: int, mode: str, deadline: Optional[float]) -> float:
+        """Reserve capacity or return how long to sleep, raising if the caller cannot wait."""
+        wait = self.reserve(tokens)
+        if wait == 0:
+            return 0.0
+
+        exceeded = mode == FAIL or (deadline is not None and time.monotonic() + wait > deadline)
+        with self._lock:
+            if exceeded:
+                self.rejections += 1
+            else:
+                self.waits += 1
+                self.wait_seconds += wait
+        if exceeded:
+            raise RateLimitExceeded(
+                f"Client-side rate limit reached; capacity frees up in {wait:.2f}s",
+                retry_after=wait,
+            )
+        return wait
+
+    def acquire(self, tokens: int = 0, mode: str = BLOCK, timeout: Optional[float] = None) -> None:
+        """Wait until the request fits the budget, or raise RateLimitExceeded."""
+        deadline = time.monotonic() + timeout if mode == TIMEOUT and timeout is not None else None
+        while True:
+            wait = self._next_wait(tokens, mode, deadline)
+            if wait == 0:
+                return
+            time.sleep(wait)
+
+    async def aacquire(
+        self, tokens: int = 0, mode: str = BLOCK, timeout: Optional[float] = None
+    ) -> None:
+        """Asynchronously wait until the request fits the budget, or raise RateLimitExceeded."""
+        deadline = time.monotonic() + timeout if mode == TIMEOUT and timeout is not None else None
+        while True:
+            wait = self._next_wait(tokens, mode, deadline)
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return limits, remaining capacity and wait counters."""
+        with self._lock:
+            now = time.monotonic()
+            for bucket in (self.requests, self.tokens):
+                if bucket is not None:
+                    bucket.refill(now)
+            return {
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "requests_available": self.requests.tokens if self.requests else None,
+                "tokens_available": self.tokens.tokens if self.tokens else None,
+                "acquired": self.acquired,
+                "waits": self.waits,
+                "rejections": self.rejections,
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+
+class RateLimiter:
+    """Registry of rate limits keyed by (provider, model, API key fingerprint).
+
+    Limits come from the ``rate_limits`` entry next to each provider in credentials.json,
+    or from set_limits(), which takes precedence.
+    """
+
+    def __init__(self, mode: str = BLOCK, timeout: Optional[float] = 30.0) -> None:
+        """Initialize the registry with the default waiting behaviour."""
+        if mode not in MODES:
+            raise ValueError(f"Rate limit mode must be one of {MODES}")
+        self.mode = mode
+        self.timeout = timeout
+        self._limits: Dict[Tuple[str, str, str], RateLimit] = {}
+        self._overrides: Dict[Tuple[str, Optional[str]], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def set_limits(
+        self,
+        provider: str,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        model: Optional[str] = None,
+    ) -> None:
+        """Override the configured limits for a provider, or one of its models."""
+        with self._lock:
+            self._overrides[(provider, model)] = {"rpm": rpm, "tpm": tpm}
+            for key in [k for k in self._limits if k[0] == provider]:
+                del self._limits[key]
+
+    def resolve(
+        self, provider: str, model: str, config: Optional[Dict[str, Any]]
+    ) -> Dict[str, Optional[float]]:
+        """Return the rpm/tpm limits that apply to a model.
+
+        Config looks like {"rpm": 500, "tpm": 200000, "models": {"gpt-4o": {"tpm": 30000}}}.
+        """
+        config = config or {}
+        limits = {"rpm": config.get("rpm"), "tpm": config.get("tpm")}
+        limits.update(config.get("models", {}).get(model, {}))
+
+        for key in ((provider, None), (provider, model)):
+            if key in self._overrides:
+                limits.update(self._overrides[key])
+        return limits
+
+    def get(
+        self,
+        provider: str,
+        model: str,
+        api_key: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> Optional[RateLimit]:
+        """Return the shared RateLimit for a request, or None if it is unlimited."""
+        key = (provider, model, key_fingerprint(api_key))
+        with self._lock:
+            limit = self._limits.get(key)
+            limits = self.resolve(provider, model, config)
+
+            # Rebuild the buckets if the configured limits changed
+            if limit is None or (limit.rpm, limit.tpm) != (limits["rpm"], limits["tpm"]):
+                if not limits["rpm"] and not limits["tpm"]:
+                    self._limits.pop(key, None)
+                    return None
+                limit = RateLimit(rpm=limits["rpm"], tpm=limits["tpm"])
+                self._limits[key] = limit
+            return limit
+
+    def reset(self) -> None:
+        """Forget every bucket and override."""
+        with self._lock:
+            self._limits.clear()
+            self._overrides.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return statistics for every active bucket, keyed by provider/model/key."""
+        with self._lock:
+            limits = dict(self._limits)
+        return {"/".join(key): limit.stats() for key, limit in limits.items()}
+
+
+# Singleton registry shared by every provider
+rate_limiter = RateLimiter()
@@ -0,0 +1,141 @@
+"""Registry mapping each mode and provider name to the class that serves it."""
+
+import importlib
+import threading
+from importlib.metadata import EntryPoint, entry_points
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type, Union
+
+if TYPE_CHECKING:
+    from .base import BaseProvider
+
+# Package entry point group scanned for third-party providers
+ENTRY_POINT_GROUP = "apicenter.providers"
+
+# A provider class, a "package.module:ClassName" path, or an entry point naming one
+ProviderTarget = Union[Type["BaseProvider"], str, EntryPoint]
+
+# Providers shipped with the package, imported on first use
+BUILTIN_PROVIDERS: Dict[str, Dict[str, str]] = {
+    "text": {
+        "openai": "apicenter.text.text:TextProvider",
+        "anthropic": "apicenter.text.text:TextProvider",
+        "ollama": "apicenter.text.text:TextProvider",
+        "deepseek": "apicenter.text.text:TextProvider",
+    },
+    "image": {
+        "openai": "apicenter.image.image:ImageProvider",
+        "stability": "apicenter.image.image:ImageProvider",
+    },
+    "audio": {
+        "elevenlabs": "apicenter.audio.audio:AudioProvider",
+    },
+}
+
+
+class ProviderRegistry:
+    """Provider classes per mode, registered by name or discovered from entry points.
+
+    Targets can be given as import paths, so a provider's module (and its SDK) is only
+    imported when the provider is first requested; the resolved class is then cached.
+    Installed packages add providers through the "apicenter.providers" entry point
+    group, named "<mode>.<provider>", e.g.
+
+        [project.entry-points."apicenter.providers"]
+        "text.inhouse" = "inhouse_llm.apicenter:InhouseTextProvider"
+
+    Entry points are read the first time a name is not found, and never replace a
+    provider registered in code.
+    """
+
+    def __init__(
+        self,
+        providers: Optional[Dict[str, Dict[str, ProviderTarget]]] = None,
+        group: str = ENTRY_POINT_GROUP,
+    ) -> None:
+        """Create a registry with initial targets per mode, reading entry points from group."""
+        self.group = group
+        self._targets: Dict[Tuple[str, str], ProviderTarget] = {
+            (mode, provider): target
+            for mode, targets in (providers or {}).items()
+            for provider, target in targets.items()
+        }
+        self._classes: Dict[Tuple[str, str], Type["BaseProvider"]] = {}
+        self._discovered = False
+        self._lock = threading.RLock()
+
+    def register(self, mode: str, provider: str, target: ProviderTarget) -> None:
+        """Serve a mode and provider name with a class or a "module:ClassName" path."""
+        with self._lock:
+            self._targets[(mode, provider)] = target
+            self._classes.pop((mode, provider), None)
+
+    def unregister(self, mode: str, provider: str) -> None:
+        """Remove a provider; unknown names are ignored."""
+        with self._lock:
+            self._targets.pop((mode, provider), None)
+            self._classes.pop((mode, provider), None)
+
+    def discover(self, force: bool = False) -> None:
+        """Read provider entry points from installed packages, without importing them."""
+        with self._lock:
+            if self._discovered and not force:
+                return
+            self._discovered = True
+            for entry_point in entry_points(group=self.group):
+                mode, _, provider = entry_point.name.partition(".")
+                if mode and provider:
+                    self._targets.setdefault((mode, provider), entry_point)
+
+    def get(self, mode: str, provider: str) -> Type["BaseProvider"]:
+        """Return the provider class for a mode and provider, importing it if needed."""
+        key = (mode, provider)
+        cls = self._classes.get(key)
+        if cls is not None:
+            return cls
+
+        with self._lock:
+            if key not in self._targets:
+                self.discover()
+            if key not in self._targets:
+                if mode not in self.modes():
+                    raise ValueError(f"Unsupported mode: {mode}")
+                raise ValueError(f"Unsupported provider '{provider}' for mode '{mode}'")
+            cls = self._classes[key] = resolve(self._targets[key])
+            return cls
+
+    def has_mode(self, mode: str) -> bool:
+        """Return True if any provider is registered for the mode."""
+        return mode in self.modes()
+
+    def modes(self) -> List[str]:
+        """Return every mode with at least one provider."""
+        self.discover()
+        return sorted({mode for mode, _ in self._targets})
+
+    def names(self, mode: str) -> List[str]:
+        """Return the provider names available for a mode."""
+        self.discover()
+        return sorted(provider for m, provider in self._targets if m == mode)
+
+
+def resolve(target: ProviderTarget) -> Type["BaseProvider"]:
+    """Import a registry target and check that it is a provider class."""
+    from .base import BaseProvider
+
+    if isinstance(target, EntryPoint):
+        cls = target.load()
+    elif isinstance(target, str):
+        module_path, _, attribute = target.partition(":")
+        cls = importlib.import_module(module_path)
+        for name in attribute.split(".") if attribute else ():
+            cls = getattr(cls, name)
+    else:
+        cls = target
+
+    if not (isinstance(cls, type) and issubclass(cls, BaseProvider)):
+        raise TypeError(f"Provider target {target!r} is not a BaseProvider subclass")
+    return cls
+
+
+# Singleton registry holding the built-in providers
+registry = ProviderRegistry(BUILTIN_PROVIDERS)
@@ -0,0 +1,295 @@
+"""Retry engine with decorrelated-jitter backoff, Retry-After support and deadlines."""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple, Type, TypeVar
+
+from .errors import (
+    APICenterError,
+    APIConnectionError,
+    RateLimitError,
+    RequestTimeoutError,
+    ServerError,
+)
+
+T = TypeVar("T")
+
+# Errors worth retrying by default
+DEFAULT_RETRY_ON: Tuple[Type[APICenterError], ...] = (
+    RateLimitError,
+    ServerError,
+    APIConnectionError,
+    RequestTimeoutError,
+)
+
+# Rate-limit reset headers, keyed by the remaining-count header that says they apply
+RESET_HEADERS = {
+    "x-ratelimit-remaining-requests": "x-ratelimit-reset-requests",
+    "x-ratelimit-remaining-tokens": "x-ratelimit-reset-tokens",
+    "anthropic-ratelimit-requests-remaining": "anthropic-ratelimit-requests-reset",
+    "anthropic-ratelimit-tokens-remaining": "anthropic-ratelimit-tokens-reset",
+    "x-ratelimit-remaining": "x-ratelimit-reset",
+}
+
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_reset(value: str) -> Optional[float]:
+    """Convert a rate-limit reset header value into seconds from now.
+
+    Accepts durations such as "1s" or "6m0s", RFC 3339 timestamps, epoch seconds and
+    plain second counts.
+    """
+    value = value.strip()
+    parts = DURATION_PART.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+
+    try:
+        number = float(value)
+    except ValueError:
+        number = None
+    if number is not None:
+        # Large values are absolute epoch timestamps
+        return max(0.0, number - time.time()) if number > 1e9 else number
+
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return max(0.0, reset_at.timestamp() - time.time())
+
+
+def reset_delay(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Return how long to wait for an exhausted rate limit to reset, if headers say."""
+    if not headers:
+        return None
+
+    exhausted = []
+    available = []
+    for remaining_header, reset_header in RESET_HEADERS.items():
+        if reset_header not in headers:
+            continue
+        delay = parse_reset(str(headers[reset_header]))
+        if delay is None:
+            continue
+        if str(headers.get(remaining_header, "")).strip() == "0":
+            exhausted.append(delay)
+        else:
+            available.append(delay)
+
+    # Wait for every exhausted limit; otherwise the soonest reset is the best guess
+    if exhausted:
+        return max(exhausted)
+    return min(available) if available else None
+
+
+class RetryStats:
+    """Thread-safe counters describing how often a policy retried and how long it slept."""
+
+    def __init__(self) -> None:
+        """Start with all counters at zero."""
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.give_ups = 0
+        self.sleep_seconds = 0.0
+        self.errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record_attempt(self) -> None:
+        """Count one attempt."""
+        with self._lock:
+            self.attempts += 1
+
+    def record_error(self, error: BaseException, retried: bool, delay: float = 0.0) -> None:
+        """Count a failed attempt, and the sleep before the next one if it will be retried."""
+        with self._lock:
+            name = type(error).__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+            if retried:
+                self.retries += 1
+                self.sleep_seconds += delay
+            else:
+                self.give_ups += 1
+
+    def record_call(self) -> None:
+        """Count one logical call, however many attempts it takes."""
+        with self._lock:
+            self.calls += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a snapshot of the counters."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "give_ups": self.give_ups,
+                "sleep_seconds": round(self.sleep_seconds, 3),
+                "errors": dict(self.errors),
+            }
+
+
+class RetryPolicy:
+    """Decides whether and when to retry a failed provider call.
+
+    Backoff uses decorrelated jitter, server hints (Retry-After and rate-limit reset
+    headers) take precedence, and the total time across attempts is capped by deadline.
+    Timeouts are only retried for idempotent requests when retry_timeouts is set, since
+    the provider may already have done (and billed) the work.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        deadline: Optional[float] = 120.0,
+        retry_on: Tuple[Type[BaseException], ...] = DEFAULT_RETRY_ON,
+        retry_timeouts: bool = False,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize the policy's attempt limit, backoff bounds and deadline."""
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_on = retry_on
+        self.retry_timeouts = retry_timeouts
+        self.sleep = sleep
+        self.stats = RetryStats()
+
+    def is_retryable(self, error: BaseException, idempotent: bool) -> bool:
+        """Return True if an error is of a kind this policy retries."""
+        if not isinstance(error, self.retry_on):
+            return False
+        if isinstance(error, APICenterError) and not error.retryable:
+            return False
+
+        # The server may have completed a request that timed out on our side
+        if isinstance(error, RequestTimeoutError) and error.status_code is None:
+            return idempotent and self.retry_timeouts
+
+        # Output already written somewhere can't be redone, but throttled requests never started
+        return idempotent or isinstance(error, RateLimitError)
+
+    def backoff(self, previous: float) -> float:
+        """Return the next decorrelated-jitter delay given the previous one."""
+        upper = max(self.base_delay, previous * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+    def next_delay(
+        self,
+        error: BaseException,
+        attempt: int,
+        previous: float,
+        started: float,
+        idempotent: bool,
+        deadline_at: Optional[float] = None,
+    ) -> Optional[float]:
+        """Return how long to sleep before the next attempt, or None to give up."""
+        if attempt >= self.max_attempts or not self.is_retryable(error, idempotent):
+            return None
+
+        # Server hints win over our own backoff
+        hint = getattr(error, "retry_after", None)
+        if hint is None:
+            hint = reset_delay(getattr(error, "headers", None))
+        delay = hint if hint is not None else self.backoff(previous)
+
+        # Never sleep past the overall deadline
+        if self.deadline is not None and time.monotonic() - started + delay > self.deadline:
+            return None
+        if deadline_at is not None and time.monotonic() + delay >= deadline_at:
+            return None
+        return delay
+
+    def call(
+        self,
+        func: Callable[[], T],
+        idempotent: bool = True,
+        deadline_at: Optional[float] = None,
+    ) -> T:
+        """Call func, retrying failures according to the policy.
+
+        deadline_at is a caller's time.monotonic() deadline; no retry starts past it.
+        """
+        self.stats.record_call()
+        started = time.monotonic()
+        delay = 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            self.stats.record_attempt()
+            try:
+                return func()
+            except Exception as e:
+                delay = self.next_delay(e, attempt, delay, started, idempotent, deadline_at)
+                self.stats.record_error(e, delay is not None, delay or 0.0)
+                if delay is None:
+                    raise
+            self.sleep(delay)
+
+    async def acall(
+        self,
+        func: Callable[[], Awaitable[T]],
+        idempotent: bool = True,
+        deadline_at: Optional[float] = None,
+    ) -> T:
+        """Await func, retrying failures according to the policy without blocking the loop."""
+        self.stats.record_call()
+        started = time.monotonic()
+        delay = 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            self.stats.record_attempt()
+            try:
+                return await func()
+            except Exception as e:
+                delay = self.next_delay(e, attempt, delay, started, idempotent, deadline_at)
+                self.stats.record_error(e, delay is not None, delay or 0.0)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+
+
+class RetryPolicies:
+    """Registry of retry policies with a default and per-provider overrides."""
+
+    def __init__(self, default: Optional[RetryPolicy] = None) -> None:
+        """Initialize the registry with a default policy."""
+        self.default = default if default is not None else RetryPolicy()
+        self._providers: Dict[str, RetryPolicy] = {}
+
+    def get(self, provider: str) -> RetryPolicy:
+        """Return the policy for a provider, falling back to the default."""
+        return self._providers.get(provider, self.default)
+
+    def set(self, provider: str, policy: RetryPolicy) -> None:
+        """Use a dedicated policy for a provider."""
+        self._providers[provider] = policy
+
+    def reset(self, provider: Optional[str] = None) -> None:
+        """Drop a provider's override, or every override when no provider is given."""
+        if provider is None:
+            self._providers.clear()
+        else:
+            self._providers.pop(provider, None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return retry counters for the default policy and each provider override."""
+        stats = {"default": self.default.stats.as_dict()}
+        for provider, policy in self._providers.items():
+            stats[provider] = policy.stats.as_dict()
+        return stats
+
+
+# Singleton registry used by every provider
+retry_policies = RetryPolicies()
@@ -0,0 +1,229 @@
+"""Routing across interchangeable models using live latency, throughput and error stats."""
+
+import random
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .fallback import DEFAULT_FALLBACK_ON, Hop, HopSpec, as_hop
+from .ratelimit import CHARS_PER_TOKEN
+
+# Objectives a router can optimize for
+LATENCY = "latency"
+THROUGHPUT = "throughput"
+COST = "cost"
+OBJECTIVES = (LATENCY, THROUGHPUT, COST)
+
+# Errors that say something about a model's health rather than the request
+HEALTH_ERRORS = DEFAULT_FALLBACK_ON
+
+StatsKey = Tuple[str, str, str]
+
+
+def count_tokens(response: Any) -> Optional[int]:
+    """Estimate the tokens in a text response; None for other kinds of output."""
+    if isinstance(response, str):
+        return len(response) // CHARS_PER_TOKEN + 1
+    return None
+
+
+class ModelStats:
+    """Exponentially weighted latency, throughput and error rate for one model."""
+
+    def __init__(self, alpha: float = 0.2) -> None:
+        """Start with no observations."""
+        self.alpha = alpha
+        self.latency: Optional[float] = None
+        self.tokens_per_second: Optional[float] = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.errors = 0
+
+    def _ewma(self, current: Optional[float], value: float) -> float:
+        """Blend a new observation into a running average."""
+        return value if current is None else current + self.alpha * (value - current)
+
+    def record(self, latency: float, tokens: Optional[int] = None, failed: bool = False) -> None:
+        """Add the outcome of one call."""
+        self.calls += 1
+        self.error_rate = self._ewma(self.error_rate if self.calls > 1 else None, float(failed))
+        if failed:
+            self.errors += 1
+            return
+        self.latency = self._ewma(self.latency, latency)
+        if tokens is not None and latency > 0:
+            self.tokens_per_second = self._ewma(self.tokens_per_second, tokens / latency)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the current averages and counters."""
+        return {
+            "latency": self.latency,
+            "tokens_per_second": self.tokens_per_second,
+            "error_rate": round(self.error_rate, 4),
+            "calls": self.calls,
+            "errors": self.errors,
+        }
+
+
+@dataclass
+class RouteDecision:
+    """Why a router picked a model: the objective, the candidates' scores and the choice."""
+
+    objective: str
+    chosen: Tuple[str, str]
+    scores: Dict[str, Optional[float]] = field(default_factory=dict)
+    reason: str = ""
+
+
+class Router:
+    """Picks the best (provider, model) from a pool of interchangeable candidates.
+
+    Objectives:
+    - "latency": lowest average latency, inflated by the error rate
+    - "throughput": highest tokens per second, discounted by the error rate
+    - "cost": cheapest candidate whose latency is within slo and error rate within
+      max_error_rate, falling back to lowest latency when none qualifies
+
+    Candidates without observations are tried first, and with probability explore a
+    random candidate is picked so stats for the others stay fresh.
+    """
+
+    def __init__(self, alpha: float = 0.2, explore: float = 0.05, history: int = 100) -> None:
+        """Initialize the smoothing factor, exploration rate and decision history size."""
+        self.alpha = alpha
+        self.explore = explore
+        self.costs: Dict[Tuple[str, str], float] = {}
+        self._stats: Dict[StatsKey, ModelStats] = {}
+        self._decisions: Deque[RouteDecision] = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def set_cost(self, provider: str, model: str, cost: float) -> None:
+        """Set a model's relative cost, e.g. dollars per million output tokens."""
+        self.costs[(provider, model)] = cost
+
+    def record(
+        self,
+        mode: str,
+        provider: str,
+        model: str,
+        latency: float,
+        response: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Add the outcome of a call; errors unrelated to the model's health are ignored."""
+        if error is not None and not isinstance(error, HEALTH_ERRORS):
+            return
+        with self._lock:
+            stats = self._stats.get((mode, provider, model))
+            if stats is None:
+                stats = self._stats[(mode, provider, model)] = ModelStats(self.alpha)
+            stats.record(latency, count_tokens(response), failed=error is not None)
+
+    def score(self, objective: str, stats: ModelStats) -> Optional[float]:
+        """Return a candidate's score for an objective; lower is better."""
+        healthy = max(0.05, 1.0 - stats.error_rate)
+        if objective == THROUGHPUT:
+            if stats.tokens_per_second is None:
+                return None
+            return -stats.tokens_per_second * healthy
+        if stats.latency is None:
+            return None
+        return stats.latency / healthy
+
+    def choose(
+        self,
+        mode: str,
+        pool: Sequence[HopSpec],
+        objective: str = LATENCY,
+        slo: Optional[float] = None,
+        max_error_rate: float = 0.1,
+    ) -> Hop:
+        """Pick the candidate to send a request to and record the decision."""
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Routing objective must be one of {OBJECTIVES}")
+        hops = [as_hop(spec) for spec in pool]
+        if not hops:
+            raise ValueError("Routing pool is empty")
+
+        with self._lock:
+            stats = {
+                (hop.provider, hop.model): self._stats.get((mode, hop.provider, hop.model))
+                for hop in hops
+            }
+        names = {(hop.provider, hop.model): f"{hop.provider}/{hop.model}" for hop in hops}
+        scores = {
+            names[key]: self.score(objective, s) if s is not None else None
+            for key, s in stats.items()
+        }
+
+        # Learn about every candidate before trusting the averages
+        unseen = [hop for hop in hops if stats[(hop.provider, hop.model)] is None]
+        if unseen:
+            chosen, reason = unseen[0], "no observations yet"
+        elif self.explore and random.random() < self.explore:
+            chosen, reason = random.choice(hops), "exploring"
+        else:
+            chosen, reason = self.best(objective, hops, stats, slo, max_error_rate)
+
+        decision = RouteDecision(objective, (chosen.provider, chosen.model), scores, reason)
+        with self._lock:
+            self._decisions.append(decision)
+        return chosen
+
+    def best(
+        self,
+        objective: str,
+        hops: List[Hop],
+        stats: Dict[Tuple[str, str], ModelStats],
+        slo: Optional[float],
+        max_error_rate: float,
+    ) -> Tuple[Hop, str]:
+        """Return the best candidate under the objective and why it was chosen."""
+        if objective == COST:
+
+            def within_slo(s: ModelStats) -> bool:
+                if s.error_rate > max_error_rate:
+                    return False
+                return slo is None or (s.latency is not None and s.latency <= slo)
+
+            eligible = [hop for hop in hops if within_slo(stats[(hop.provider, hop.model)])]
+            if eligible:
+                hop = min(
+                    eligible,
+                    key=lambda h: (
+                        self.costs.get((h.provider, h.model), float("inf")),
+                        self.score(LATENCY, stats[(h.provider, h.model)]) or 0.0,
+                    ),
+                )
+                return hop, "cheapest within SLO"
+            objective = LATENCY
+
+        ranked = []
+        for index, hop in enumerate(hops):
+            score = self.score(objective, stats[(hop.provider, hop.model)])
+            if score is not None:
+                ranked.append((score, index, hop))
+        if not ranked:
+            return hops[0], f"no {objective} data"
+        return min(ranked, key=lambda item: item[:2])[2], f"best {objective}"
+
+    def decisions(self) -> List[RouteDecision]:
+        """Return recent routing decisions, oldest first."""
+        with self._lock:
+            return list(self._decisions)
+
+    def reset(self) -> None:
+        """Forget all observations and decisions."""
+        with self._lock:
+            self._stats.clear()
+            self._decisions.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return averages per mode/provider/model."""
+        with self._lock:
+            return {"/".join(key): s.as_dict() for key, s in self._stats.items()}
+
+
+# Singleton router fed by every request
+router = Router()
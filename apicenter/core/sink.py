@@ -0,0 +1,165 @@
+"""Write streamed binary results directly to files, file objects or buffers."""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, AsyncIterable, BinaryIO, Iterable, Optional, Union
+
+# A destination for binary output: a filesystem path or any object with write()
+Sink = Union[str, os.PathLike, BinaryIO, Any]
+
+
+def is_path(sink: Sink) -> bool:
+    """Return True if the sink is a filesystem path rather than a writable object."""
+    return isinstance(sink, (str, os.PathLike))
+
+
+def _fsync_file(handle: Any) -> None:
+    """Flush a file object and force its contents to disk if it has a descriptor."""
+    handle.flush()
+    try:
+        os.fsync(handle.fileno())
+    except (AttributeError, OSError, ValueError):
+        # In-memory buffers and pipes have nothing to sync
+        pass
+
+
+def _read_umask() -> Optional[int]:
+    """Read the process umask without changing it, where the platform allows."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _import_umask() -> int:
+    """Read the umask once at import, before worker threads create files."""
+    umask = _read_umask()
+    if umask is None:
+        # Elsewhere the umask can only be read by setting it, so do it only here
+        umask = os.umask(0)
+        os.umask(umask)
+    return umask
+
+
+# Fallback for platforms without /proc; the umask is normally set once at startup
+_UMASK = _import_umask()
+
+
+def _new_file_mode() -> int:
+    """Return the permissions open() gives new files under the process umask."""
+    umask = _read_umask()
+    return 0o666 & ~(_UMASK if umask is None else umask)
+
+
+def _fsync_directory(path: Path) -> None:
+    """Persist a rename by syncing the containing directory where supported."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class SinkWriter:
+    """Context manager that opens a sink, accepts chunks and commits them on success."""
+
+    def __init__(self, sink: Sink, fsync: bool = False, atomic: bool = False) -> None:
+        """Prepare to write to the sink, optionally syncing and renaming atomically."""
+        if atomic and not is_path(sink):
+            raise ValueError("atomic=True requires the sink to be a file path")
+
+        self.sink = sink
+        self.fsync = fsync
+        self.atomic = atomic
+        self.bytes_written = 0
+        self._handle: Any = None
+        self._temp_path: Union[Path, None] = None
+
+    def __enter__(self) -> "SinkWriter":
+        """Open the destination, using a temporary sibling file for atomic writes."""
+        if not is_path(self.sink):
+            self._handle = self.sink
+            return self
+
+        path = Path(self.sink)
+        if self.atomic:
+            # Write next to the target so the final rename stays on one filesystem
+            fd, temp_name = tempfile.mkstemp(
+                dir=path.parent or ".", prefix=f".{path.name}.", suffix=".tmp"
+            )
+            self._temp_path = Path(temp_name)
+            self._handle = os.fdopen(fd, "wb")
+
+            # mkstemp creates the file private to its owner; give it a regular file's mode
+            try:
+                os.chmod(temp_name, _new_file_mode())
+            except OSError:
+                # Some filesystems don't support permissions; keep the default
+                pass
+        else:
+            self._handle = open(path, "wb")
+        return self
+
+    def write(self, chunk: bytes) -> None:
+        """Write one chunk to the destination."""
+        if chunk:
+            self._handle.write(chunk)
+            self.bytes_written += len(chunk)
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        """Commit the output on success, or discard a partial atomic write on failure."""
+        if not is_path(self.sink):
+            if exc_type is None and self.fsync:
+                _fsync_file(self._handle)
+            elif exc_type is None and hasattr(self._handle, "flush"):
+                self._handle.flush()
+            return
+
+        try:
+            if exc_type is None and self.fsync:
+                _fsync_file(self._handle)
+        finally:
+            self._handle.close()
+
+        if self._temp_path is None:
+            return
+
+        if exc_type is not None:
+            # Never leave a half-written asset behind
+            self._temp_path.unlink(missing_ok=True)
+            return
+
+        target = Path(self.sink)
+        os.replace(self._temp_path, target)
+        if self.fsync:
+            _fsync_directory(target.parent)
+
+
+def write_to_sink(
+    chunks: Iterable[bytes], sink: Sink, fsync: bool = False, atomic: bool = False
+) -> int:
+    """Write chunks to a path, file object or buffer and return the number of bytes written."""
+    with SinkWriter(sink, fsync=fsync, atomic=atomic) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.bytes_written
+
+
+async def awrite_to_sink(
+    chunks: AsyncIterable[bytes], sink: Sink, fsync: bool = False, atomic: bool = False
+) -> int:
+    """Write chunks from an async iterator to a sink and return the number of bytes written."""
+    with SinkWriter(sink, fsync=fsync, atomic=atomic) as writer:
+        async for chunk in chunks:
+            writer.write(chunk)
+    return writer.bytes_written
@@ -0,0 +1,137 @@
+"""Mergeable quantile sketches for latency and throughput percentiles."""
+
+import math
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+# Percentiles reported by default, as fractions
+DEFAULT_QUANTILES: Sequence[float] = (0.5, 0.9, 0.99, 0.999)
+
+# Values at or below this are counted as zero, since the log mapping cannot index them
+MIN_INDEXABLE = 1e-9
+
+
+def quantile_name(q: float) -> str:
+    """Return the short name of a quantile, e.g. p99 or p999."""
+    return "p" + f"{q * 100:g}".replace(".", "")
+
+
+class DDSketch:
+    """Quantile sketch with a bounded relative error, after DDSketch (Masson et al., 2019).
+
+    Values are counted in logarithmically sized buckets, so any quantile is returned
+    within relative_accuracy of the true value (1% by default) whatever the spread of the
+    data. Memory is bounded by max_bins: when exceeded, the lowest buckets are merged,
+    which only affects the accuracy of the lowest quantiles. Sketches with the same
+    accuracy can be merged, e.g. to combine the sketches of several worker processes.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048) -> None:
+        """Create an empty sketch."""
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Count one value; negative values are counted as zero."""
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= MIN_INDEXABLE:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + 1
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        """Merge the lowest buckets until at most max_bins remain."""
+        indexes = sorted(self.bins)
+        excess = len(indexes) - self.max_bins
+        if excess <= 0:
+            return
+        target = indexes[excess]
+        for index in indexes[:excess]:
+            self.bins[target] += self.bins.pop(index)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the value at quantile q (0 to 1), or None if the sketch is empty."""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return max(self.min, 0.0)
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                # The bucket's midpoint in relative terms
+                value = 2 * self.gamma**index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def percentiles(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        """Return the given quantiles keyed by name (p50, p99, ...) with the count."""
+        result: Dict[str, Any] = {quantile_name(q): self.quantile(q) for q in quantiles}
+        result["count"] = self.count
+        return result
+
+    def merge(self, other: "DDSketch") -> None:
+        """Add another sketch's values to this one."""
+        if not math.isclose(other.gamma, self.gamma):
+            raise ValueError("Sketches with different relative accuracy cannot be merged")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._collapse()
+
+    def copy(self) -> "DDSketch":
+        """Return an independent copy of the sketch."""
+        clone = DDSketch(self.relative_accuracy, self.max_bins)
+        clone.merge(self)
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable form of the sketch."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(index): count for index, count in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_bins: int = 2048) -> "DDSketch":
+        """Rebuild a sketch from to_dict() output."""
+        sketch = cls(data["relative_accuracy"], max_bins)
+        sketch.bins = {int(index): count for index, count in data["bins"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        sketch._collapse()
+        return sketch
@@ -0,0 +1,159 @@
+"""Normalized events for streaming text generation across providers."""
+
+from collections.abc import AsyncIterator as AsyncIteratorABC
+from collections.abc import Iterator as IteratorABC
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Union
+
+# Called once when a stream ends, with the error it failed with or None
+StreamEndCallback = Callable[[Optional[Exception]], None]
+
+
+@dataclass
+class TextDelta:
+    """A fragment of generated text as it arrives from the provider."""
+
+    text: str
+
+
+@dataclass
+class StreamSummary:
+    """Final event of a text stream with the full text, finish reason and token usage."""
+
+    text: str
+    finish_reason: Optional[str] = None
+    usage: Dict[str, int] = field(default_factory=dict)
+    provider: Optional[str] = None
+    model: Optional[str] = None
+
+
+# Every text stream yields zero or more deltas followed by exactly one summary
+StreamEvent = Union[TextDelta, StreamSummary]
+
+
+def make_usage(input_tokens: Any = None, output_tokens: Any = None) -> Dict[str, int]:
+    """Build a normalized usage dictionary, omitting counts the provider did not report."""
+    usage: Dict[str, int] = {}
+    if input_tokens is not None:
+        usage["input_tokens"] = int(input_tokens)
+    if output_tokens is not None:
+        usage["output_tokens"] = int(output_tokens)
+    if input_tokens is not None and output_tokens is not None:
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+    return usage
+
+
+def is_stream(value: Any) -> bool:
+    """Return True if a provider response is a stream still to be consumed."""
+    return isinstance(value, (IteratorABC, AsyncIteratorABC))
+
+
+class _Guard:
+    """Calls a stream's end callback exactly once, however the stream ends."""
+
+    def __init__(self, stream: Any, on_end: StreamEndCallback) -> None:
+        """Wrap a stream whose end is reported to on_end."""
+        self._stream = stream
+        self._on_end: Optional[StreamEndCallback] = on_end
+
+    def _end(self, error: Optional[BaseException] = None) -> None:
+        """Report how the stream ended, the first time it does."""
+        on_end, self._on_end = self._on_end, None
+        if on_end is not None:
+            on_end(error if isinstance(error, Exception) else None)
+
+    def __del__(self) -> None:
+        """Release what the stream holds if it is dropped without being read or closed."""
+        try:
+            self._end()
+        except Exception:
+            pass
+
+
+class GuardedStream(_Guard):
+    """Relays a stream, reporting once it is exhausted, fails, is closed or is dropped.
+
+    Unlike a generator's finally block, close() and garbage collection release the
+    stream's resources even if it was never read.
+    """
+
+    def __iter__(self) -> "GuardedStream":
+        """Return the stream itself."""
+        return self
+
+    def __next__(self) -> Any:
+        """Return the next item, reporting the end of the stream when there is none."""
+        if self._on_end is None:
+            raise StopIteration
+        try:
+            return next(self._stream)
+        except StopIteration:
+            self._end()
+            raise
+        except BaseException as e:
+            self._end(e)
+            raise
+
+    def close(self) -> None:
+        """Stop reading, closing the underlying stream."""
+        try:
+            close = getattr(self._stream, "close", None)
+            if callable(close):
+                close()
+        finally:
+            self._end()
+
+    def __enter__(self) -> "GuardedStream":
+        """Use the stream in a with block that closes it."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        """Close the stream."""
+        self.close()
+
+
+class AsyncGuardedStream(_Guard):
+    """Async version of GuardedStream."""
+
+    def __aiter__(self) -> "AsyncGuardedStream":
+        """Return the stream itself."""
+        return self
+
+    async def __anext__(self) -> Any:
+        """Return the next item, reporting the end of the stream when there is none."""
+        if self._on_end is None:
+            raise StopAsyncIteration
+        try:
+            return await self._stream.__anext__()
+        except StopAsyncIteration:
+            self._end()
+            raise
+        except BaseException as e:
+            self._end(e)
+            raise
+
+    async def aclose(self) -> None:
+        """Stop reading, closing the underlying stream."""
+        try:
+            aclose = getattr(self._stream, "aclose", None)
+            if callable(aclose):
+                await aclose()
+        finally:
+            self._end()
+
+    async def __aenter__(self) -> "AsyncGuardedStream":
+        """Use the stream in an async with block that closes it."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        """Close the stream."""
+        await self.aclose()
+
+
+def guard_stream(
+    stream: Union[Iterator[Any], AsyncIterator[Any]], on_end: StreamEndCallback
+) -> Union[GuardedStream, AsyncGuardedStream]:
+    """Wrap a sync or async stream so on_end reports how it ended rather than how it started."""
+    if isinstance(stream, AsyncIteratorABC):
+        return AsyncGuardedStream(stream, on_end)
+    return GuardedStream(iter(stream), on_end)
@@ -1,35 +1,139 @@
 """Image generation provider implementations for various AI services."""
 
-from apicenter.core.credentials import credentials
-from .providers.openai import call_openai
-from .providers.stability import call_stability
-from typing import Any, Dict, Optional, Union, List
-from ..core.base import BaseProvider, ProviderConfig
+from typing import Any, AsyncIterator, Dict, Iterator, List, Union
 
+from ..core.base import BaseProvider
+from ..core.errors import APICenterError
+from ..core.lazy import LazyProviders
+from ..core.sink import awrite_to_sink, is_path, write_to_sink
 
-class ImageProvider(BaseProvider[Union[str, bytes, List[str]]]):
+# Provider modules import their SDKs, so each is only imported when first used
+providers = LazyProviders(
+    globals(),
+    {
+        "openai": (
+            "apicenter.image.providers.openai",
+            {
+                "call_openai": "call_openai",
+                "acall_openai": "acall_openai",
+                "stream_openai": "stream_openai",
+                "astream_openai": "astream_openai",
+                "create_openai_client": "create_client",
+                "create_async_openai_client": "create_async_client",
+                "create_async_download_client": "create_async_download_client",
+            },
+        ),
+        "stability": (
+            "apicenter.image.providers.stability",
+            {
+                "call_stability": "call_stability",
+                "acall_stability": "acall_stability",
+                "stream_stability": "stream_stability",
+                "astream_stability": "astream_stability",
+                "create_async_stability_client": "create_async_client",
+            },
+        ),
+    },
+)
+
+
+def __getattr__(name: str) -> Any:
+    """Import provider functions on first access, e.g. when a test patches them."""
+    return providers.resolve(name)
+
+
+class ImageProvider(BaseProvider[Union[str, bytes, List[str], int]]):
     """Provider for image generation across multiple AI services."""
 
+    def __init__(self, provider: str, model: str, prompt: Any, **kwargs: Any) -> None:
+        """Initialize the provider, noting whether output should be written to a sink."""
+        providers.load(provider)
+        self.sink = kwargs.pop("sink", None)
+        self.fsync = bool(kwargs.pop("fsync", False))
+        self.atomic = bool(kwargs.pop("atomic", False))
+        super().__init__(provider, model, prompt, **kwargs)
+
+    def is_idempotent(self) -> bool:
+        """Return False when output goes to a caller's file object that a retry would corrupt."""
+        return self.sink is None or is_path(self.sink)
+
     def get_mode(self) -> str:
         """Return the mode identifier for this provider."""
         return "image"
 
-    def call(self) -> Union[str, bytes, List[str]]:
+    def call(self) -> Union[str, bytes, List[str], int]:
         """Route the request to the appropriate provider implementation."""
-        # Map each provider to its implementation method
-        provider_methods = {"openai": self.call_openai, "stability": self.call_stability}
+        # Write image bytes straight to the destination when a sink was given
+        if self.sink is not None:
+            try:
+                return write_to_sink(self.stream(), self.sink, fsync=self.fsync, atomic=self.atomic)
+            except APICenterError:
+                raise
+            except Exception as e:
+                raise ValueError(f"Error calling {self.provider} image API: {str(e)}")
+
+        # Look up the provider's implementation method, e.g. call_openai
+        method = self.provider_method("call")
 
         try:
-            # Call the appropriate provider method if supported
-            if self.provider in provider_methods:
-                return provider_methods[self.provider]()
+            # Call the provider method if supported
+            if method is not None:
+                return method()
             else:
                 raise ValueError(f"Unsupported image provider: {self.provider}")
+        except APICenterError:
+            raise
         except Exception as e:
             raise ValueError(f"Error calling {self.provider} image API: {str(e)}")
 
-    def call_openai(self) -> Union[str, bytes, List[str]]:
-        """Process request through OpenAI's DALL-E image generation API."""
+    async def acall(self) -> Union[str, bytes, List[str], int]:
+        """Route the request to the appropriate non-blocking provider implementation."""
+        # Write image bytes straight to the destination when a sink was given
+        if self.sink is not None:
+            try:
+                return await awrite_to_sink(
+                    self.astream(), self.sink, fsync=self.fsync, atomic=self.atomic
+                )
+            except APICenterError:
+                raise
+            except Exception as e:
+                raise ValueError(f"Error calling {self.provider} image API: {str(e)}")
+
+        # Look up the provider's async method, e.g. acall_openai
+        method = self.provider_method("acall")
+        if method is None and self.provider_method("call") is not None:
+            # Providers without a native async client run in a worker thread
+            return await super().acall()
+
+        try:
+            # Await the provider method if supported
+            if method is not None:
+                return await method()
+            else:
+                raise ValueError(f"Unsupported image provider: {self.provider}")
+        except APICenterError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error calling {self.provider} image API: {str(e)}")
+
+    def stream(self) -> Iterator[bytes]:
+        """Route a request for the image as a stream of byte chunks."""
+        # Look up the provider's streaming method, e.g. stream_openai
+        method = self.provider_method("stream")
+        if method is None:
+            raise ValueError(f"Unsupported image provider: {self.provider}")
+        return method()
+
+    def astream(self) -> AsyncIterator[bytes]:
+        """Route a request for the image as an async stream of byte chunks."""
+        # Look up the provider's async streaming method, e.g. astream_openai
+        method = self.provider_method("astream")
+        if method is None:
+            raise ValueError(f"Unsupported image provider: {self.provider}")
+        return method()
+
+    def get_openai_credentials(self) -> Dict[str, Any]:
+        """Build the OpenAI credentials dictionary from the loaded configuration."""
         # Prepare credentials dictionary
         credentials_dict = {
             "api_key": self.config.api_key,
@@ -37,28 +141,123 @@ class ImageProvider(BaseProvider[Union[str, bytes, List[str]]]):
         }
 
         # Remove None values from credentials
-        credentials_dict = {k: v for k, v in credentials_dict.items() if v is not None}
+        return {k: v for k, v in credentials_dict.items() if v is not None}
 
-        # Call the OpenAI implementation
-        return call_openai(
-            model=self.model, prompt=self.prompt, credentials=credentials_dict, **self.kwargs
-        )
-
-    def call_stability(self) -> bytes:
-        """Process request through Stability AI's image generation API."""
+    def get_stability_credentials(self) -> Dict[str, Any]:
+        """Build the Stability AI credentials dictionary from the loaded configuration."""
         # Prepare credentials dictionary
         credentials_dict = {"api_key": self.config.api_key}
 
         # Remove None values from credentials
-        credentials_dict = {k: v for k, v in credentials_dict.items() if v is not None}
+        return {k: v for k, v in credentials_dict.items() if v is not None}
+
+    def call_openai(self) -> Union[str, bytes, List[str]]:
+        """Process request through OpenAI's DALL-E image generation API."""
+        credentials_dict = self.get_openai_credentials()
+
+        # Call the OpenAI implementation with a pooled client
+        return providers.resolve("call_openai")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_client(providers.resolve("create_openai_client"), credentials_dict),
+            **self.kwargs,
+        )
+
+    def call_stability(self) -> bytes:
+        """Process request through Stability AI's image generation API."""
+        credentials_dict = self.get_stability_credentials()
 
         # Call the Stability AI implementation
-        return call_stability(
+        return providers.resolve("call_stability")(
+            model=self.model, prompt=self.prompt, credentials=credentials_dict, **self.kwargs
+        )
+
+    async def acall_openai(self) -> Union[str, bytes, List[str]]:
+        """Process request through OpenAI's async image generation API."""
+        credentials_dict = self.get_openai_credentials()
+
+        # Await the OpenAI implementation with a pooled async client
+        return await providers.resolve("acall_openai")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_async_client(
+                providers.resolve("create_async_openai_client"), credentials_dict
+            ),
+            **self.kwargs,
+        )
+
+    async def acall_stability(self) -> bytes:
+        """Process request through Stability AI using a pooled async HTTP client."""
+        credentials_dict = self.get_stability_credentials()
+
+        # The HTTP client carries no credentials, so one client serves every API key
+        return await providers.resolve("acall_stability")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_async_client(providers.resolve("create_async_stability_client"), {}),
+            **self.kwargs,
+        )
+
+    def stream_openai(self) -> Iterator[bytes]:
+        """Stream the first OpenAI image, downloading URL results chunk by chunk."""
+        credentials_dict = self.get_openai_credentials()
+        return providers.resolve("stream_openai")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_client(providers.resolve("create_openai_client"), credentials_dict),
+            **self.kwargs,
+        )
+
+    def stream_stability(self) -> Iterator[bytes]:
+        """Stream raw image bytes from Stability AI."""
+        credentials_dict = self.get_stability_credentials()
+        return providers.resolve("stream_stability")(
             model=self.model, prompt=self.prompt, credentials=credentials_dict, **self.kwargs
         )
 
+    def astream_openai(self) -> AsyncIterator[bytes]:
+        """Asynchronously stream the first OpenAI image over pooled clients."""
+        credentials_dict = self.get_openai_credentials()
+        return providers.resolve("astream_openai")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_async_client(
+                providers.resolve("create_async_openai_client"), credentials_dict
+            ),
+            download_client=self.get_async_client(
+                providers.resolve("create_async_download_client"), {}
+            ),
+            **self.kwargs,
+        )
+
+    def astream_stability(self) -> AsyncIterator[bytes]:
+        """Asynchronously stream raw image bytes from Stability AI."""
+        credentials_dict = self.get_stability_credentials()
+        return providers.resolve("astream_stability")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_async_client(providers.resolve("create_async_stability_client"), {}),
+            **self.kwargs,
+        )
 
-def image(provider: str, model: str, prompt: Any, **kwargs: Any) -> Union[str, bytes, List[str]]:
+
+def image(
+    provider: str, model: str, prompt: Any, **kwargs: Any
+) -> Union[str, bytes, List[str], int]:
     """Generate images using any supported AI provider with a unified interface."""
     # Create provider instance and get response
     return ImageProvider(provider, model, prompt, **kwargs).get_response()
+
+
+async def aimage(
+    provider: str, model: str, prompt: Any, **kwargs: Any
+) -> Union[str, bytes, List[str], int]:
+    """Generate images asynchronously using any supported AI provider."""
+    # Create provider instance and await response
+    return await ImageProvider(provider, model, prompt, **kwargs).aget_response()
@@ -1,24 +1,154 @@
-from openai import OpenAI
 import base64
+import threading
 
+from openai import AsyncOpenAI, OpenAI
 
-def call_openai(model, prompt, credentials, **kwargs):
-    """OpenAI DALL-E provider implementation."""
-    client = OpenAI(**credentials)
+from apicenter.core.errors import translate_error
+from apicenter.core.http import HTTPSession
+
+# Size of the pieces read from the image host when streaming a download
+CHUNK_SIZE = 64 * 1024
+
+# Keep-alive session for downloading generated images, created on first use
+_download_session = None
+_download_lock = threading.Lock()
+
+
+def get_download_session():
+    """Return the shared session used to download generated images."""
+    global _download_session
+    if _download_session is None:
+        with _download_lock:
+            if _download_session is None:
+                _download_session = HTTPSession()
+    return _download_session
+
+
+def create_async_download_client(credentials):
+    """Create an async HTTP client for downloading generated images."""
+    return get_download_session().create_async_client()
 
-    # Check if direct image output is requested
-    want_bytes = kwargs.pop("output_format", None) in ["png", "jpeg"]
 
-    response = client.images.generate(
-        model=model,
-        prompt=prompt,
-        response_format="url" if not want_bytes else "b64_json",
-        **kwargs,
-    )
+def create_client(credentials):
+    """Create an OpenAI client for image generation."""
+    return OpenAI(**{"max_retries": 0, **credentials})
 
+
+def create_async_client(credentials):
+    """Create an asynchronous OpenAI client for image generation."""
+    return AsyncOpenAI(**{"max_retries": 0, **credentials})
+
+
+def extract_image(response, want_bytes):
+    """Return the first image URL, or its decoded bytes when requested."""
     # Return URLs by default or image data if requested
     if not want_bytes:
         # Return just the first URL as a string instead of a list to avoid "write() argument must be str, not list" error
         return response.data[0].url
     else:
         return [base64.b64decode(img.b64_json) for img in response.data][0]
+
+
+def call_openai(model, prompt, credentials, client=None, **kwargs):
+    """OpenAI DALL-E provider implementation."""
+    if client is None:
+        client = create_client(credentials)
+
+    # Check if direct image output is requested
+    want_bytes = kwargs.pop("output_format", None) in ["png", "jpeg"]
+
+    try:
+        response = client.images.generate(
+            model=model,
+            prompt=prompt,
+            response_format="url" if not want_bytes else "b64_json",
+            **kwargs,
+        )
+    except Exception as e:
+        raise translate_error("openai", e, "OpenAI API error") from e
+
+    return extract_image(response, want_bytes)
+
+
+async def acall_openai(model, prompt, credentials, client=None, **kwargs):
+    """Asynchronous OpenAI DALL-E provider implementation."""
+    if client is None:
+        client = create_async_client(credentials)
+
+    # Check if direct image output is requested
+    want_bytes = kwargs.pop("output_format", None) in ["png", "jpeg"]
+
+    try:
+        response = await client.images.generate(
+            model=model,
+            prompt=prompt,
+            response_format="url" if not want_bytes else "b64_json",
+            **kwargs,
+        )
+    except Exception as e:
+        raise translate_error("openai", e, "OpenAI API error") from e
+
+    return extract_image(response, want_bytes)
+
+
+def stream_openai(
+    model, prompt, credentials, client=None, session=None, chunk_size=CHUNK_SIZE, **kwargs
+):
+    """Yield the first generated image in chunks, downloading URL results as they arrive."""
+    if client is None:
+        client = create_client(credentials)
+
+    # Base64 results arrive inline, so only URL results can be streamed from the network
+    want_bytes = kwargs.get("output_format") in ["png", "jpeg"]
+    if want_bytes:
+        yield call_openai(model, prompt, credentials, client=client, **kwargs)
+        return
+
+    url = call_openai(model, prompt, credentials, client=client, **kwargs)
+    if session is None:
+        session = get_download_session()
+    try:
+        # A per-call timeout caps the download too; otherwise the session defaults apply
+        options = {}
+        if kwargs.get("timeout") is not None:
+            options["timeout"] = session.request_timeout(kwargs["timeout"])
+        with session.get(url, stream=True, **options) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    yield chunk
+    except Exception as e:
+        raise translate_error("openai", e, "OpenAI image download error") from e
+
+
+async def astream_openai(
+    model, prompt, credentials, client=None, download_client=None, chunk_size=CHUNK_SIZE, **kwargs
+):
+    """Asynchronously yield the first generated image in chunks."""
+    if client is None:
+        client = create_async_client(credentials)
+
+    # Base64 results arrive inline, so only URL results can be streamed from the network
+    want_bytes = kwargs.get("output_format") in ["png", "jpeg"]
+    if want_bytes:
+        yield await acall_openai(model, prompt, credentials, client=client, **kwargs)
+        return
+
+    url = await acall_openai(model, prompt, credentials, client=client, **kwargs)
+
+    # Fall back to a one-off client when no pooled client is given
+    one_off = None
+    if download_client is None:
+        download_client = one_off = create_async_download_client({})
+    try:
+        timeout = get_download_session().async_timeout(kwargs.get("timeout"))
+        async with download_client.stream("GET", url, timeout=timeout) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(chunk_size):
+                if chunk:
+                    yield chunk
+    except Exception as e:
+        raise translate_error("openai", e, "OpenAI image download error") from e
+    finally:
+        if one_off is not None:
+            await one_off.aclose()
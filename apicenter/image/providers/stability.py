@@ -1,81 +1,260 @@
 """Stability AI image generation provider implementation."""
 
-import requests
 import base64
-from typing import Dict, Any, Optional, Union, List
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
 
+import httpx
 
-def call_stability(model: str, prompt: str, credentials: Dict[str, Any], **kwargs: Any) -> bytes:
+from apicenter.core.errors import (
+    APICenterError,
+    AuthenticationError,
+    error_from_status,
+    translate_error,
+)
+from apicenter.core.http import HTTPSession
+
+# Size of the pieces read from the response when streaming raw image bytes
+CHUNK_SIZE = 64 * 1024
+
+# Shared keep-alive session, created on first use
+_session: Optional[HTTPSession] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> HTTPSession:
+    """Return the shared Stability AI HTTP session, creating it if needed."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = HTTPSession()
+    return _session
+
+
+def configure_session(**options: Any) -> HTTPSession:
+    """Replace the shared Stability AI session with one built from the given options."""
+    global _session
+    with _session_lock:
+        previous, _session = _session, HTTPSession(**options)
+
+    # Release connections held by the old session
+    if previous is not None:
+        previous.close()
+    return _session
+
+
+def session_stats() -> Dict[str, Any]:
+    """Return connection pool statistics for the shared Stability AI session."""
+    return get_session().stats()
+
+
+def create_async_client(credentials: Dict[str, Any]) -> httpx.AsyncClient:
+    """Create an async HTTP client matching the shared session's pool and timeouts."""
+    return get_session().create_async_client()
+
+
+def build_request(
+    model: str, prompt: str, credentials: Dict[str, Any], **kwargs: Any
+) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """Build the endpoint URL, headers and JSON body for a text-to-image request."""
+    # Verify API key is present
+    api_key = credentials.get("api_key")
+    if not api_key:
+        raise AuthenticationError("Missing Stability AI API key", provider="stability")
+
+    # Determine appropriate API endpoint based on model
+    if model.startswith("stable-diffusion-xl") or model.startswith("sdxl"):
+        # SDXL models
+        base_url = (
+            "https://api.stability.ai/v1/generation/stable-diffusion-xl-1024-v1-0/text-to-image"
+        )
+    elif model == "stable-diffusion-v1-6":
+        base_url = "https://api.stability.ai/v1/generation/stable-diffusion-v1-6/text-to-image"
+    else:
+        # Use generic endpoint for other models
+        base_url = f"https://api.stability.ai/v1/generation/{model}/text-to-image"
+
+    # Set up request headers
+    accept_header = "application/json"
+    if "accept" in kwargs:
+        accept_header = kwargs.pop("accept")
+
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Accept": accept_header,
+        "Content-Type": "application/json",
+    }
+
+    # Configure generation parameters with defaults
+    data = {
+        "text_prompts": [{"text": prompt}],
+        "height": kwargs.pop("height", 1024),
+        "width": kwargs.pop("width", 1024),
+        "cfg_scale": kwargs.pop("cfg_scale", 7.0),
+        "steps": kwargs.pop("steps", 30),
+        "samples": kwargs.pop("samples", 1),
+    }
+
+    # Add negative prompt if provided
+    if "negative_prompt" in kwargs:
+        data["text_prompts"].append({"text": kwargs.pop("negative_prompt"), "weight": -1.0})
+
+    # Include any remaining parameters
+    for key, value in kwargs.items():
+        data[key] = value
+
+    return base_url, headers, data
+
+
+def parse_response(response: Any) -> bytes:
+    """Decode the first generated image or raise a descriptive error."""
+    # Handle successful response
+    if response.status_code == 200:
+        # Extract and decode the first generated image
+        result = response.json()
+        if "artifacts" in result and len(result["artifacts"]) > 0:
+            return base64.b64decode(result["artifacts"][0]["base64"])
+        else:
+            raise APICenterError("No images returned by Stability AI API", provider="stability")
+    else:
+        # Handle error response
+        error_message = f"Stability AI API error: {response.status_code}"
+        try:
+            error_details = response.json()
+            error_message = f"{error_message} - {error_details.get('message', 'Unknown error')}"
+
+            # The error name (e.g. invalid_prompts) identifies filtered prompts
+            if error_details.get("name"):
+                error_message = f"{error_message} ({error_details['name']})"
+        except Exception:
+            error_message = f"{error_message} - {response.text}"
+
+        raise error_from_status(
+            "stability", error_message, response.status_code, response.headers, response
+        )
+
+
+def call_stability(
+    model: str,
+    prompt: str,
+    credentials: Dict[str, Any],
+    session: Optional[HTTPSession] = None,
+    **kwargs: Any,
+) -> bytes:
     """Handle image generation requests through Stability AI's API."""
     try:
-        # Verify API key is present
-        api_key = credentials.get("api_key")
-        if not api_key:
-            raise ValueError("Missing Stability AI API key")
-
-        # Determine appropriate API endpoint based on model
-        if model.startswith("stable-diffusion-xl") or model.startswith("sdxl"):
-            # SDXL models
-            base_url = (
-                "https://api.stability.ai/v1/generation/stable-diffusion-xl-1024-v1-0/text-to-image"
-            )
-        elif model == "stable-diffusion-v1-6":
-            base_url = "https://api.stability.ai/v1/generation/stable-diffusion-v1-6/text-to-image"
-        else:
-            # Use generic endpoint for other models
-            base_url = f"https://api.stability.ai/v1/generation/{model}/text-to-image"
-
-        # Set up request headers
-        accept_header = "application/json"
-        if "accept" in kwargs:
-            accept_header = kwargs.pop("accept")
-
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Accept": accept_header,
-            "Content-Type": "application/json",
-        }
-
-        # Configure generation parameters with defaults
-        data = {
-            "text_prompts": [{"text": prompt}],
-            "height": kwargs.pop("height", 1024),
-            "width": kwargs.pop("width", 1024),
-            "cfg_scale": kwargs.pop("cfg_scale", 7.0),
-            "steps": kwargs.pop("steps", 30),
-            "samples": kwargs.pop("samples", 1),
-        }
-
-        # Add negative prompt if provided
-        if "negative_prompt" in kwargs:
-            data["text_prompts"].append({"text": kwargs.pop("negative_prompt"), "weight": -1.0})
-
-        # Include any remaining parameters
-        for key, value in kwargs.items():
-            data[key] = value
-
-        # Make API request to generate image
-        response = requests.post(base_url, headers=headers, json=data)
-
-        # Handle successful response
-        if response.status_code == 200:
-            # Extract and decode the first generated image
-            result = response.json()
-            if "artifacts" in result and len(result["artifacts"]) > 0:
-                return base64.b64decode(result["artifacts"][0]["base64"])
-            else:
-                raise ValueError("No images returned by Stability AI API")
+        timeout = kwargs.pop("timeout", None)
+        url, headers, data = build_request(model, prompt, credentials, **kwargs)
+
+        # Make API request over the shared keep-alive session
+        if session is None:
+            session = get_session()
+        response = session.post(
+            url, headers=headers, json=data, timeout=session.request_timeout(timeout)
+        )
+
+        return parse_response(response)
+    except Exception as e:
+        raise translate_error("stability", e, "Stability AI API error") from e
+
+
+async def acall_stability(
+    model: str,
+    prompt: str,
+    credentials: Dict[str, Any],
+    client: Optional[httpx.AsyncClient] = None,
+    **kwargs: Any,
+) -> bytes:
+    """Handle image generation requests through Stability AI's API without blocking."""
+    try:
+        timeout = get_session().async_timeout(kwargs.pop("timeout", None))
+        url, headers, data = build_request(model, prompt, credentials, **kwargs)
+
+        # Make API request over a pooled async client, or a one-off client if none is given
+        if client is None:
+            async with create_async_client(credentials) as one_off:
+                response = await one_off.post(url, headers=headers, json=data, timeout=timeout)
         else:
-            # Handle error response
-            error_message = f"Stability AI API error: {response.status_code}"
-            try:
-                error_details = response.json()
-                error_message = f"{error_message} - {error_details.get('message', 'Unknown error')}"
-            except Exception as json_error:
-                error_message = f"{error_message} - {response.text}"
-
-            raise ValueError(error_message)
+            response = await client.post(url, headers=headers, json=data, timeout=timeout)
+
+        return parse_response(response)
+    except Exception as e:
+        raise translate_error("stability", e, "Stability AI API error") from e
+
+
+def is_json(response: Any) -> bool:
+    """Return True if the response body is a JSON document rather than raw image bytes."""
+    return "json" in response.headers.get("content-type", "")
+
+
+def stream_stability(
+    model: str,
+    prompt: str,
+    credentials: Dict[str, Any],
+    session: Optional[HTTPSession] = None,
+    chunk_size: int = CHUNK_SIZE,
+    **kwargs: Any,
+) -> Iterator[bytes]:
+    """Yield the generated image in chunks as it is read from the connection.
+
+    Raw PNG output is requested so the image is never held in memory as base64.
+    """
+    try:
+        kwargs.setdefault("accept", "image/png")
+        timeout = kwargs.pop("timeout", None)
+        url, headers, data = build_request(model, prompt, credentials, **kwargs)
+
+        if session is None:
+            session = get_session()
+        with session.post(
+            url, headers=headers, json=data, stream=True, timeout=session.request_timeout(timeout)
+        ) as response:
+            # Errors and explicitly requested JSON bodies are decoded in one piece
+            if response.status_code != 200 or is_json(response):
+                yield parse_response(response)
+                return
+
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    yield chunk
+    except Exception as e:
+        raise translate_error("stability", e, "Stability AI API error") from e
+
+
+async def astream_stability(
+    model: str,
+    prompt: str,
+    credentials: Dict[str, Any],
+    client: Optional[httpx.AsyncClient] = None,
+    chunk_size: int = CHUNK_SIZE,
+    **kwargs: Any,
+) -> AsyncIterator[bytes]:
+    """Asynchronously yield the generated image in chunks as it is read."""
+    try:
+        kwargs.setdefault("accept", "image/png")
+        timeout = get_session().async_timeout(kwargs.pop("timeout", None))
+        url, headers, data = build_request(model, prompt, credentials, **kwargs)
+
+        # Fall back to a one-off client when no pooled client is given
+        one_off = None
+        if client is None:
+            client = one_off = create_async_client(credentials)
+        try:
+            async with client.stream(
+                "POST", url, headers=headers, json=data, timeout=timeout
+            ) as response:
+                # Errors and explicitly requested JSON bodies are decoded in one piece
+                if response.status_code != 200 or is_json(response):
+                    await response.aread()
+                    yield parse_response(response)
+                    return
+
+                async for chunk in response.aiter_bytes(chunk_size):
+                    if chunk:
+                        yield chunk
+        finally:
+            if one_off is not None:
+                await one_off.aclose()
     except Exception as e:
-        if isinstance(e, ValueError):
-            raise
-        raise ValueError(f"Stability AI API error: {str(e)}")
+        raise translate_error("stability", e, "Stability AI API error") from e
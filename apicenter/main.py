@@ -0,0 +1,60 @@
+"""Command-line entry point for APICenter maintenance tasks."""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from .core.disk_cache import DiskCache, default_cache_path
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the apicenter command."""
+    parser = argparse.ArgumentParser(prog="apicenter", description="APICenter utilities")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Cache maintenance commands
+    cache = commands.add_parser("cache", help="Inspect or prune the on-disk response cache")
+    cache_commands = cache.add_subparsers(dest="action", required=True)
+
+    stats = cache_commands.add_parser("stats", help="Show cache size and entry counts")
+    prune = cache_commands.add_parser("prune", help="Remove expired and excess entries")
+    for sub in (stats, prune):
+        sub.add_argument(
+            "--path",
+            default=None,
+            help=f"Cache database (default: $APICENTER_CACHE_PATH or {default_cache_path()})",
+        )
+    prune.add_argument("--max-bytes", type=int, default=None, help="Evict down to this size")
+    prune.add_argument("--vacuum", action="store_true", help="Compact the database afterwards")
+    return parser
+
+
+def cache_command(args: argparse.Namespace) -> int:
+    """Run a cache maintenance action and print its results."""
+    cache = DiskCache(path=args.path, max_bytes=None)
+    try:
+        if args.action == "stats":
+            results = cache.stats()
+            for counter in ("hits", "misses", "evictions", "hit_rate"):
+                # Lookup counters are per process and meaningless here
+                results.pop(counter)
+        else:
+            results = cache.prune(max_bytes=args.max_bytes, vacuum=args.vacuum)
+    finally:
+        cache.close()
+
+    for name, value in results.items():
+        print(f"{name}: {value}")
+    return 0
+
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    """Parse command-line arguments and dispatch to the requested command."""
+    args = build_parser().parse_args(argv)
+    if args.command == "cache":
+        return cache_command(args)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
@@ -1,47 +1,179 @@
 """Anthropic text generation provider implementation."""
 
-from anthropic import Anthropic
-from typing import Dict, Any, Union, List
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
+from anthropic import Anthropic, AsyncAnthropic
 
-def call_anthropic(model: str, prompt: Any, credentials: Dict[str, Any], **kwargs: Any) -> str:
+from apicenter.core.errors import translate_error
+from apicenter.core.metrics import report_usage
+from apicenter.core.streaming import StreamEvent, StreamSummary, TextDelta, make_usage
+
+
+def create_client(credentials: Dict[str, Any]) -> Anthropic:
+    """Create an Anthropic client from a credentials dictionary."""
+    return Anthropic(**{"max_retries": 0, **credentials})
+
+
+def create_async_client(credentials: Dict[str, Any]) -> AsyncAnthropic:
+    """Create an asynchronous Anthropic client from a credentials dictionary."""
+    return AsyncAnthropic(**{"max_retries": 0, **credentials})
+
+
+def build_params(model: str, prompt: Any, **kwargs: Any) -> Dict[str, Any]:
+    """Build Messages API parameters from a prompt and generation options."""
+    # Set default max_tokens if not provided
+    max_tokens = kwargs.pop("max_tokens", 4096)
+
+    # Process input prompt format
+    system_prompt = None
+    if isinstance(prompt, str):
+        # Create a simple user message if prompt is a string
+        messages = [{"role": "user", "content": prompt}]
+    else:
+        # Extract system message and keep other messages
+        messages = []
+        for msg in prompt:
+            if msg.get("role") == "system":
+                system_prompt = msg.get("content")
+            else:
+                messages.append(msg)
+
+        # Add default user message if only system message was provided
+        if not messages:
+            messages = [{"role": "user", "content": "Hello"}]
+
+    # Build API parameters
+    api_params = {"model": model, "messages": messages, "max_tokens": max_tokens, **kwargs}
+
+    # Add system parameter if present (Anthropic needs it separated)
+    if system_prompt:
+        api_params["system"] = system_prompt
+
+    return api_params
+
+
+def call_anthropic(
+    model: str,
+    prompt: Any,
+    credentials: Dict[str, Any],
+    client: Optional[Anthropic] = None,
+    **kwargs: Any,
+) -> str:
     """Handle text generation requests through Anthropic's Claude API."""
     try:
-        # Initialize Anthropic client
-        client = Anthropic(api_key=credentials["api_key"])
-
-        # Set default max_tokens if not provided
-        max_tokens = kwargs.pop("max_tokens", 4096)
-
-        # Process input prompt format
-        system_prompt = None
-        if isinstance(prompt, str):
-            # Create a simple user message if prompt is a string
-            messages = [{"role": "user", "content": prompt}]
-        else:
-            # Extract system message and keep other messages
-            messages = []
-            for msg in prompt:
-                if msg.get("role") == "system":
-                    system_prompt = msg.get("content")
-                else:
-                    messages.append(msg)
-
-            # Add default user message if only system message was provided
-            if not messages:
-                messages = [{"role": "user", "content": "Hello"}]
-
-        # Build API parameters
-        api_params = {"model": model, "messages": messages, "max_tokens": max_tokens, **kwargs}
-
-        # Add system parameter if present (Anthropic needs it separated)
-        if system_prompt:
-            api_params["system"] = system_prompt
+        # Reuse the supplied client or initialize one with credentials
+        if client is None:
+            client = create_client(credentials)
+
+        # Make API request
+        response = client.messages.create(**build_params(model, prompt, **kwargs))
+
+        # Report token counts, then extract and return generated text
+        usage = getattr(response, "usage", None)
+        report_usage(getattr(usage, "input_tokens", None), getattr(usage, "output_tokens", None))
+        return response.content[0].text
+    except Exception as e:
+        raise translate_error("anthropic", e, "Anthropic API error") from e
+
+
+async def acall_anthropic(
+    model: str,
+    prompt: Any,
+    credentials: Dict[str, Any],
+    client: Optional[AsyncAnthropic] = None,
+    **kwargs: Any,
+) -> str:
+    """Handle text generation requests through Anthropic's API without blocking the event loop."""
+    try:
+        # Reuse the supplied client or initialize one with credentials
+        if client is None:
+            client = create_async_client(credentials)
 
         # Make API request
-        response = client.messages.create(**api_params)
+        response = await client.messages.create(**build_params(model, prompt, **kwargs))
 
-        # Extract and return generated text
+        # Report token counts, then extract and return generated text
+        usage = getattr(response, "usage", None)
+        report_usage(getattr(usage, "input_tokens", None), getattr(usage, "output_tokens", None))
         return response.content[0].text
     except Exception as e:
-        raise ValueError(f"Anthropic API error: {str(e)}")
+        raise translate_error("anthropic", e, "Anthropic API error") from e
+
+
+class _StreamState:
+    """Accumulates text, stop reason and usage from Anthropic stream events."""
+
+    def __init__(self) -> None:
+        """Start with no text and no usage."""
+        self.parts: List[str] = []
+        self.stop_reason: Optional[str] = None
+        self.input_tokens: Optional[int] = None
+        self.output_tokens: Optional[int] = None
+
+    def consume(self, event: Any) -> Optional[str]:
+        """Record an event and return its text delta, if any."""
+        if event.type == "message_start":
+            self.input_tokens = event.message.usage.input_tokens
+        elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+            self.parts.append(event.delta.text)
+            return event.delta.text
+        elif event.type == "message_delta":
+            self.stop_reason = event.delta.stop_reason or self.stop_reason
+            self.output_tokens = event.usage.output_tokens
+        return None
+
+    def summary(self, model: str) -> StreamSummary:
+        """Build the final summary event."""
+        usage = make_usage(self.input_tokens, self.output_tokens)
+        return StreamSummary("".join(self.parts), self.stop_reason, usage, "anthropic", model)
+
+
+def stream_anthropic(
+    model: str,
+    prompt: Any,
+    credentials: Dict[str, Any],
+    client: Optional[Anthropic] = None,
+    **kwargs: Any,
+) -> Iterator[StreamEvent]:
+    """Stream text deltas from Anthropic, ending with a summary event."""
+    try:
+        # Reuse the supplied client or initialize one with credentials
+        if client is None:
+            client = create_client(credentials)
+
+        state = _StreamState()
+        kwargs["stream"] = True
+        for event in client.messages.create(**build_params(model, prompt, **kwargs)):
+            text = state.consume(event)
+            if text:
+                yield TextDelta(text)
+
+        yield state.summary(model)
+    except Exception as e:
+        raise translate_error("anthropic", e, "Anthropic API error") from e
+
+
+async def astream_anthropic(
+    model: str,
+    prompt: Any,
+    credentials: Dict[str, Any],
+    client: Optional[AsyncAnthropic] = None,
+    **kwargs: Any,
+) -> AsyncIterator[StreamEvent]:
+    """Stream text deltas from Anthropic asynchronously, ending with a summary event."""
+    try:
+        # Reuse the supplied client or initialize one with credentials
+        if client is None:
+            client = create_async_client(credentials)
+
+        state = _StreamState()
+        kwargs["stream"] = True
+        stream = await client.messages.create(**build_params(model, prompt, **kwargs))
+        async for event in stream:
+            text = state.consume(event)
+            if text:
+                yield TextDelta(text)
+
+        yield state.summary(model)
+    except Exception as e:
+        raise translate_error("anthropic", e, "Anthropic API error") from e
@@ -1,13 +1,49 @@
+"""Deepseek text generation provider implementation."""
+
+from typing import Any, Dict, List, Optional
+
 from openai import OpenAI
 
+from apicenter.core.errors import translate_error
+from apicenter.core.metrics import report_usage
+
+# Deepseek serves an OpenAI-compatible API at its own endpoint
+DEFAULT_BASE_URL = "https://api.deepseek.com"
+
+
+def create_client(credentials: Dict[str, Any]) -> OpenAI:
+    """Create an OpenAI-compatible client for Deepseek."""
+    return OpenAI(**{"base_url": DEFAULT_BASE_URL, "max_retries": 0, **credentials})
 
-def call_deepseek(model, prompt, credentials, **kwargs):
+
+def build_messages(prompt: Any) -> List[Dict[str, Any]]:
+    """Format a prompt as a chat message list."""
+    if isinstance(prompt, str):
+        return [{"role": "user", "content": prompt}]
+    return prompt
+
+
+def call_deepseek(
+    model: str,
+    prompt: Any,
+    credentials: Dict[str, Any],
+    client: Optional[OpenAI] = None,
+    **kwargs: Any,
+) -> str:
     """Deepseek provider implementation."""
-    client = OpenAI(**credentials)
-
-    response = client.chat.completions.create(
-        model=model,
-        messages=prompt,
-        **kwargs,
-    )
-    return response.choices[0].message.content
+    if client is None:
+        client = create_client(credentials)
+
+    try:
+        response = client.chat.completions.create(
+            model=model,
+            messages=build_messages(prompt),
+            **kwargs,
+        )
+        usage = getattr(response, "usage", None)
+        report_usage(
+            getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None)
+        )
+        return response.choices[0].message.content
+    except Exception as e:
+        raise translate_error("deepseek", e, "Deepseek API error") from e
@@ -1,80 +1,293 @@
 """Ollama local model text generation provider implementation."""
 
-import ollama
-from typing import Dict, Any, List, Union
 import os
+from collections.abc import AsyncIterator as AsyncIteratorABC
+from collections.abc import Iterator as IteratorABC
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+import ollama
+
+from apicenter.core.errors import translate_error
+from apicenter.core.metrics import report_usage
+from apicenter.core.streaming import StreamEvent, StreamSummary, TextDelta, make_usage
+
+
+def get_host(credentials: Optional[Dict[str, Any]] = None) -> str:
+    """Return the Ollama host from credentials, the environment or the default."""
+    credentials = credentials or {}
+    return (
+        credentials.get("base_url")
+        or credentials.get("host")
+        or os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+    )
+
+
+def ollama_hint(model: str) -> str:
+    """Return the troubleshooting hint appended to Ollama errors."""
+    return f"\nMake sure Ollama is running and you've pulled the model with 'ollama pull {model}'."
+
+
+# Timeout for the Ollama requests sent from the current context, if any
+_request_timeout: ContextVar[Optional[float]] = ContextVar("ollama_request_timeout", default=None)
+
+# Marks the end of a stream when reading its first part
+_END = object()
+
+
+@contextmanager
+def request_timeout(timeout: Optional[float]) -> Iterator[None]:
+    """Apply a timeout to the Ollama requests sent inside the block."""
+    token = _request_timeout.set(timeout)
+    try:
+        yield
+    finally:
+        _request_timeout.reset(token)
+
+
+def apply_request_timeout(request: httpx.Request) -> None:
+    """Give an outgoing request the timeout set by request_timeout(), if any."""
+    # The Ollama SDK has no per-call timeout, but httpx reads it from the request itself
+    timeout = _request_timeout.get()
+    if timeout is not None:
+        request.extensions["timeout"] = httpx.Timeout(timeout).as_dict()
+
+
+async def aapply_request_timeout(request: httpx.Request) -> None:
+    """Async client hook for apply_request_timeout()."""
+    apply_request_timeout(request)
+
+
+def create_client(credentials: Dict[str, Any]) -> ollama.Client:
+    """Create an Ollama client for the configured host that honours per-call timeouts."""
+    return ollama.Client(
+        host=get_host(credentials), event_hooks={"request": [apply_request_timeout]}
+    )
+
+
+def create_async_client(credentials: Dict[str, Any]) -> ollama.AsyncClient:
+    """Create an asynchronous Ollama client for the configured host."""
+    return ollama.AsyncClient(
+        host=get_host(credentials), event_hooks={"request": [aapply_request_timeout]}
+    )
+
+
+def build_params(model: str, prompt: Any, **kwargs: Any) -> Dict[str, Any]:
+    """Build chat API parameters, separating chat options from model options."""
+    # Process input based on format
+    if isinstance(prompt, str):
+        # Simple string prompt becomes a user message
+        messages = [{"role": "user", "content": prompt}]
+    elif isinstance(prompt, list):
+        # Handle message list format with special system prompt handling
+        messages = []
+        system_content = None
+
+        # Extract system messages since not all models support them directly
+        for msg in prompt:
+            if msg.get("role") == "system":
+                system_content = msg.get("content")
+            else:
+                messages.append(msg)
+
+        # Add default message if only system prompt was provided
+        if system_content and not messages:
+            messages = [{"role": "user", "content": "Hello"}]
+
+        # Incorporate system message into first user message for compatibility
+        if system_content and messages and messages[0].get("role") == "user":
+            user_msg = messages[0]
+            user_msg["content"] = f"[System: {system_content}]\n\n{user_msg['content']}"
+    else:
+        raise ValueError("Prompt must be a string or a list of message dictionaries")
+
+    # Separate parameters for direct chat API vs. model options
+    chat_params = {}
+    model_options = {}
+
+    # Extract core chat parameters
+    if "stream" in kwargs:
+        chat_params["stream"] = kwargs.pop("stream")
+    if "format" in kwargs:
+        chat_params["format"] = kwargs.pop("format")
+    if "keep_alive" in kwargs:
+        chat_params["keep_alive"] = kwargs.pop("keep_alive")
+    if "tools" in kwargs:
+        chat_params["tools"] = kwargs.pop("tools")
+
+    # All remaining parameters become model options
+    if kwargs:
+        model_options = kwargs
+
+    # Build API parameters
+    api_params = {
+        "model": model,
+        "messages": messages,
+    }
+
+    # Add model options if provided
+    if model_options:
+        api_params["options"] = model_options
+
+    # Add chat-specific parameters
+    api_params.update(chat_params)
+    return api_params
+
+
+def read_response(response: Any) -> str:
+    """Return the generated text from a chat response or a stream of partial messages."""
+    # With stream=True Ollama returns a generator of partial messages
+    if isinstance(response, IteratorABC):
+        return "".join(part["message"]["content"] for part in response)
 
+    # Report token counts, then extract and return generated text
+    report_usage(response.get("prompt_eval_count"), response.get("eval_count"))
+    return response["message"]["content"]
 
-def call_ollama(model: str, prompt: Any, **kwargs: Any) -> str:
+
+def call_ollama(
+    model: str, prompt: Any, client: Optional[ollama.Client] = None, **kwargs: Any
+) -> str:
     """Handle text generation requests through locally running Ollama models."""
     try:
-        # Configure Ollama host from environment or use default
-        ollama_host = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
-
-        # Process input based on format
-        if isinstance(prompt, str):
-            # Simple string prompt becomes a user message
-            messages = [{"role": "user", "content": prompt}]
-        elif isinstance(prompt, list):
-            # Handle message list format with special system prompt handling
-            messages = []
-            system_content = None
-
-            # Extract system messages since not all models support them directly
-            for msg in prompt:
-                if msg.get("role") == "system":
-                    system_content = msg.get("content")
-                else:
-                    messages.append(msg)
-
-            # Add default message if only system prompt was provided
-            if system_content and not messages:
-                messages = [{"role": "user", "content": "Hello"}]
-
-            # Incorporate system message into first user message for compatibility
-            if system_content and messages and messages[0].get("role") == "user":
-                user_msg = messages[0]
-                user_msg["content"] = f"[System: {system_content}]\n\n{user_msg['content']}"
-        else:
-            raise ValueError("Prompt must be a string or a list of message dictionaries")
-
-        # Separate parameters for direct chat API vs. model options
-        chat_params = {}
-        model_options = {}
-
-        # Extract core chat parameters
-        if "stream" in kwargs:
-            chat_params["stream"] = kwargs.pop("stream")
-        if "format" in kwargs:
-            chat_params["format"] = kwargs.pop("format")
-        if "keep_alive" in kwargs:
-            chat_params["keep_alive"] = kwargs.pop("keep_alive")
-        if "tools" in kwargs:
-            chat_params["tools"] = kwargs.pop("tools")
-
-        # All remaining parameters become model options
-        if kwargs:
-            model_options = kwargs
-
-        # Build API parameters
-        api_params = {
-            "model": model,
-            "messages": messages,
-        }
-
-        # Add model options if provided
-        if model_options:
-            api_params["options"] = model_options
-
-        # Add chat-specific parameters
-        api_params.update(chat_params)
+        timeout = kwargs.pop("timeout", None)
+        params = build_params(model, prompt, **kwargs)
+
+        # Without a client, use the module-level one unless a timeout needs a client of ours
+        if client is None and timeout is None:
+            return read_response(ollama.chat(**params))
 
         # Make API call to local Ollama instance
-        response = ollama.chat(**api_params)
+        with nullcontext(client) if client is not None else create_client({}) as chat_client:
+            with request_timeout(timeout):
+                return read_response(chat_client.chat(**params))
+    except Exception as e:
+        raise translate_error("ollama", e, "Ollama API error", ollama_hint(model)) from e
+
+
+async def aread_response(response: Any) -> str:
+    """Return the generated text from an async chat response or stream."""
+    # With stream=True Ollama returns an async generator of partial messages
+    if isinstance(response, AsyncIteratorABC):
+        return "".join([part["message"]["content"] async for part in response])
+
+    # Report token counts, then extract and return generated text
+    report_usage(response.get("prompt_eval_count"), response.get("eval_count"))
+    return response["message"]["content"]
+
+
+async def acall_ollama(
+    model: str, prompt: Any, client: Optional[ollama.AsyncClient] = None, **kwargs: Any
+) -> str:
+    """Handle text generation requests through Ollama without blocking the event loop."""
+    try:
+        timeout = kwargs.pop("timeout", None)
+        params = build_params(model, prompt, **kwargs)
+
+        # Reuse the supplied client or connect to the configured host
+        if client is None:
+            client = create_async_client({})
+
+        # Make API call to local Ollama instance
+        with request_timeout(timeout):
+            return await aread_response(await client.chat(**params))
+    except Exception as e:
+        raise translate_error("ollama", e, "Ollama API error", ollama_hint(model)) from e
+
+
+class _StreamState:
+    """Accumulates text, done reason and token counts from Ollama stream parts."""
+
+    def __init__(self) -> None:
+        """Start with no text and no usage."""
+        self.parts: List[str] = []
+        self.done_reason: Optional[str] = None
+        self.usage: Dict[str, int] = {}
+
+    def consume(self, part: Any) -> str:
+        """Record a partial response and return its text."""
+        text = part["message"]["content"] or ""
+        self.parts.append(text)
+
+        # The final part carries the stop reason and token counts
+        if part.get("done"):
+            self.done_reason = part.get("done_reason")
+            self.usage = make_usage(part.get("prompt_eval_count"), part.get("eval_count"))
+        return text
+
+    def summary(self, model: str) -> StreamSummary:
+        """Build the final summary event."""
+        return StreamSummary("".join(self.parts), self.done_reason, self.usage, "ollama", model)
+
+
+def start_stream(parts: Iterable[Any], timeout: Optional[float]) -> Iterator[Any]:
+    """Iterate over a stream, applying the timeout to the request sent for its first part."""
+    parts = iter(parts)
+    with request_timeout(timeout):
+        first = next(parts, _END)
+    if first is not _END:
+        yield first
+        yield from parts
+
+
+async def astart_stream(parts: Any, timeout: Optional[float]) -> AsyncIterator[Any]:
+    """Async version of start_stream()."""
+    with request_timeout(timeout):
+        first = await anext(parts, _END)
+    if first is not _END:
+        yield first
+        async for part in parts:
+            yield part
+
+
+def stream_ollama(
+    model: str, prompt: Any, client: Optional[ollama.Client] = None, **kwargs: Any
+) -> Iterator[StreamEvent]:
+    """Stream text deltas from a local Ollama model, ending with a summary event."""
+    one_off = None
+    try:
+        # Without a client, use the module-level one unless a timeout needs a client of ours
+        timeout = kwargs.pop("timeout", None)
+        if client is None and timeout is not None:
+            client = one_off = create_client({})
+        chat = client.chat if client is not None else ollama.chat
+
+        state = _StreamState()
+        kwargs["stream"] = True
+        for part in start_stream(chat(**build_params(model, prompt, **kwargs)), timeout):
+            text = state.consume(part)
+            if text:
+                yield TextDelta(text)
+
+        yield state.summary(model)
+    except Exception as e:
+        raise translate_error("ollama", e, "Ollama API error", ollama_hint(model)) from e
+    finally:
+        if one_off is not None:
+            one_off.close()
+
+
+async def astream_ollama(
+    model: str, prompt: Any, client: Optional[ollama.AsyncClient] = None, **kwargs: Any
+) -> AsyncIterator[StreamEvent]:
+    """Stream text deltas from a local Ollama model asynchronously."""
+    try:
+        timeout = kwargs.pop("timeout", None)
+
+        # Reuse the supplied client or connect to the configured host
+        if client is None:
+            client = create_async_client({})
+
+        state = _StreamState()
+        kwargs["stream"] = True
+        parts = await client.chat(**build_params(model, prompt, **kwargs))
+        async for part in astart_stream(parts, timeout):
+            text = state.consume(part)
+            if text:
+                yield TextDelta(text)
 
-        # Extract and return generated text
-        return response["message"]["content"]
+        yield state.summary(model)
     except Exception as e:
-        raise ValueError(
-            f"Ollama API error: {str(e)}\nMake sure Ollama is running and you've pulled the model with 'ollama pull {model}'."
-        )
+        raise translate_error("ollama", e, "Ollama API error", ollama_hint(model)) from e
@@ -1,25 +1,159 @@
 """OpenAI text generation provider implementation."""
 
-from openai import OpenAI
-from typing import Dict, Any, Union, List
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
+from openai import AsyncOpenAI, OpenAI
 
-def call_openai(model: str, prompt: Any, credentials: Dict[str, Any], **kwargs: Any) -> str:
+from apicenter.core.errors import translate_error
+from apicenter.core.metrics import report_usage
+from apicenter.core.streaming import StreamEvent, StreamSummary, TextDelta, make_usage
+
+
+def create_client(credentials: Dict[str, Any]) -> OpenAI:
+    """Create an OpenAI client from a credentials dictionary."""
+    return OpenAI(**{"max_retries": 0, **credentials})
+
+
+def create_async_client(credentials: Dict[str, Any]) -> AsyncOpenAI:
+    """Create an asynchronous OpenAI client from a credentials dictionary."""
+    return AsyncOpenAI(**{"max_retries": 0, **credentials})
+
+
+def build_messages(prompt: Any) -> List[Dict[str, Any]]:
+    """Format a prompt as a chat message list."""
+    # Format prompt as messages if it's a simple string
+    if isinstance(prompt, str):
+        return [{"role": "user", "content": prompt}]
+    return prompt
+
+
+def call_openai(
+    model: str,
+    prompt: Any,
+    credentials: Dict[str, Any],
+    client: Optional[OpenAI] = None,
+    **kwargs: Any,
+) -> str:
     """Handle text generation requests through OpenAI's API."""
     try:
-        # Format prompt as messages if it's a simple string
-        if isinstance(prompt, str):
-            messages = [{"role": "user", "content": prompt}]
-        else:
-            messages = prompt
+        messages = build_messages(prompt)
 
-        # Initialize OpenAI client with credentials
-        client = OpenAI(**credentials)
+        # Reuse the supplied client or initialize one with credentials
+        if client is None:
+            client = create_client(credentials)
 
         # Make API request
         response = client.chat.completions.create(model=model, messages=messages, **kwargs)
 
-        # Extract and return the generated text
+        # Report token counts, then extract and return the generated text
+        usage = getattr(response, "usage", None)
+        report_usage(
+            getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None)
+        )
+        return response.choices[0].message.content
+    except Exception as e:
+        raise translate_error("openai", e, "OpenAI API error") from e
+
+
+async def acall_openai(
+    model: str,
+    prompt: Any,
+    credentials: Dict[str, Any],
+    client: Optional[AsyncOpenAI] = None,
+    **kwargs: Any,
+) -> str:
+    """Handle text generation requests through OpenAI's API without blocking the event loop."""
+    try:
+        messages = build_messages(prompt)
+
+        # Reuse the supplied client or initialize one with credentials
+        if client is None:
+            client = create_async_client(credentials)
+
+        # Make API request
+        response = await client.chat.completions.create(model=model, messages=messages, **kwargs)
+
+        # Report token counts, then extract and return the generated text
+        usage = getattr(response, "usage", None)
+        report_usage(
+            getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None)
+        )
         return response.choices[0].message.content
     except Exception as e:
-        raise ValueError(f"OpenAI API error: {str(e)}")
+        raise translate_error("openai", e, "OpenAI API error") from e
+
+
+def build_stream_params(model: str, prompt: Any, **kwargs: Any) -> Dict[str, Any]:
+    """Build streaming request parameters, asking for usage in the final chunk."""
+    kwargs["stream"] = True
+    kwargs.setdefault("stream_options", {"include_usage": True})
+    return {"model": model, "messages": build_messages(prompt), **kwargs}
+
+
+def stream_openai(
+    model: str,
+    prompt: Any,
+    credentials: Dict[str, Any],
+    client: Optional[OpenAI] = None,
+    **kwargs: Any,
+) -> Iterator[StreamEvent]:
+    """Stream text deltas from OpenAI, ending with a summary event."""
+    try:
+        # Reuse the supplied client or initialize one with credentials
+        if client is None:
+            client = create_client(credentials)
+
+        parts: List[str] = []
+        finish_reason = None
+        usage: Dict[str, int] = {}
+
+        for chunk in client.chat.completions.create(**build_stream_params(model, prompt, **kwargs)):
+            # The usage-only chunk at the end of the stream has no choices
+            if chunk.choices:
+                choice = chunk.choices[0]
+                if choice.delta.content:
+                    parts.append(choice.delta.content)
+                    yield TextDelta(choice.delta.content)
+                finish_reason = choice.finish_reason or finish_reason
+            if getattr(chunk, "usage", None):
+                usage = make_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+
+        yield StreamSummary("".join(parts), finish_reason, usage, "openai", model)
+    except Exception as e:
+        raise translate_error("openai", e, "OpenAI API error") from e
+
+
+async def astream_openai(
+    model: str,
+    prompt: Any,
+    credentials: Dict[str, Any],
+    client: Optional[AsyncOpenAI] = None,
+    **kwargs: Any,
+) -> AsyncIterator[StreamEvent]:
+    """Stream text deltas from OpenAI asynchronously, ending with a summary event."""
+    try:
+        # Reuse the supplied client or initialize one with credentials
+        if client is None:
+            client = create_async_client(credentials)
+
+        parts: List[str] = []
+        finish_reason = None
+        usage: Dict[str, int] = {}
+
+        stream = await client.chat.completions.create(
+            **build_stream_params(model, prompt, **kwargs)
+        )
+        async for chunk in stream:
+            # The usage-only chunk at the end of the stream has no choices
+            if chunk.choices:
+                choice = chunk.choices[0]
+                if choice.delta.content:
+                    parts.append(choice.delta.content)
+                    yield TextDelta(choice.delta.content)
+                finish_reason = choice.finish_reason or finish_reason
+            if getattr(chunk, "usage", None):
+                usage = make_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+
+        yield StreamSummary("".join(parts), finish_reason, usage, "openai", model)
+    except Exception as e:
+        raise translate_error("openai", e, "OpenAI API error") from e
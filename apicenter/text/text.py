@@ -1,44 +1,127 @@
 """Text generation provider implementations for various AI services."""
 
-from apicenter.core.credentials import credentials
-from .providers.openai import call_openai
-from .providers.anthropic import call_anthropic
-from .providers.ollama import call_ollama
-from .providers.deepseek import call_deepseek
-from typing import Any, Dict, Optional, Union, List, Callable
-import openai
-from anthropic import Anthropic
-import ollama
-from ..core.base import BaseProvider, ProviderConfig
+from typing import Any, AsyncIterator, Dict, Iterator
+
+from ..core.base import BaseProvider
+from ..core.errors import APICenterError
+from ..core.lazy import LazyProviders
+from ..core.streaming import StreamEvent
+
+# Provider modules import their SDKs, so each is only imported when first used
+providers = LazyProviders(
+    globals(),
+    {
+        "openai": (
+            "apicenter.text.providers.openai",
+            {
+                "call_openai": "call_openai",
+                "acall_openai": "acall_openai",
+                "stream_openai": "stream_openai",
+                "astream_openai": "astream_openai",
+                "create_openai_client": "create_client",
+                "create_async_openai_client": "create_async_client",
+            },
+        ),
+        "anthropic": (
+            "apicenter.text.providers.anthropic",
+            {
+                "call_anthropic": "call_anthropic",
+                "acall_anthropic": "acall_anthropic",
+                "stream_anthropic": "stream_anthropic",
+                "astream_anthropic": "astream_anthropic",
+                "create_anthropic_client": "create_client",
+                "create_async_anthropic_client": "create_async_client",
+            },
+        ),
+        "ollama": (
+            "apicenter.text.providers.ollama",
+            {
+                "call_ollama": "call_ollama",
+                "acall_ollama": "acall_ollama",
+                "stream_ollama": "stream_ollama",
+                "astream_ollama": "astream_ollama",
+                "create_ollama_client": "create_client",
+                "create_async_ollama_client": "create_async_client",
+            },
+        ),
+        "deepseek": (
+            "apicenter.text.providers.deepseek",
+            {"call_deepseek": "call_deepseek", "create_deepseek_client": "create_client"},
+        ),
+    },
+)
+
+
+def __getattr__(name: str) -> Any:
+    """Import provider functions on first access, e.g. when a test patches them."""
+    return providers.resolve(name)
 
 
 class TextProvider(BaseProvider[str]):
     """Provider for text generation across multiple AI services."""
 
+    def __init__(self, provider: str, model: str, prompt: Any, **kwargs: Any) -> None:
+        """Initialize the provider, importing its implementation on first use."""
+        providers.load(provider)
+        super().__init__(provider, model, prompt, **kwargs)
+
     def get_mode(self) -> str:
         """Return the mode identifier for this provider."""
         return "text"
 
     def call(self) -> str:
         """Route the request to the appropriate provider implementation."""
-        # Map each provider to its implementation method
-        provider_methods = {
-            "openai": self.call_openai,
-            "anthropic": self.call_anthropic,
-            "ollama": self.call_ollama,
-        }
+        # Look up the provider's implementation method, e.g. call_openai
+        method = self.provider_method("call")
 
         try:
-            # Call the appropriate provider method if supported
-            if self.provider in provider_methods:
-                return provider_methods[self.provider]()
+            # Call the provider method if supported
+            if method is not None:
+                return method()
             else:
                 raise ValueError(f"Unsupported text provider: {self.provider}")
+        except APICenterError:
+            raise
         except Exception as e:
             raise ValueError(f"Error calling {self.provider} API: {str(e)}")
 
-    def call_openai(self) -> str:
-        """Process request through OpenAI's text generation API."""
+    async def acall(self) -> str:
+        """Route the request to the appropriate non-blocking provider implementation."""
+        # Look up the provider's async method, e.g. acall_openai
+        method = self.provider_method("acall")
+        if method is None and self.provider_method("call") is not None:
+            # Providers without a native async client run in a worker thread
+            return await super().acall()
+
+        try:
+            # Await the provider method if supported
+            if method is not None:
+                return await method()
+            else:
+                raise ValueError(f"Unsupported text provider: {self.provider}")
+        except APICenterError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error calling {self.provider} API: {str(e)}")
+
+    def stream(self) -> Iterator[StreamEvent]:
+        """Route a streaming request to the appropriate provider implementation."""
+        # Look up the provider's streaming method, e.g. stream_openai
+        method = self.provider_method("stream")
+        if method is None:
+            raise ValueError(f"Streaming is not supported for text provider: {self.provider}")
+        return method()
+
+    def astream(self) -> AsyncIterator[StreamEvent]:
+        """Route a streaming request to the appropriate async provider implementation."""
+        # Look up the provider's async streaming method, e.g. astream_openai
+        method = self.provider_method("astream")
+        if method is None:
+            raise ValueError(f"Streaming is not supported for text provider: {self.provider}")
+        return method()
+
+    def get_openai_credentials(self) -> Dict[str, Any]:
+        """Build the OpenAI credentials dictionary from the loaded configuration."""
         # Prepare credentials dictionary
         credentials_dict = {
             "api_key": self.config.api_key,
@@ -46,11 +129,19 @@ class TextProvider(BaseProvider[str]):
         }
 
         # Remove None values from credentials
-        credentials_dict = {k: v for k, v in credentials_dict.items() if v is not None}
+        return {k: v for k, v in credentials_dict.items() if v is not None}
+
+    def call_openai(self) -> str:
+        """Process request through OpenAI's text generation API."""
+        credentials_dict = self.get_openai_credentials()
 
-        # Call the OpenAI implementation
-        return call_openai(
-            model=self.model, prompt=self.prompt, credentials=credentials_dict, **self.kwargs
+        # Call the OpenAI implementation with a pooled client
+        return providers.resolve("call_openai")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_client(providers.resolve("create_openai_client"), credentials_dict),
+            **self.kwargs,
         )
 
     def call_anthropic(self) -> str:
@@ -58,18 +149,154 @@ class TextProvider(BaseProvider[str]):
         # Prepare credentials dictionary
         credentials_dict = {"api_key": self.config.api_key}
 
-        # Call the Anthropic implementation
-        return call_anthropic(
-            model=self.model, prompt=self.prompt, credentials=credentials_dict, **self.kwargs
+        # Call the Anthropic implementation with a pooled client
+        return providers.resolve("call_anthropic")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_client(providers.resolve("create_anthropic_client"), credentials_dict),
+            **self.kwargs,
         )
 
     def call_ollama(self) -> str:
         """Process request through local Ollama text generation."""
-        # Call the Ollama implementation (no credentials needed)
-        return call_ollama(model=self.model, prompt=self.prompt, **self.kwargs)
+        # Call the Ollama implementation with a pooled client (no credentials needed)
+        return providers.resolve("call_ollama")(
+            model=self.model,
+            prompt=self.prompt,
+            client=self.get_client(providers.resolve("create_ollama_client"), {}),
+            **self.kwargs,
+        )
+
+    def call_deepseek(self) -> str:
+        """Process request through Deepseek's OpenAI-compatible API."""
+        # Prepare credentials dictionary
+        credentials_dict = {"api_key": self.config.api_key}
+
+        # Call the Deepseek implementation with a pooled client
+        return providers.resolve("call_deepseek")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_client(providers.resolve("create_deepseek_client"), credentials_dict),
+            **self.kwargs,
+        )
+
+    async def acall_openai(self) -> str:
+        """Process request through OpenAI's async text generation API."""
+        credentials_dict = self.get_openai_credentials()
+
+        # Await the OpenAI implementation with a pooled async client
+        return await providers.resolve("acall_openai")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_async_client(
+                providers.resolve("create_async_openai_client"), credentials_dict
+            ),
+            **self.kwargs,
+        )
+
+    async def acall_anthropic(self) -> str:
+        """Process request through Anthropic's async text generation API."""
+        # Prepare credentials dictionary
+        credentials_dict = {"api_key": self.config.api_key}
+
+        # Await the Anthropic implementation with a pooled async client
+        return await providers.resolve("acall_anthropic")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_async_client(
+                providers.resolve("create_async_anthropic_client"), credentials_dict
+            ),
+            **self.kwargs,
+        )
+
+    async def acall_ollama(self) -> str:
+        """Process request through local Ollama's async client."""
+        # Await the Ollama implementation with a pooled async client (no credentials needed)
+        return await providers.resolve("acall_ollama")(
+            model=self.model,
+            prompt=self.prompt,
+            client=self.get_async_client(providers.resolve("create_async_ollama_client"), {}),
+            **self.kwargs,
+        )
+
+    def stream_openai(self) -> Iterator[StreamEvent]:
+        """Stream a response from OpenAI's text generation API."""
+        credentials_dict = self.get_openai_credentials()
+        return providers.resolve("stream_openai")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_client(providers.resolve("create_openai_client"), credentials_dict),
+            **self.kwargs,
+        )
+
+    def stream_anthropic(self) -> Iterator[StreamEvent]:
+        """Stream a response from Anthropic's text generation API."""
+        credentials_dict = {"api_key": self.config.api_key}
+        return providers.resolve("stream_anthropic")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_client(providers.resolve("create_anthropic_client"), credentials_dict),
+            **self.kwargs,
+        )
+
+    def stream_ollama(self) -> Iterator[StreamEvent]:
+        """Stream a response from a local Ollama model."""
+        return providers.resolve("stream_ollama")(
+            model=self.model,
+            prompt=self.prompt,
+            client=self.get_client(providers.resolve("create_ollama_client"), {}),
+            **self.kwargs,
+        )
+
+    def astream_openai(self) -> AsyncIterator[StreamEvent]:
+        """Stream a response from OpenAI's async text generation API."""
+        credentials_dict = self.get_openai_credentials()
+        return providers.resolve("astream_openai")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_async_client(
+                providers.resolve("create_async_openai_client"), credentials_dict
+            ),
+            **self.kwargs,
+        )
+
+    def astream_anthropic(self) -> AsyncIterator[StreamEvent]:
+        """Stream a response from Anthropic's async text generation API."""
+        credentials_dict = {"api_key": self.config.api_key}
+        return providers.resolve("astream_anthropic")(
+            model=self.model,
+            prompt=self.prompt,
+            credentials=credentials_dict,
+            client=self.get_async_client(
+                providers.resolve("create_async_anthropic_client"), credentials_dict
+            ),
+            **self.kwargs,
+        )
+
+    def astream_ollama(self) -> AsyncIterator[StreamEvent]:
+        """Stream a response from a local Ollama model's async client."""
+        return providers.resolve("astream_ollama")(
+            model=self.model,
+            prompt=self.prompt,
+            client=self.get_async_client(providers.resolve("create_async_ollama_client"), {}),
+            **self.kwargs,
+        )
 
 
 def text(provider: str, model: str, prompt: Any, **kwargs: Any) -> str:
     """Generate text using any supported AI provider with a unified interface."""
     # Create provider instance and get response
     return TextProvider(provider, model, prompt, **kwargs).get_response()
+
+
+async def atext(provider: str, model: str, prompt: Any, **kwargs: Any) -> str:
+    """Generate text asynchronously using any supported AI provider."""
+    # Create provider instance and await response
+    return await TextProvider(provider, model, prompt, **kwargs).aget_response()
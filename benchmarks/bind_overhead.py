@@ -0,0 +1,50 @@
+"""Measure the per-call overhead of apicenter.text against a bound call.
+
+The OpenAI client is replaced with an in-process fake, so the numbers are the library's
+own cost per request and do not include network time. Run with: python benchmarks/bind_overhead.py
+"""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from apicenter import apicenter
+from apicenter.core.credentials import credentials
+
+CALLS = 20000
+WARMUP = 200
+
+# A reply shaped like the OpenAI chat completions response
+REPLY = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="Hi"))])
+
+
+def fake_client(credentials):
+    """Return an object with the client surface call_openai uses, answering instantly."""
+    completions = SimpleNamespace(create=lambda **kwargs: REPLY)
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+def per_call(function) -> float:
+    """Return the mean time per call of function, in microseconds."""
+    for _ in range(WARMUP):
+        function()
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        function()
+    return (time.perf_counter() - started) / CALLS * 1e6
+
+
+def main() -> None:
+    """Print the overhead of both call styles for the same request."""
+    credentials.credentials = {"modes": {"text": {"providers": {"openai": {"api_key": "sk-test"}}}}}
+    with patch("apicenter.text.text.create_openai_client", fake_client):
+        bound = apicenter.bind("text", "openai", "gpt-4o-mini", max_tokens=5)
+        unbound = per_call(lambda: apicenter.text("openai", "gpt-4o-mini", "Hi", max_tokens=5))
+        fast = per_call(lambda: bound("Hi"))
+
+    print(f"apicenter.text: {unbound:6.1f} us/call")
+    print(f"bound call:     {fast:6.1f} us/call ({unbound / fast:.1f}x less overhead)")
+
+
+if __name__ == "__main__":
+    main()
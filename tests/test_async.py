@@ -0,0 +1,147 @@
+"""Test the asyncio API and async provider implementations."""
+
+import base64
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+
+class TestAsyncProviders(unittest.IsolatedAsyncioTestCase):
+    """Test the asyncio API and async provider implementations."""
+
+    async def test_acall_openai(self):
+        """Test that the async OpenAI text provider awaits the client."""
+        from apicenter.text.providers.openai import acall_openai
+
+        # Setup mock async client and response
+        mock_client = MagicMock()
+        mock_message = MagicMock(content="Async response")
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=MagicMock(choices=[MagicMock(message=mock_message)])
+        )
+
+        result = await acall_openai(
+            model="gpt-4", prompt="Hello", credentials={}, client=mock_client, temperature=0
+        )
+
+        self.assertEqual(result, "Async response")
+        args, kwargs = mock_client.chat.completions.create.call_args
+        self.assertEqual(kwargs["messages"], [{"role": "user", "content": "Hello"}])
+        self.assertEqual(kwargs["temperature"], 0)
+
+    async def test_acall_anthropic_separates_system_prompt(self):
+        """Test that the async Anthropic provider shares prompt handling with the sync one."""
+        from apicenter.text.providers.anthropic import acall_anthropic
+
+        mock_client = MagicMock()
+        mock_client.messages.create = AsyncMock(
+            return_value=MagicMock(content=[MagicMock(text="Claude says hi")])
+        )
+
+        result = await acall_anthropic(
+            model="claude-3-haiku-20240307",
+            prompt=[
+                {"role": "system", "content": "Be brief"},
+                {"role": "user", "content": "Hi"},
+            ],
+            credentials={},
+            client=mock_client,
+        )
+
+        self.assertEqual(result, "Claude says hi")
+        args, kwargs = mock_client.messages.create.call_args
+        self.assertEqual(kwargs["system"], "Be brief")
+        self.assertEqual(kwargs["max_tokens"], 4096)
+
+    async def test_acall_stability_with_httpx(self):
+        """Test that the async Stability provider posts through an httpx client."""
+        from apicenter.image.providers.stability import acall_stability
+
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            payload = {"artifacts": [{"base64": base64.b64encode(b"png-bytes").decode()}]}
+            return httpx.Response(200, json=payload)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            result = await acall_stability(
+                model="stable-diffusion-v1-6",
+                prompt="A red fox",
+                credentials={"api_key": "test_key"},
+                client=client,
+            )
+
+        self.assertEqual(result, b"png-bytes")
+        self.assertEqual(requests_seen[0].headers["Authorization"], "Bearer test_key")
+
+    async def test_acall_elevenlabs_collects_chunks(self):
+        """Test that async audio chunks are concatenated."""
+        from apicenter.audio.providers.elevenlabs import acall_elevenlabs
+
+        async def chunks(**kwargs):
+            for chunk in (b"one", b"two"):
+                yield chunk
+
+        mock_client = MagicMock()
+        mock_client.text_to_speech.convert = MagicMock(side_effect=chunks)
+
+        result = await acall_elevenlabs(
+            model="eleven_multilingual_v2",
+            prompt="Hello",
+            credentials={},
+            client=mock_client,
+            stability=0.5,
+        )
+
+        self.assertEqual(result, b"onetwo")
+        args, kwargs = mock_client.text_to_speech.convert.call_args
+        self.assertEqual(kwargs["model_id"], "eleven_multilingual_v2")
+        self.assertEqual(kwargs["voice_settings"].stability, 0.5)
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    async def test_atext_uses_pooled_async_client(self, mock_get):
+        """Test that apicenter.atext routes through a pooled AsyncOpenAI client."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "async-key"}
+        await apicenter.aclose()
+
+        with patch("apicenter.text.providers.openai.AsyncOpenAI") as mock_async_openai:
+            mock_client = mock_async_openai.return_value
+            mock_message = MagicMock(content="pooled")
+            mock_client.chat.completions.create = AsyncMock(
+                return_value=MagicMock(choices=[MagicMock(message=mock_message)])
+            )
+            mock_client.close = AsyncMock()
+
+            first = await apicenter.atext("openai", "gpt-4", "Hello")
+            second = await apicenter.atext("openai", "gpt-4", "Again")
+
+            # Check that one async client served both requests and is closed on aclose
+            self.assertEqual([first, second], ["pooled", "pooled"])
+            mock_async_openai.assert_called_once_with(api_key="async-key", max_retries=0)
+            await apicenter.aclose()
+            mock_client.close.assert_awaited_once()
+
+    async def test_default_acall_runs_sync_call_in_thread(self):
+        """Test that providers without native async support can still be awaited."""
+        from apicenter.core.base import BaseProvider
+
+        class EchoProvider(BaseProvider[str]):
+            def get_mode(self):
+                return "text"
+
+            def load_config(self):
+                return None
+
+            def call(self):
+                return f"echo: {self.prompt}"
+
+        result = await EchoProvider("echo", "model", "hi").aget_response()
+        self.assertEqual(result, "echo: hi")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Test chunked audio streaming from ElevenLabs."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+class TestAudioStreaming(unittest.TestCase):
+    """Test chunked audio streaming from ElevenLabs."""
+
+    def test_stream_elevenlabs_yields_chunks_lazily(self):
+        """Test that chunks are relayed one at a time rather than joined."""
+        from apicenter.audio.providers.elevenlabs import stream_elevenlabs
+
+        produced = []
+
+        def convert(**kwargs):
+            for chunk in (b"first", b"", b"second"):
+                produced.append(chunk)
+                yield chunk
+
+        mock_client = MagicMock()
+        mock_client.text_to_speech.convert = MagicMock(side_effect=convert)
+
+        stream = stream_elevenlabs(
+            model="eleven_turbo_v2", prompt="Hello", credentials={}, client=mock_client
+        )
+
+        # Nothing is synthesized until the consumer asks for the first chunk
+        self.assertEqual(produced, [])
+        self.assertEqual(next(stream), b"first")
+        self.assertEqual(produced, [b"first"])
+
+        # Empty keep-alive chunks are skipped
+        self.assertEqual(list(stream), [b"second"])
+
+    def test_streaming_endpoint_and_latency_option(self):
+        """Test that the dedicated streaming endpoint receives the latency setting."""
+        from apicenter.audio.providers.elevenlabs import stream_elevenlabs
+
+        mock_client = MagicMock()
+        mock_client.text_to_speech.stream.return_value = iter([b"chunk"])
+
+        chunks = list(
+            stream_elevenlabs(
+                model="eleven_turbo_v2",
+                prompt="Hello",
+                credentials={},
+                client=mock_client,
+                use_streaming_endpoint=True,
+                optimize_streaming_latency=3,
+            )
+        )
+
+        self.assertEqual(chunks, [b"chunk"])
+        mock_client.text_to_speech.convert.assert_not_called()
+        args, kwargs = mock_client.text_to_speech.stream.call_args
+        self.assertEqual(kwargs["optimize_streaming_latency"], 3)
+        self.assertEqual(kwargs["model_id"], "eleven_turbo_v2")
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.audio.audio.stream_elevenlabs")
+    def test_audio_stream_and_stream_option(self, mock_stream, mock_get_credentials):
+        """Test apicenter.audio_stream and AudioProvider's stream=True option."""
+        from apicenter import apicenter
+        from apicenter.audio.audio import AudioProvider
+
+        mock_get_credentials.return_value = {"api_key": "test-key"}
+        mock_stream.side_effect = lambda **kwargs: iter([b"a", b"b"])
+
+        self.assertEqual(
+            list(apicenter.audio_stream("elevenlabs", "eleven_multilingual_v2", "Hi")),
+            [b"a", b"b"],
+        )
+
+        # stream=True is consumed by the provider rather than forwarded to the API
+        response = AudioProvider(
+            "elevenlabs", "eleven_multilingual_v2", "Hi", stream=True
+        ).get_response()
+        self.assertEqual(list(response), [b"a", b"b"])
+        self.assertNotIn("stream", mock_stream.call_args[1])
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.audio.audio.stream_elevenlabs")
+    def test_stream_holds_slot_until_read(self, mock_stream, mock_get_credentials):
+        """Test that a streamed response keeps its slot and reports errors found while read."""
+        from apicenter import apicenter
+        from apicenter.core.errors import ServerError
+
+        mock_get_credentials.return_value = {"api_key": "test-key"}
+
+        def chunks(**kwargs):
+            """Yield one chunk, then fail like a dropped connection."""
+            yield b"a"
+            raise ServerError("502")
+
+        mock_stream.side_effect = chunks
+        apicenter.concurrency.enable("elevenlabs", initial=1, max_limit=1)
+        apicenter.breakers.enable("elevenlabs", min_calls=1, cooldown=60)
+        self.addCleanup(apicenter.concurrency.disable)
+        self.addCleanup(apicenter.breakers.disable)
+
+        response = apicenter.audio("elevenlabs", "eleven_multilingual_v2", "Hi", stream=True)
+        self.assertEqual(apicenter.concurrency_stats()["elevenlabs"]["in_flight"], 1)
+        self.assertEqual(next(response), b"a")
+        with self.assertRaises(ServerError):
+            next(response)
+
+        # The slot is free again and the failure reached the breaker
+        self.assertEqual(apicenter.concurrency_stats()["elevenlabs"]["in_flight"], 0)
+        stats = apicenter.breaker_stats()["audio/elevenlabs/eleven_multilingual_v2"]
+        self.assertEqual(stats["failure_rate"], 1.0)
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.audio.audio.stream_elevenlabs")
+    def test_dropped_stream_releases_slot(self, mock_stream, mock_get_credentials):
+        """Test that a stream closed or dropped before it is read frees its slot."""
+        import gc
+
+        from apicenter import apicenter
+
+        mock_get_credentials.return_value = {"api_key": "test-key"}
+        mock_stream.side_effect = lambda **kwargs: iter([b"a", b"b"])
+        apicenter.concurrency.enable("elevenlabs", initial=1, max_limit=1)
+        self.addCleanup(apicenter.concurrency.disable)
+
+        # Closing an unread stream releases its slot
+        response = apicenter.audio("elevenlabs", "eleven_multilingual_v2", "Hi", stream=True)
+        self.assertEqual(apicenter.concurrency_stats()["elevenlabs"]["in_flight"], 1)
+        response.close()
+        self.assertEqual(apicenter.concurrency_stats()["elevenlabs"]["in_flight"], 0)
+
+        # So does dropping it without reading or closing it
+        response = apicenter.audio("elevenlabs", "eleven_multilingual_v2", "Hi", stream=True)
+        self.assertEqual(apicenter.concurrency_stats()["elevenlabs"]["in_flight"], 1)
+        del response
+        gc.collect()
+        self.assertEqual(apicenter.concurrency_stats()["elevenlabs"]["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
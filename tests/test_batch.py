@@ -0,0 +1,92 @@
+"""Test the bounded-concurrency batch API."""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from apicenter.core.batch import BatchResult, run_batch
+
+
+class TestBatch(unittest.TestCase):
+    """Test the bounded-concurrency batch API."""
+
+    def test_ordered_results_and_error_capture(self):
+        """Test that results keep input order and failures do not abort the batch."""
+
+        def work(n):
+            # Later items finish first to exercise reordering
+            time.sleep(0.01 * (5 - n))
+            if n == 2:
+                raise ValueError("bad item")
+            return n * 10
+
+        results = list(run_batch(work, range(5), workers=4))
+
+        self.assertEqual([r.index for r in results], [0, 1, 2, 3, 4])
+        self.assertEqual([r.result for r in results if r.ok], [0, 10, 30, 40])
+        self.assertIsInstance(results[2].error, ValueError)
+        self.assertEqual(results[2].request, 2)
+
+    def test_as_completed(self):
+        """Test that unordered batches yield fast items before slow ones."""
+
+        def work(n):
+            time.sleep(0.2 if n == 0 else 0)
+            return n
+
+        results = list(run_batch(work, range(4), workers=4, ordered=False))
+
+        self.assertEqual(sorted(r.result for r in results), [0, 1, 2, 3])
+        self.assertEqual(results[-1].index, 0)
+
+    def test_input_consumed_lazily_with_backpressure(self):
+        """Test that only a bounded number of items are pulled ahead of the consumer."""
+        pulled = []
+        lock = threading.Lock()
+
+        def requests():
+            for n in range(1000000):
+                with lock:
+                    pulled.append(n)
+                yield n
+
+        batch = run_batch(lambda n: n, requests(), workers=2, max_pending=4)
+        first = next(batch)
+        batch.close()
+
+        self.assertEqual(first, BatchResult(0, 0, result=0))
+        self.assertLessEqual(len(pulled), 5)
+
+    @patch("apicenter.apicenter.APICenter.text")
+    def test_text_batch_merges_defaults(self, mock_text):
+        """Test that text_batch accepts prompts or dicts and applies default arguments."""
+        from apicenter import apicenter
+
+        mock_text.side_effect = lambda provider, model, prompt, **kwargs: f"{model}:{prompt}"
+
+        results = list(
+            apicenter.text_batch(
+                ["a", {"prompt": "b", "model": "gpt-4"}],
+                provider="openai",
+                model="gpt-4o-mini",
+                workers=2,
+                temperature=0,
+            )
+        )
+
+        self.assertEqual([r.result for r in results], ["gpt-4o-mini:a", "gpt-4:b"])
+        for call in mock_text.call_args_list:
+            self.assertEqual(call[0][0], "openai")
+            self.assertEqual(call[1], {"temperature": 0})
+
+        # Missing fields are reported per item
+        results = list(apicenter.image_batch(["a cat"]))
+        self.assertIsInstance(results[0].error, ValueError)
+
+        with self.assertRaises(ValueError):
+            apicenter.batch("video", ["x"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Test pre-bound calls created with APICenter.bind."""
+
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+class TestBind(unittest.IsolatedAsyncioTestCase):
+    """Test pre-bound calls created with APICenter.bind."""
+
+    @patch("apicenter.text.text.create_openai_client")
+    @patch("apicenter.text.text.call_openai")
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    def test_defaults_and_overrides(self, mock_get, mock_call, mock_create):
+        """Test that bound defaults are sent and per-call options override them."""
+        from apicenter.apicenter import APICenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.return_value = "Bound response"
+        bound = APICenter().bind("text", "openai", "gpt-4", temperature=0, max_tokens=5)
+
+        self.assertEqual(bound("Hi"), "Bound response")
+        self.assertEqual(bound("Again", max_tokens=10), "Bound response")
+
+        first, second = (call.kwargs for call in mock_call.call_args_list)
+        self.assertEqual((first["prompt"], first["temperature"], first["max_tokens"]), ("Hi", 0, 5))
+        self.assertEqual((second["prompt"], second["max_tokens"]), ("Again", 10))
+
+    @patch("apicenter.text.text.create_openai_client")
+    @patch("apicenter.text.text.call_openai")
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    def test_resolves_once(self, mock_get, mock_call, mock_create):
+        """Test that configuration and the pooled client are looked up once, not per call."""
+        from apicenter.apicenter import APICenter
+        from apicenter.core.pool import clients
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.return_value = "ok"
+        bound = APICenter().bind("text", "openai", "gpt-4", refresh_interval=3600)
+
+        with patch.object(clients, "get", wraps=clients.get) as mock_pool:
+            for _ in range(3):
+                bound("Hi")
+            self.assertEqual(mock_pool.call_count, 1)
+        self.assertEqual(mock_get.call_count, 1)
+
+        # Every request is made with the same client
+        self.assertEqual(len({id(call.kwargs["client"]) for call in mock_call.call_args_list}), 1)
+
+    @patch("apicenter.text.text.call_openai")
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    def test_slow_path_options_use_full_path(self, mock_get, mock_call):
+        """Test that options like fallbacks or caching go through APICenter.text."""
+        from apicenter.apicenter import APICenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.return_value = "ok"
+        center = APICenter()
+
+        bound = center.bind("text", "openai", "gpt-4", temperature=0)
+        with patch.object(center, "text", return_value="full") as mock_text:
+            self.assertEqual(bound("Hi", cache=True), "full")
+            mock_text.assert_called_once_with("openai", "gpt-4", "Hi", temperature=0, cache=True)
+
+            # Defaults that need the full path are detected when binding
+            hedged = center.bind("text", "openai", "gpt-4", hedge=True)
+            self.assertEqual(hedged("Hi"), "full")
+            self.assertEqual(mock_text.call_count, 2)
+
+        # Options a bound call can apply itself stay on the fast path
+        self.assertEqual(center.bind("text", "openai", "gpt-4", timeout=5)("Hi"), "ok")
+        self.assertEqual(mock_call.call_args.kwargs["timeout"], 5)
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    def test_unknown_provider(self, mock_get):
+        """Test that binding an unsupported provider fails immediately."""
+        from apicenter.apicenter import APICenter
+
+        mock_get.return_value = {"api_key": "key"}
+        with self.assertRaises(ValueError):
+            APICenter().bind("text", "missing", "model")
+
+    @patch("apicenter.text.text.create_async_openai_client", new_callable=MagicMock)
+    @patch("apicenter.text.text.acall_openai", new_callable=AsyncMock)
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    async def test_acall(self, mock_get, mock_call, mock_create):
+        """Test that acall awaits the async provider with the bound defaults."""
+        from apicenter.apicenter import APICenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.return_value = "Async bound"
+        bound = APICenter().bind("text", "openai", "gpt-4", temperature=0)
+
+        self.assertEqual(await bound.acall("Hi"), "Async bound")
+        self.assertEqual(mock_call.call_args.kwargs["temperature"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+"""Test circuit breakers."""
+
+import unittest
+from unittest.mock import patch
+
+from apicenter.core.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from apicenter.core.errors import AuthenticationError, CircuitOpenError, ServerError
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+class TestBreaker(unittest.TestCase):
+    """Test circuit breakers."""
+
+    def make_breaker(self, **kwargs):
+        """Build a breaker on a fake clock that records state changes."""
+        self.clock = FakeClock()
+        self.changes = []
+        options = {"failure_rate": 0.5, "min_calls": 4, "cooldown": 10.0}
+        options.update(kwargs)
+        return CircuitBreaker(
+            key=("image", "stability", "sd3"),
+            clock=self.clock,
+            on_state_change=lambda key, old, new: self.changes.append((old, new)),
+            **options,
+        )
+
+    def fail(self, breaker, error=None):
+        """Run one admitted call that fails."""
+        breaker.before_call()
+        breaker.record(error or ServerError("503"))
+
+    def test_opens_on_failure_rate_and_fails_fast(self):
+        """Test that the breaker opens at the threshold and then rejects calls."""
+        breaker = self.make_breaker()
+        breaker.before_call()
+        breaker.record()
+        self.fail(breaker)
+        self.fail(breaker)
+        self.assertEqual(breaker.state, CLOSED)
+
+        self.fail(breaker)
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(self.changes, [(CLOSED, OPEN)])
+
+        self.clock.now = 4.0
+        with self.assertRaises(CircuitOpenError) as context:
+            breaker.before_call()
+        self.assertAlmostEqual(context.exception.retry_after, 6.0)
+        self.assertEqual(breaker.stats()["rejected"], 1)
+
+    def test_client_errors_do_not_trip(self):
+        """Test that errors caused by the request itself are neutral."""
+        breaker = self.make_breaker()
+        for _ in range(10):
+            self.fail(breaker, AuthenticationError("401"))
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.stats()["recent_calls"], 0)
+
+    def test_half_open_probes(self):
+        """Test that only probe calls pass while half-open and that they decide the state."""
+        breaker = self.make_breaker(min_calls=1, half_open_probes=1)
+        self.fail(breaker)
+        self.clock.now = 10.0
+
+        # The first call after the cooldown is the probe; concurrent calls are rejected
+        breaker.before_call()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        # A failed probe reopens the breaker for another cooldown
+        breaker.record(ServerError("503"))
+        self.assertEqual(breaker.state, OPEN)
+        self.clock.now = 20.0
+        breaker.before_call()
+        breaker.record()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(
+            self.changes,
+            [
+                (CLOSED, OPEN),
+                (OPEN, HALF_OPEN),
+                (HALF_OPEN, OPEN),
+                (OPEN, HALF_OPEN),
+                (HALF_OPEN, CLOSED),
+            ],
+        )
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_openai")
+    def test_apicenter_fails_fast(self, mock_call, mock_get):
+        """Test that an open breaker stops calls from reaching the provider."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.side_effect = ServerError("503")
+        changes = []
+
+        def listener(key, old, new):
+            """Record each breaker state change."""
+            changes.append((key, new))
+
+        apicenter.breakers.enable("openai", min_calls=2, cooldown=60)
+        apicenter.breakers.add_listener(listener)
+        self.addCleanup(apicenter.breakers.disable)
+        self.addCleanup(apicenter.breakers.remove_listener, listener)
+
+        for _ in range(2):
+            with self.assertRaises(ServerError):
+                apicenter.text("openai", "gpt-4", "Hi", retry=False)
+        with self.assertRaises(CircuitOpenError):
+            apicenter.text("openai", "gpt-4", "Hi")
+
+        self.assertEqual(mock_call.call_count, 2)
+        self.assertEqual(changes, [(("text", "openai", "gpt-4"), OPEN)])
+        self.assertEqual(apicenter.breaker_stats()["text/openai/gpt-4"]["state"], OPEN)
+
+        # Breakers are per model
+        mock_call.side_effect = None
+        mock_call.return_value = "Hello"
+        self.assertEqual(apicenter.text("openai", "gpt-4o", "Hi"), "Hello")
+
+
+class TestAsyncBreaker(unittest.IsolatedAsyncioTestCase):
+    """Test circuit breakers in the async API."""
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.acall_openai")
+    async def test_async_calls_fail_fast(self, mock_acall, mock_get):
+        """Test that async calls share the breaker and are rejected while it is open."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_acall.side_effect = ServerError("503")
+        apicenter.breakers.enable("openai", min_calls=1, cooldown=60)
+        self.addCleanup(apicenter.breakers.disable)
+
+        with self.assertRaises(ServerError):
+            await apicenter.atext("openai", "gpt-4", "Hi", retry=False)
+        with self.assertRaises(CircuitOpenError):
+            await apicenter.atext("openai", "gpt-4", "Hi")
+        self.assertEqual(mock_acall.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
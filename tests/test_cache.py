@@ -0,0 +1,109 @@
+"""Test the in-memory response cache."""
+
+import time
+import unittest
+from unittest.mock import patch
+
+from apicenter.core.cache import ResponseCache, is_cacheable, make_key
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the in-memory response cache."""
+
+    def test_key_is_canonical(self):
+        """Test that kwarg and message key order do not change the key."""
+        messages_a = [{"role": "user", "content": "Hi"}]
+        messages_b = [{"content": "Hi", "role": "user"}]
+
+        self.assertEqual(
+            make_key("text", "openai", "gpt-4", messages_a, {"temperature": 0, "seed": 1}),
+            make_key("text", "openai", "gpt-4", messages_b, {"seed": 1, "temperature": 0}),
+        )
+        self.assertNotEqual(
+            make_key("text", "openai", "gpt-4", "Hi", {}),
+            make_key("text", "openai", "gpt-4", [{"role": "user", "content": "Hi"}], {}),
+        )
+
+    def test_cacheable_requests(self):
+        """Test that only deterministic text requests are cached by default."""
+        self.assertTrue(is_cacheable("text", {"temperature": 0}))
+        self.assertTrue(is_cacheable("text", {"temperature": 0.7, "seed": 42}))
+        self.assertFalse(is_cacheable("text", {}))
+        self.assertFalse(is_cacheable("text", {"temperature": 0.7}))
+        self.assertTrue(is_cacheable("audio", {}))
+        self.assertFalse(is_cacheable("audio", {"stream": True}))
+        self.assertFalse(is_cacheable("image", {"sink": "out.png"}))
+
+    def test_lru_byte_bound_and_ttl(self):
+        """Test eviction by entry count, total size and age."""
+        cache = ResponseCache(max_entries=2, max_bytes=10, ttl=None)
+        cache.set("a", b"1234")
+        cache.set("b", b"5678")
+        cache.get("a")
+
+        # "b" is least recently used and goes first
+        cache.set("c", b"90")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), b"1234")
+
+        # Exceeding the byte budget evicts until it fits; oversized values are not stored
+        cache.set("d", b"abcdefgh")
+        self.assertEqual(cache.stats()["bytes"], 8)
+        cache.set("huge", b"x" * 11)
+        self.assertIsNone(cache.get("huge"))
+
+        cache.set("short", "text", ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("short"))
+
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertGreaterEqual(stats["evictions"], 2)
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_openai")
+    def test_apicenter_cache(self, mock_call, mock_get):
+        """Test that APICenter serves repeated deterministic calls from the cache."""
+        from apicenter import APICenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.return_value = "Paris"
+        center = APICenter(cache=ResponseCache())
+
+        for _ in range(2):
+            self.assertEqual(center.text("openai", "gpt-4", "Capital?", temperature=0), "Paris")
+        self.assertEqual(mock_call.call_count, 1)
+
+        # Per-call bypass and non-deterministic calls go to the network
+        center.text("openai", "gpt-4", "Capital?", temperature=0, cache=False)
+        center.text("openai", "gpt-4", "Capital?", temperature=0.9)
+        self.assertEqual(mock_call.call_count, 3)
+        self.assertNotIn("cache", mock_call.call_args[1])
+
+        # cache=True opts a non-deterministic call in
+        center.text("openai", "gpt-4", "Capital?", temperature=0.9, cache=True)
+        center.text("openai", "gpt-4", "Capital?", temperature=0.9, cache=True)
+        self.assertEqual(mock_call.call_count, 4)
+        self.assertEqual(center.cache.stats()["hits"], 2)
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.audio.audio.stream_elevenlabs")
+    def test_streams_are_not_cached(self, mock_stream, mock_get):
+        """Test that cache=True does not store a stream that can only be read once."""
+        from apicenter import APICenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_stream.side_effect = lambda **kwargs: iter([b"a", b"b"])
+        center = APICenter(cache=ResponseCache())
+
+        for _ in range(2):
+            response = center.audio(
+                "elevenlabs", "eleven_multilingual_v2", "Hi", stream=True, cache=True
+            )
+            self.assertEqual(list(response), [b"a", b"b"])
+        self.assertEqual(mock_stream.call_count, 2)
+        self.assertEqual(center.cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
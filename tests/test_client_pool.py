@@ -0,0 +1,179 @@
+"""Test the shared SDK client pool."""
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from apicenter.core.pool import ClientPool
+
+
+class TestClientPool(unittest.TestCase):
+    """Test the shared SDK client pool."""
+
+    def test_reuses_client_for_same_key(self):
+        """Test that the same credentials return the same client instance."""
+        pool = ClientPool()
+        factory = MagicMock(side_effect=lambda creds: MagicMock())
+
+        first = pool.get("openai", factory, {"api_key": "key"})
+        second = pool.get("openai", factory, {"api_key": "key"})
+
+        # Check that the client was only built once
+        self.assertIs(first, second)
+        factory.assert_called_once_with({"api_key": "key"})
+        self.assertEqual(pool.stats()["hits"], 1)
+        self.assertEqual(pool.stats()["misses"], 1)
+
+    def test_separate_clients_per_credentials_and_base_url(self):
+        """Test that different credentials or base URLs get their own clients."""
+        pool = ClientPool()
+        factory = MagicMock(side_effect=lambda creds: MagicMock())
+
+        a = pool.get("openai", factory, {"api_key": "a"})
+        b = pool.get("openai", factory, {"api_key": "b"})
+        c = pool.get("openai", factory, {"api_key": "a"}, base_url="https://proxy.local/v1")
+
+        self.assertIsNot(a, b)
+        self.assertIsNot(a, c)
+
+        # Check that the base URL was passed through to the factory
+        factory.assert_called_with({"api_key": "a", "base_url": "https://proxy.local/v1"})
+
+    def test_size_limit_evicts_lru(self):
+        """Test that the least recently used client is dropped when the pool is full."""
+        pool = ClientPool(max_size=2)
+        factory = MagicMock(side_effect=lambda creds: MagicMock())
+
+        first = pool.get("openai", factory, {"api_key": "1"})
+        second = pool.get("openai", factory, {"api_key": "2"})
+        pool.get("openai", factory, {"api_key": "1"})
+        pool.get("openai", factory, {"api_key": "3"})
+
+        # Key "2" was least recently used and should be gone, but left open for its users
+        self.assertEqual(len(pool), 2)
+        self.assertIs(pool.get("openai", factory, {"api_key": "1"}), first)
+        first.close.assert_not_called()
+        second.close.assert_not_called()
+        self.assertEqual(pool.stats()["evictions"], 1)
+
+    @patch("apicenter.core.pool.time.monotonic")
+    def test_idle_clients_are_evicted(self, mock_monotonic):
+        """Test that clients idle past the timeout are dropped and rebuilt."""
+        pool = ClientPool(idle_timeout=10)
+        factory = MagicMock(side_effect=lambda creds: MagicMock())
+
+        mock_monotonic.return_value = 100.0
+        first = pool.get("anthropic", factory, {"api_key": "key"})
+
+        mock_monotonic.return_value = 200.0
+        self.assertEqual(pool.evict_idle(), 1)
+        first.close.assert_not_called()
+
+        second = pool.get("anthropic", factory, {"api_key": "key"})
+        self.assertIsNot(first, second)
+
+    def test_close_and_invalidate(self):
+        """Test explicit close and targeted invalidation."""
+        pool = ClientPool()
+        factory = MagicMock(side_effect=lambda creds: MagicMock())
+
+        openai_client = pool.get("openai", factory, {"api_key": "key"})
+        eleven_client = pool.get("elevenlabs", factory, {"api_key": "key"})
+
+        # Invalidate only OpenAI clients, leaving in-flight users' client open
+        self.assertEqual(pool.invalidate(provider="openai"), 1)
+        self.assertEqual(len(pool), 1)
+        openai_client.close.assert_not_called()
+
+        pool.close()
+        eleven_client.close.assert_called_once()
+        self.assertEqual(len(pool), 0)
+
+    def test_concurrent_access_builds_one_client(self):
+        """Test that concurrent callers share a single client for the same key."""
+        pool = ClientPool()
+        factory = MagicMock(side_effect=lambda creds: object())
+        results = []
+
+        def worker():
+            results.append(pool.get("openai", factory, {"api_key": "key"}))
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(factory.call_count, 1)
+        self.assertTrue(all(client is results[0] for client in results))
+
+    def test_slow_factory_does_not_block_other_keys(self):
+        """Test that clients are built outside the pool lock."""
+        pool = ClientPool()
+        started, finish = threading.Event(), threading.Event()
+
+        def slow_factory(creds):
+            """Build a client once the test lets it finish."""
+            started.set()
+            finish.wait(5)
+            return MagicMock()
+
+        builder = threading.Thread(target=pool.get, args=("openai", slow_factory, {"api_key": "a"}))
+        builder.start()
+        self.assertTrue(started.wait(5))
+
+        # Another key is served while the first client is still being built
+        other = pool.get("anthropic", MagicMock(side_effect=lambda creds: "fast"), {})
+        self.assertEqual(other, "fast")
+        finish.set()
+        builder.join()
+        self.assertEqual(len(pool), 2)
+
+    def test_failed_build_is_retried(self):
+        """Test that a factory error is raised and the next caller builds the client again."""
+        pool = ClientPool()
+        factory = MagicMock(side_effect=[RuntimeError("boom"), "client"])
+
+        with self.assertRaises(RuntimeError):
+            pool.get("openai", factory, {})
+        self.assertEqual(pool.get("openai", factory, {}), "client")
+
+    def test_async_clients_closed_on_their_loop(self):
+        """Test that closing the pool awaits async clients on the loop they belong to."""
+        pool = ClientPool()
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        client = MagicMock()
+        client.close = AsyncMock()
+
+        pool.get("openai", lambda creds: client, {}, scope=loop)
+        pool.close()
+        client.close.assert_awaited_once()
+
+    @patch("apicenter.text.text.call_openai")
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    def test_text_provider_draws_from_pool(self, mock_get, mock_call_openai):
+        """Test that TextProvider passes the same pooled client on every call."""
+        from apicenter.core.pool import clients
+        from apicenter.text.text import TextProvider
+
+        clients.close()
+        mock_get.return_value = {"api_key": "pooled-key"}
+        mock_call_openai.return_value = "ok"
+
+        with patch("apicenter.text.providers.openai.OpenAI") as mock_openai_class:
+            TextProvider("openai", "gpt-4", "Hello").get_response()
+            TextProvider("openai", "gpt-4", "Hello again").get_response()
+
+        # Check that one client was built and passed to both calls
+        mock_openai_class.assert_called_once_with(api_key="pooled-key", max_retries=0)
+        first_client = mock_call_openai.call_args_list[0][1]["client"]
+        second_client = mock_call_openai.call_args_list[1][1]["client"]
+        self.assertIs(first_client, second_client)
+
+        clients.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Test adaptive concurrency control."""
+
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from apicenter.core.concurrency import AdaptiveLimiter, ConcurrencyControl
+from apicenter.core.errors import RateLimitError, ServerError
+
+
+class TestConcurrency(unittest.TestCase):
+    """Test adaptive concurrency control."""
+
+    def test_additive_increase_multiplicative_decrease(self):
+        """Test that healthy calls grow the limit and overloads halve it."""
+        limiter = AdaptiveLimiter(initial=4, max_limit=5)
+        for _ in range(8):
+            self.assertTrue(limiter.acquire(timeout=0))
+            limiter.release(0.1)
+        self.assertGreater(limiter.limit, 5 - 0.01)
+        self.assertLessEqual(limiter.limit, 5)
+
+        limiter.acquire(timeout=0)
+        limiter.release(0.1, overloaded=True)
+        self.assertEqual(limiter.limit, 2.5)
+
+        # Latency far above the baseline backs off gently
+        limiter.acquire(timeout=0)
+        limiter.release(10.0)
+        self.assertAlmostEqual(limiter.limit, 2.25)
+        self.assertEqual(limiter.stats()["slow"], 1)
+
+    def test_limit_bounds_in_flight(self):
+        """Test that acquisition waits once the limit is reached."""
+        limiter = AdaptiveLimiter(initial=2)
+        self.assertTrue(limiter.acquire(timeout=0))
+        self.assertTrue(limiter.acquire(timeout=0))
+        self.assertFalse(limiter.acquire(timeout=0.01))
+
+        limiter.release(0.1, failed=True)
+        self.assertTrue(limiter.acquire(timeout=0))
+        self.assertEqual(limiter.stats()["in_flight"], 2)
+
+    def test_headers_pace_requests(self):
+        """Test that low remaining counts space requests out and zero pauses them."""
+        limiter = AdaptiveLimiter(initial=8)
+        limiter.observe_headers(
+            {"x-ratelimit-remaining-requests": "4", "x-ratelimit-reset-requests": "2s"}
+        )
+        self.assertEqual(limiter.interval, 0.5)
+
+        limiter.observe_headers(
+            {
+                "anthropic-ratelimit-requests-remaining": "0",
+                "anthropic-ratelimit-requests-reset": "0.05s",
+            }
+        )
+        started = time.monotonic()
+        self.assertTrue(limiter.acquire(timeout=1))
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+
+    def test_instrument_attaches_response_hook(self):
+        """Test that pooled SDK clients report their rate-limit headers."""
+        control = ConcurrencyControl()
+        control.enable("openai")
+
+        class HTTPClient:
+            def __init__(self):
+                self.event_hooks = {"request": [], "response": []}
+
+            def send(self, request):
+                pass
+
+        client = MagicMock()
+        client._client = HTTPClient()
+        control.instrument("openai", client)
+        control.instrument("openai", client)
+        self.assertEqual(len(client._client.event_hooks["response"]), 1)
+
+        response = MagicMock(
+            headers={"x-ratelimit-remaining-requests": "1", "x-ratelimit-reset-requests": "3s"}
+        )
+        client._client.event_hooks["response"][0](response)
+        self.assertEqual(control.get("openai").interval, 3.0)
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_openai")
+    def test_apicenter_dispatch(self, mock_call, mock_get):
+        """Test that APICenter calls take slots and 429s shrink the limit."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.side_effect = [RateLimitError("429"), "Hello"]
+        apicenter.concurrency.enable("openai", initial=8)
+        self.addCleanup(apicenter.concurrency.disable)
+
+        with self.assertRaises(RateLimitError):
+            apicenter.text("openai", "gpt-4", "Hi", retry=False)
+        self.assertEqual(apicenter.text("openai", "gpt-4", "Hi"), "Hello")
+
+        stats = apicenter.concurrency_stats()["openai"]
+        self.assertEqual(stats["overloads"], 1)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertLess(stats["limit"], 8)
+
+        # Providers that were not enabled are unaffected
+        self.assertIsNone(apicenter.concurrency.get("anthropic"))
+
+        # Plain server errors are failures, not overload signals
+        mock_call.side_effect = ServerError("500", status_code=500)
+        with self.assertRaises(ServerError):
+            apicenter.text("openai", "gpt-4", "Hi", retry=False)
+        self.assertEqual(apicenter.concurrency_stats()["openai"]["overloads"], 1)
+
+
+class TestAsyncConcurrency(unittest.IsolatedAsyncioTestCase):
+    """Test adaptive concurrency from asyncio."""
+
+    async def test_aacquire_waits_for_release(self):
+        """Test that async acquisition waits until a slot is released."""
+        import asyncio
+
+        limiter = AdaptiveLimiter(initial=1)
+        await limiter.aacquire()
+
+        waiter = asyncio.create_task(limiter.aacquire())
+        await asyncio.sleep(0.02)
+        self.assertFalse(waiter.done())
+
+        limiter.release(0.01)
+        await asyncio.wait_for(waiter, 1)
+        self.assertEqual(limiter.stats()["in_flight"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Test lazy credential loading, hot reload and the configuration cache."""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from apicenter.core.credentials import CredentialsProvider
+
+
+def write_credentials(path: Path, api_key: str, mtime: int) -> None:
+    """Write a credentials file with one OpenAI key and a distinct modification time."""
+    document = {"modes": {"text": {"providers": {"openai": {"api_key": api_key}}}}}
+    path.write_text(json.dumps(document))
+    os.utime(path, (mtime, mtime))
+
+
+class TestCredentialsReload(unittest.TestCase):
+    """Test lazy credential loading, hot reload and the configuration cache."""
+
+    def setUp(self):
+        """Point the provider at a temporary credentials file."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "credentials.json"
+        write_credentials(self.path, "old-key", 1_000_000)
+
+        env = patch.dict(os.environ, {"APICENTER_CREDENTIALS_PATH": str(self.path)})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_loads_on_first_use(self):
+        """Test that creating the provider does not touch the filesystem."""
+        with patch.object(CredentialsProvider, "find_credentials_file") as mock_find:
+            mock_find.return_value = self.path
+            provider = CredentialsProvider()
+            mock_find.assert_not_called()
+
+            self.assertEqual(provider.get_credentials("text", "openai"), {"api_key": "old-key"})
+            mock_find.assert_called_once()
+
+    def test_reloads_changed_file(self):
+        """Test that an edited file is picked up and listeners learn what changed."""
+        provider = CredentialsProvider(check_interval=0)
+        listener = MagicMock()
+        provider.add_listener(listener)
+        self.assertEqual(provider.get_credentials("text", "openai")["api_key"], "old-key")
+        version = provider.version
+
+        # Unchanged files are not parsed again
+        with patch.object(provider, "load_credentials") as mock_load:
+            provider.get_credentials("text", "openai")
+            mock_load.assert_not_called()
+
+        write_credentials(self.path, "new-key", 2_000_000)
+        self.assertEqual(provider.get_credentials("text", "openai")["api_key"], "new-key")
+        self.assertEqual(provider.version, version + 1)
+        listener.assert_called_once_with({("text", "openai")})
+
+    def test_check_interval_and_partial_writes(self):
+        """Test that checks are throttled and a half-written file keeps the old keys."""
+        provider = CredentialsProvider(check_interval=3600)
+        provider.get_credentials("text", "openai")
+
+        write_credentials(self.path, "new-key", 2_000_000)
+        self.assertEqual(provider.get_credentials("text", "openai")["api_key"], "old-key")
+
+        self.path.write_text("{not json")
+        provider.check_interval = 0
+        self.assertEqual(provider.get_credentials("text", "openai")["api_key"], "old-key")
+
+    def test_rotation_invalidates_configs_and_clients(self):
+        """Test that configurations are cached per entry and rotated keys drop pooled clients."""
+        from apicenter.core.base import forget_configs
+        from apicenter.core.pool import clients
+        from apicenter.text.text import TextProvider
+
+        entry = {"api_key": "key"}
+        with patch(
+            "apicenter.core.credentials.CredentialsProvider.get_credentials", return_value=entry
+        ):
+            first = TextProvider("openai", "gpt-4", "Hi").config
+            self.assertIs(TextProvider("openai", "gpt-4", "Hi").config, first)
+
+        factory = MagicMock()
+        clients.get("openai", factory, {"api_key": "key"})
+        forget_configs({("text", "openai")})
+        clients.get("openai", factory, {"api_key": "key"})
+        self.assertEqual(factory.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Test the SQLite-backed response cache and its maintenance command."""
+
+import io
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from apicenter.core.disk_cache import DiskCache
+
+
+class TestDiskCache(unittest.TestCase):
+    """Test the SQLite-backed response cache and its maintenance command."""
+
+    def setUp(self):
+        """Create a scratch directory for the database and blob files."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.db_path = os.path.join(self.tmpdir.name, "cache.db")
+
+    def make_cache(self, **kwargs):
+        """Open a cache in the scratch directory that is closed after the test."""
+        cache = DiskCache(path=self.db_path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_round_trip_and_persistence(self):
+        """Test that text, bytes and lists survive reopening the database."""
+        cache = self.make_cache()
+        cache.set("text", "Paris")
+        cache.set("audio", b"\x00\x01")
+        cache.set("urls", ["https://a", "https://b"])
+        cache.close()
+
+        reopened = self.make_cache()
+        self.assertEqual(reopened.get("text"), "Paris")
+        self.assertEqual(reopened.get("audio"), b"\x00\x01")
+        self.assertEqual(reopened.get("urls"), ["https://a", "https://b"])
+        self.assertIsNone(reopened.get("missing"))
+
+        mode = reopened.connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_blob_files_ttl_and_eviction(self):
+        """Test side files, expiry and least-recently-used eviction by size."""
+        blob_dir = os.path.join(self.tmpdir.name, "blobs")
+        cache = self.make_cache(max_bytes=10, blob_dir=blob_dir, blob_threshold=4)
+
+        cache.set("a", b"aaaa")
+        blob = cache.blob_path("a")
+        self.assertTrue(blob.exists())
+        self.assertEqual(cache.get("a"), b"aaaa")
+
+        time.sleep(0.01)
+        cache.set("b", b"bbbb")
+        time.sleep(0.01)
+        cache.get("a")
+
+        # "b" is least recently used, so it goes when the budget is exceeded
+        cache.set("c", b"cccc")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), b"aaaa")
+        self.assertFalse(cache.blob_path("b").exists())
+
+        cache.set("short", "x", ttl=0.01)
+        time.sleep(0.02)
+        self.assertEqual(cache.prune(), {"expired": 1, "evicted": 0})
+        self.assertEqual(len(cache), 2)
+
+    def test_total_bytes_tracked_on_write(self):
+        """Test that the running size total follows inserts, overwrites and deletes."""
+        import sqlite3
+
+        # A database from before the running total was kept
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE entries (key TEXT PRIMARY KEY, kind TEXT NOT NULL, value BLOB, "
+            "path TEXT, size INTEGER NOT NULL, created_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL, expires_at REAL)"
+        )
+        conn.execute("INSERT INTO entries VALUES ('old', 'bytes', x'00', NULL, 7, 0, 0, NULL)")
+        conn.commit()
+        conn.close()
+
+        cache = self.make_cache(max_bytes=100)
+        self.assertEqual(cache.total_bytes(), 7)
+        cache.set("a", b"aaaa")
+        cache.set("a", b"aa")
+        cache.set("b", b"bbb")
+        cache.delete("old")
+        self.assertEqual(cache.total_bytes(), 5)
+        self.assertEqual(cache.total_bytes(), cache.stats()["bytes"])
+
+        cache.clear()
+        self.assertEqual(cache.total_bytes(), 0)
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.audio.audio.call_elevenlabs")
+    def test_apicenter_with_disk_cache(self, mock_call, mock_get):
+        """Test that APICenter reuses audio bytes stored on disk."""
+        from apicenter import APICenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.return_value = b"mp3"
+
+        for _ in range(2):
+            center = APICenter(cache=self.make_cache())
+            self.assertEqual(center.audio("elevenlabs", "eleven_multilingual_v2", "Hi"), b"mp3")
+        self.assertEqual(mock_call.call_count, 1)
+
+    def test_cli_stats_and_prune(self):
+        """Test the apicenter cache stats and prune commands."""
+        from apicenter.main import cli
+
+        cache = self.make_cache()
+        cache.set("a", "x" * 10)
+        cache.set("b", "y" * 10)
+        cache.close()
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertEqual(cli(["cache", "stats", "--path", self.db_path]), 0)
+        self.assertIn("entries: 2", out.getvalue())
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            cli(["cache", "prune", "--path", self.db_path, "--max-bytes", "10", "--vacuum"])
+        self.assertIn("evicted: 1", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
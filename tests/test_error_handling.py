@@ -1,7 +1,7 @@
 """Test error handling in APICenter."""
 
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock, patch
 
 
 class TestErrorHandling(unittest.TestCase):
@@ -97,7 +97,7 @@ class TestErrorHandling(unittest.TestCase):
         self.assertIn("Model not found", str(context.exception))
         self.assertIn("Ollama API error", str(context.exception))
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_stability_error_handling(self, mock_post):
         """Test that Stability AI API errors are properly handled."""
         # Import inside the test to ensure the mock is applied
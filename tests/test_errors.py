@@ -0,0 +1,140 @@
+"""Test the typed provider error hierarchy."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from apicenter.core.errors import (
+    APICenterError,
+    APIConnectionError,
+    AuthenticationError,
+    ContentFilterError,
+    InvalidRequestError,
+    RateLimitError,
+    RequestTimeoutError,
+    ServerError,
+    parse_retry_after,
+    translate_error,
+)
+
+
+def openai_status_error(status_code, headers=None, message="error"):
+    """Build a real OpenAI SDK status error for the given response."""
+    import openai
+
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status_code, headers=headers or {}, request=request)
+    return openai.APIStatusError(message, response=response, body=None)
+
+
+class TestErrors(unittest.TestCase):
+    """Test the typed provider error hierarchy."""
+
+    def test_status_codes_map_to_error_types(self):
+        """Test that HTTP statuses become the matching typed errors."""
+        cases = {
+            401: AuthenticationError,
+            403: AuthenticationError,
+            400: InvalidRequestError,
+            408: RequestTimeoutError,
+            429: RateLimitError,
+            500: ServerError,
+            529: ServerError,
+        }
+        for status_code, error_class in cases.items():
+            error = translate_error("openai", openai_status_error(status_code), "OpenAI API error")
+            self.assertIs(type(error), error_class)
+            self.assertEqual(error.status_code, status_code)
+            self.assertEqual(error.provider, "openai")
+            self.assertTrue(str(error).startswith("OpenAI API error: "))
+
+        # Typed errors are still ValueErrors for existing handlers
+        self.assertIsInstance(error, ValueError)
+
+    def test_retry_metadata(self):
+        """Test that retry hints and headers are preserved."""
+        error = translate_error(
+            "openai",
+            openai_status_error(
+                429, {"retry-after-ms": "1500", "x-ratelimit-remaining-requests": "0"}
+            ),
+            "OpenAI API error",
+        )
+
+        self.assertTrue(error.retryable)
+        self.assertEqual(error.retry_after, 1.5)
+        self.assertEqual(error.headers["x-ratelimit-remaining-requests"], "0")
+        self.assertIsNotNone(error.response)
+
+        self.assertEqual(parse_retry_after({"Retry-After": "7"}), 7.0)
+        self.assertIsNone(parse_retry_after({}))
+
+        # A spent quota is a 429 that waiting will not fix
+        quota = translate_error(
+            "openai", openai_status_error(429, message="insufficient_quota"), "OpenAI API error"
+        )
+        self.assertIsInstance(quota, RateLimitError)
+        self.assertFalse(quota.retryable)
+
+    def test_transport_errors(self):
+        """Test that timeouts, connection failures and content filters are recognised."""
+        request = httpx.Request("POST", "https://api.stability.ai")
+
+        timeout = translate_error("stability", httpx.ReadTimeout("slow", request=request), "x")
+        self.assertIsInstance(timeout, RequestTimeoutError)
+        self.assertTrue(timeout.retryable)
+
+        refused = translate_error("ollama", ConnectionRefusedError("refused"), "x")
+        self.assertIsInstance(refused, APIConnectionError)
+
+        blocked = translate_error(
+            "openai", openai_status_error(400, message="content_policy_violation"), "x"
+        )
+        self.assertIsInstance(blocked, ContentFilterError)
+        self.assertFalse(blocked.retryable)
+
+        # Unknown failures keep the base type
+        self.assertIs(type(translate_error("openai", Exception("boom"), "x")), APICenterError)
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("requests.Session.post")
+    def test_stability_rate_limit(self, mock_post, mock_get_credentials):
+        """Test that Stability AI throttling surfaces as RateLimitError through the mode API."""
+        from apicenter import apicenter
+
+        mock_get_credentials.return_value = {"api_key": "test-key"}
+        response = MagicMock()
+        response.status_code = 429
+        response.headers = {"Retry-After": "3"}
+        response.json.return_value = {"name": "rate_limit_exceeded", "message": "Slow down"}
+        mock_post.return_value = response
+
+        with self.assertRaises(RateLimitError) as context:
+            apicenter.image("stability", "stable-diffusion-xl-1024-v1-0", "A cat", retry=False)
+
+        self.assertEqual(context.exception.retry_after, 3.0)
+        self.assertEqual(context.exception.provider, "stability")
+        self.assertIn("Slow down", str(context.exception))
+
+    @patch("apicenter.audio.providers.elevenlabs.ElevenLabs")
+    def test_elevenlabs_status(self, mock_elevenlabs_class):
+        """Test that ElevenLabs SDK errors keep their status code."""
+        from elevenlabs.core.api_error import ApiError
+
+        from apicenter.audio.providers.elevenlabs import call_elevenlabs
+
+        mock_client = MagicMock()
+        mock_elevenlabs_class.return_value = mock_client
+        mock_client.text_to_speech.convert.side_effect = ApiError(
+            status_code=401, headers={}, body={"detail": "invalid_api_key"}
+        )
+
+        with self.assertRaises(AuthenticationError) as context:
+            call_elevenlabs("eleven_multilingual_v2", "Hi", credentials={"api_key": "bad"})
+
+        self.assertIn("ElevenLabs audio generation error", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""Test provider fallback chains."""
+
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from apicenter.core.errors import InvalidRequestError, RateLimitError, ServerError
+from apicenter.core.fallback import FallbackPolicy, translate_kwargs
+
+
+class TestFallback(unittest.TestCase):
+    """Test provider fallback chains."""
+
+    def test_translate_kwargs(self):
+        """Test that options are renamed for the target provider and unsupported ones dropped."""
+        kwargs = {"max_tokens": 100, "seed": 1, "temperature": 0}
+        self.assertEqual(
+            translate_kwargs("ollama", kwargs), {"num_predict": 100, "seed": 1, "temperature": 0}
+        )
+        self.assertEqual(
+            translate_kwargs("anthropic", kwargs), {"max_tokens": 100, "temperature": 0}
+        )
+        self.assertEqual(
+            translate_kwargs("anthropic", {"stop": ["\n"]}), {"stop_sequences": ["\n"]}
+        )
+
+        # Image options follow the request between OpenAI and Stability AI
+        self.assertEqual(
+            translate_kwargs("stability", {"n": 2, "size": "1024x1024", "quality": "hd"}),
+            {"samples": 2},
+        )
+        self.assertEqual(
+            translate_kwargs("openai", {"samples": 2, "cfg_scale": 7.0, "steps": 30}), {"n": 2}
+        )
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_ollama")
+    @patch("apicenter.text.text.call_openai")
+    @patch("apicenter.text.text.call_anthropic")
+    def test_chain_moves_on_retryable_errors(
+        self, mock_anthropic, mock_openai, mock_ollama, mock_get
+    ):
+        """Test that each hop is tried in order with translated options and the route recorded."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_anthropic.side_effect = ServerError("overloaded", status_code=529)
+        mock_openai.side_effect = RateLimitError("429")
+        mock_ollama.return_value = "Hello from llama"
+
+        result = apicenter.text(
+            "anthropic",
+            "claude-3-haiku",
+            "Hi",
+            max_tokens=50,
+            retry=False,
+            fallbacks=[("openai", "gpt-4o-mini"), ("ollama", "llama3", {"temperature": 0.1})],
+        )
+
+        self.assertEqual(result, "Hello from llama")
+        self.assertEqual(mock_ollama.call_args[1]["num_predict"], 50)
+        self.assertEqual(mock_ollama.call_args[1]["temperature"], 0.1)
+        self.assertNotIn("fallbacks", mock_anthropic.call_args[1])
+
+        route = apicenter.last_route()
+        self.assertEqual(route.served_by, ("ollama", "llama3"))
+        self.assertEqual(route.fallbacks, 2)
+        self.assertEqual(
+            route.tried,
+            [("anthropic", "claude-3-haiku"), ("openai", "gpt-4o-mini"), ("ollama", "llama3")],
+        )
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_openai")
+    @patch("apicenter.text.text.call_anthropic")
+    def test_named_policy_and_permanent_errors(self, mock_anthropic, mock_openai, mock_get):
+        """Test named policies, and that errors caused by the request are raised at once."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        apicenter.fallbacks.set("chat", [("openai", "gpt-4o-mini")])
+        self.addCleanup(apicenter.fallbacks.remove, "chat")
+
+        mock_anthropic.side_effect = InvalidRequestError("bad request", status_code=400)
+        with self.assertRaises(InvalidRequestError):
+            apicenter.text("anthropic", "claude-3-haiku", "Hi", retry=False, fallbacks="chat")
+        mock_openai.assert_not_called()
+
+        # The last hop's error is raised when every hop fails
+        mock_anthropic.side_effect = ServerError("500")
+        mock_openai.side_effect = ServerError("502")
+        with self.assertRaises(ServerError) as context:
+            apicenter.text("anthropic", "claude-3-haiku", "Hi", retry=False, fallbacks="chat")
+        self.assertEqual(str(context.exception), "502")
+        self.assertIsNone(apicenter.last_route().served_by)
+
+        with self.assertRaises(ValueError):
+            apicenter.text("anthropic", "claude-3-haiku", "Hi", fallbacks="missing")
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_openai")
+    @patch("apicenter.text.text.call_anthropic")
+    def test_hop_timeout(self, mock_anthropic, mock_openai, mock_get):
+        """Test that a hop overrunning its timeout is abandoned for the next one."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_anthropic.side_effect = lambda *args, **kwargs: time.sleep(0.5) or "late"
+        mock_openai.return_value = "Hello"
+        policy = FallbackPolicy([("openai", "gpt-4o-mini")], hop_timeout=0.05)
+
+        started = time.monotonic()
+        self.assertEqual(apicenter.text("anthropic", "claude", "Hi", fallbacks=policy), "Hello")
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertIn("RequestTimeoutError", apicenter.last_route().errors[0][2])
+
+        # The abandoned hop was told to stop at its timeout as well
+        self.assertLessEqual(mock_anthropic.call_args[1]["timeout"], 0.05)
+
+
+class TestAsyncFallback(unittest.IsolatedAsyncioTestCase):
+    """Test fallback chains in the async API."""
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.acall_openai")
+    @patch("apicenter.text.text.acall_anthropic")
+    async def test_async_chain_and_timeout(self, mock_anthropic, mock_openai, mock_get):
+        """Test that async chains cancel a slow hop and record the route per task."""
+        from apicenter import apicenter
+
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(1)
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_anthropic.side_effect = slow
+        mock_openai.return_value = "Hello"
+
+        policy = FallbackPolicy([("openai", "gpt-4o-mini")], hop_timeout=0.05)
+        result = await apicenter.atext("anthropic", "claude", "Hi", fallbacks=policy)
+        self.assertEqual(result, "Hello")
+        self.assertEqual(apicenter.last_route().served_by, ("openai", "gpt-4o-mini"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+"""Test hedged requests."""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from apicenter.core.hedge import HedgeBudget, HedgePolicy, Hedger, LatencyTracker
+
+
+class TestHedge(unittest.TestCase):
+    """Test hedged requests."""
+
+    def test_delay_from_percentile(self):
+        """Test that the hedge delay follows recent latencies once there are enough."""
+        hedger = Hedger()
+        policy = HedgePolicy(percentile=90, min_samples=10, initial_delay=1.5, min_delay=0.01)
+        key = ("latency", "openai", "gpt-4o")
+        self.assertEqual(hedger.delay(policy, key), 1.5)
+
+        for i in range(1, 11):
+            hedger.latencies.record(key, i / 10)
+        self.assertEqual(hedger.delay(policy, key), 1.0)
+        self.assertEqual(LatencyTracker().percentile(key, 50), None)
+
+    def test_budget_caps_hedge_rate(self):
+        """Test that hedges are limited to the budget ratio after the burst."""
+        budget = HedgeBudget(ratio=0.25, burst=1)
+        hedges = 0
+        for _ in range(100):
+            budget.earn()
+            hedges += budget.try_spend()
+        self.assertLessEqual(hedges, 26)
+        self.assertGreaterEqual(hedges, 24)
+
+    def test_slow_primary_is_hedged(self):
+        """Test that the backup wins when the primary is slow and fast calls are not hedged."""
+        hedger = Hedger()
+        policy = HedgePolicy(initial_delay=0.05, to=("anthropic", "claude", {"temperature": 0}))
+        calls = []
+        release = threading.Event()
+
+        def call(provider, model, kwargs):
+            calls.append((provider, model, kwargs))
+            if provider == "openai":
+                release.wait(1)
+                return "slow"
+            return "fast"
+
+        started = time.monotonic()
+        self.assertEqual(hedger.run(policy, "openai", "gpt-4o", {"max_tokens": 5}, call), "fast")
+        self.assertLess(time.monotonic() - started, 0.5)
+        release.set()
+        self.assertEqual(calls[1], ("anthropic", "claude", {"max_tokens": 5, "temperature": 0}))
+
+        self.assertEqual(
+            hedger.run(policy, "anthropic", "claude", {}, lambda p, m, k: "quick"), "quick"
+        )
+        stats = hedger.stats()
+        self.assertEqual((stats["requests"], stats["hedges"], stats["hedge_wins"]), (2, 1, 1))
+
+    def test_budget_exhausted_waits_for_primary(self):
+        """Test that no backup is sent once the budget is spent."""
+        hedger = Hedger()
+        policy = HedgePolicy(initial_delay=0.01, budget_ratio=0, budget_burst=0)
+        calls = []
+
+        def call(provider, model, kwargs):
+            calls.append(provider)
+            time.sleep(0.05)
+            return "done"
+
+        self.assertEqual(hedger.run(policy, "openai", "gpt-4o", {}, call), "done")
+        self.assertEqual(calls, ["openai"])
+        self.assertEqual(hedger.stats()["budget_denied"], 1)
+
+    def test_queued_primary_is_not_hedged(self):
+        """Test that time waiting for a worker does not count towards the hedge delay."""
+        hedger = Hedger(max_workers=1)
+        policy = HedgePolicy(initial_delay=0.1)
+        self.addCleanup(hedger.get_executor().shutdown)
+
+        # Keep the only worker busy for longer than the hedge delay
+        hedger.get_executor().submit(time.sleep, 0.3)
+
+        self.assertEqual(hedger.run(policy, "openai", "gpt-4o", {}, lambda p, m, k: "done"), "done")
+        self.assertEqual(hedger.stats()["hedges"], 0)
+
+    def test_stream_hedges_on_first_event(self):
+        """Test that the stream with the first event wins and the other is closed."""
+        hedger = Hedger()
+        policy = HedgePolicy(initial_delay=0.05, to=("anthropic", "claude"))
+        closed = threading.Event()
+
+        def open_stream(provider, model, kwargs):
+            def events():
+                try:
+                    if provider == "openai":
+                        time.sleep(0.3)
+                    yield f"{provider}-1"
+                    yield f"{provider}-2"
+                finally:
+                    if provider == "openai":
+                        closed.set()
+
+            return events()
+
+        events = list(hedger.stream(policy, "openai", "gpt-4o", {}, open_stream))
+        self.assertEqual(events, ["anthropic-1", "anthropic-2"])
+        self.assertTrue(closed.wait(1))
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_openai")
+    def test_apicenter_text_hedge(self, mock_call, mock_get):
+        """Test that hedge= on APICenter.text duplicates a slow request."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        responses = iter([0.3, 0.0])
+
+        def reply(*args, **kwargs):
+            time.sleep(next(responses))
+            return "Hello"
+
+        mock_call.side_effect = reply
+        policy = HedgePolicy(initial_delay=0.05)
+        self.assertEqual(apicenter.text("openai", "gpt-4", "Hi", hedge=policy), "Hello")
+        self.assertEqual(mock_call.call_count, 2)
+        self.assertNotIn("hedge", mock_call.call_args[1])
+
+
+class TestAsyncHedge(unittest.IsolatedAsyncioTestCase):
+    """Test hedging in the async API."""
+
+    async def test_arun_cancels_loser(self):
+        """Test that the slower coroutine is cancelled once the backup wins."""
+        hedger = Hedger()
+        policy = HedgePolicy(initial_delay=0.02)
+        cancelled = []
+        delays = iter([1.0, 0.0])
+
+        async def call(provider, model, kwargs):
+            try:
+                await asyncio.sleep(next(delays))
+            except asyncio.CancelledError:
+                cancelled.append(provider)
+                raise
+            return "done"
+
+        self.assertEqual(await hedger.arun(policy, "openai", "gpt-4o", {}, call), "done")
+        self.assertEqual(cancelled, ["openai"])
+        self.assertEqual(hedger.stats()["hedge_wins"], 1)
+
+    async def test_astream_hedges(self):
+        """Test that async streams are hedged on time to first event."""
+        hedger = Hedger()
+        policy = HedgePolicy(initial_delay=0.02, to=("anthropic", "claude"))
+
+        def open_stream(provider, model, kwargs):
+            async def events():
+                if provider == "openai":
+                    await asyncio.sleep(1)
+                yield f"{provider}-1"
+                yield f"{provider}-2"
+
+            return events()
+
+        events = [e async for e in hedger.astream(policy, "openai", "gpt-4o", {}, open_stream)]
+        self.assertEqual(events, ["anthropic-1", "anthropic-2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Test the shared keep-alive HTTP session used by the Stability AI provider."""
+
+import base64
+import unittest
+from unittest.mock import MagicMock, patch
+
+from apicenter.core.http import HTTPSession
+
+
+class TestHTTPSession(unittest.TestCase):
+    """Test the shared keep-alive HTTP session."""
+
+    @patch("requests.Session.post")
+    def test_post_applies_default_timeouts(self, mock_post):
+        """Test that requests get the configured connect/read timeouts."""
+        session = HTTPSession(connect_timeout=2.0, read_timeout=30.0)
+        session.post("https://example.com", json={})
+
+        args, kwargs = mock_post.call_args
+        self.assertEqual(kwargs["timeout"], (2.0, 30.0))
+        self.assertEqual(session.stats()["requests"], 1)
+
+    def test_adapter_configuration(self):
+        """Test that pool sizes and retry settings reach the mounted adapter."""
+        session = HTTPSession(pool_maxsize=8, max_retries=3, keep_alive=False)
+
+        adapter = session.session.get_adapter("https://api.stability.ai")
+        self.assertIs(adapter, session.adapter)
+        self.assertEqual(adapter._pool_maxsize, 8)
+        self.assertEqual(adapter.max_retries.total, 3)
+
+        # Retries must never re-send a request the server may have processed
+        self.assertEqual(adapter.max_retries.read, 0)
+        self.assertEqual(session.session.headers["Connection"], "close")
+
+    def test_stats_report_connection_reuse(self):
+        """Test that the reuse rate is computed from urllib3 pool counters."""
+        session = HTTPSession()
+
+        # Fake a host pool that served four requests over one connection
+        fake_pool = MagicMock(num_connections=1, num_requests=4)
+        session.adapter.poolmanager.pools["api.stability.ai"] = fake_pool
+
+        stats = session.stats()
+        self.assertEqual(stats["connections_opened"], 1)
+        self.assertEqual(stats["pooled_requests"], 4)
+        self.assertAlmostEqual(stats["connection_reuse_rate"], 0.75)
+
+    @patch("requests.Session.post")
+    def test_stability_uses_shared_session(self, mock_post):
+        """Test that call_stability reuses one session across calls."""
+        from apicenter.image.providers import stability
+
+        # Setup mock response
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "artifacts": [{"base64": base64.b64encode(b"image").decode("utf-8")}]
+        }
+        mock_post.return_value = mock_response
+
+        session = stability.configure_session(read_timeout=60.0)
+        for _ in range(2):
+            stability.call_stability(
+                model="stable-diffusion-v1-6",
+                prompt="A lighthouse",
+                credentials={"api_key": "test_key"},
+            )
+
+        # Check that both calls went through the configured session
+        self.assertIs(stability.get_session(), session)
+        self.assertEqual(stability.session_stats()["requests"], 2)
+        self.assertEqual(mock_post.call_args[1]["timeout"], (5.0, 60.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,15 @@
 """Test the Stability AI image provider."""
 
-import unittest
-from unittest.mock import patch, MagicMock
-import json
 import base64
+import json
+import unittest
+from unittest.mock import MagicMock, patch
 
 
 class TestStabilityAI(unittest.TestCase):
     """Test the Stability AI image provider."""
 
-    @patch("apicenter.image.providers.stability.requests.post")
+    @patch("requests.Session.post")
     def test_call_stability_with_parameters(self, mock_post):
         """Test that parameters are handled correctly."""
         # Import inside the test to ensure the mock is applied
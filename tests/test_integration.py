@@ -1,9 +1,9 @@
 """Integration tests for APICenter."""
 
-import unittest
-from unittest.mock import patch, MagicMock
-import json
 import io
+import json
+import unittest
+from unittest.mock import MagicMock, patch
 
 
 class TestAPIIntegration(unittest.TestCase):
@@ -15,6 +15,9 @@ class TestAPIIntegration(unittest.TestCase):
 
         self.apicenter = apicenter
 
+        # Start every test with an empty client pool so mocked SDK classes are used
+        self.apicenter.close()
+
     @patch("apicenter.text.providers.openai.OpenAI")
     def test_text_integration_openai(self, mock_openai_class):
         """Test the full text generation flow with OpenAI."""
@@ -59,7 +62,9 @@ class TestAPIIntegration(unittest.TestCase):
             mock_get.assert_called_once_with("text", "openai")
 
             # Verify that the OpenAI client was created correctly
-            mock_openai_class.assert_called_once_with(api_key="test-key", organization="test-org")
+            mock_openai_class.assert_called_once_with(
+                api_key="test-key", organization="test-org", max_retries=0
+            )
 
             # Verify that the completion was called with the right parameters
             mock_create.assert_called_once()
@@ -70,7 +75,7 @@ class TestAPIIntegration(unittest.TestCase):
             self.assertEqual(kwargs["messages"][0]["content"], "Test prompt")
             self.assertEqual(kwargs["temperature"], 0.7)
 
-    @patch("apicenter.image.providers.stability.requests.post")
+    @patch("requests.Session.post")
     def test_image_integration_stability(self, mock_post):
         """Test the full image generation flow with Stability AI."""
         # Mock the requests response
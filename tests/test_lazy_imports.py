@@ -0,0 +1,86 @@
+"""Test that provider SDKs are only imported when first used."""
+
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+# Modules that importing the package must not pull in
+HEAVY_MODULES = ("openai", "anthropic", "ollama", "elevenlabs", "requests", "httpx")
+
+
+def loaded_after(code: str) -> list:
+    """Run code in a fresh interpreter and return which heavy modules it imported."""
+    script = (
+        f"{code}\nimport sys\nprint(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return output.split()
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test that provider SDKs are only imported when first used."""
+
+    def test_import_loads_no_sdks(self):
+        """Test that importing the package and its mode modules costs only the core."""
+        self.assertEqual(loaded_after("import apicenter"), [])
+        self.assertEqual(
+            loaded_after(
+                "import apicenter.text.text, apicenter.image.image, apicenter.audio.audio"
+            ),
+            [],
+        )
+
+    def test_first_use_loads_one_provider(self):
+        """Test that using a provider imports its SDK and no other."""
+        loaded = loaded_after(
+            "from apicenter.text.text import TextProvider\nTextProvider('ollama', 'llama3', 'Hi')"
+        )
+        self.assertIn("ollama", loaded)
+        self.assertNotIn("openai", loaded)
+        self.assertNotIn("elevenlabs", loaded)
+
+    def test_names_resolve_on_access(self):
+        """Test that provider functions can still be imported from the mode modules."""
+        from apicenter.text import text
+        from apicenter.text.providers.ollama import call_ollama
+
+        self.assertIs(text.call_ollama, call_ollama)
+        with self.assertRaises(AttributeError):
+            text.call_missing
+
+    def test_resolve_is_idempotent(self):
+        """Test that resolving names imports a provider once and never writes the module."""
+        from apicenter.core.lazy import LazyProviders
+
+        namespace = {"__name__": "mode"}
+        providers = LazyProviders(
+            namespace, {"json": ("json", {"dumps": "dumps", "loads": "loads"})}
+        )
+        with patch("apicenter.core.lazy.importlib.import_module") as mock_import:
+            for name in ("dumps", "loads", "dumps"):
+                providers.resolve(name)
+            mock_import.assert_called_once_with("json")
+        self.assertEqual(namespace, {"__name__": "mode"})
+
+        # A name the module defines itself, e.g. a patch, takes precedence
+        namespace["dumps"] = "patched"
+        self.assertEqual(providers.resolve("dumps"), "patched")
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    def test_patches_survive_loading(self, mock_get):
+        """Test that a patched provider function is kept when its provider loads later."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        with patch("apicenter.audio.audio.call_elevenlabs") as mock_call:
+            mock_call.return_value = b"audio"
+            self.assertEqual(
+                apicenter.audio("elevenlabs", "eleven_multilingual_v2", "Hi"), b"audio"
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""Test per-request metrics records, aggregation and the Prometheus exporter."""
+
+import unittest
+import urllib.request
+from unittest.mock import MagicMock, patch
+
+from apicenter.core.metrics import MetricsAggregator, PrometheusExporter, RequestRecord
+
+
+class TestRequestMetrics(unittest.TestCase):
+    """Test that requests produce metrics records."""
+
+    def setUp(self):
+        """Collect the records of every request made by a test."""
+        from apicenter.apicenter import APICenter
+        from apicenter.core.retry import RetryPolicy
+
+        self.center = APICenter()
+        self.records = []
+        self.center.metrics.add_hook(self.records.append)
+        self.addCleanup(self.center.metrics.remove_hook, self.records.append)
+        self.retry = RetryPolicy(sleep=lambda delay: None)
+
+    @patch("apicenter.text.text.call_openai")
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    def test_records_retries_and_size(self, mock_get, mock_call):
+        """Test that a request that succeeds on retry is recorded once with both attempts."""
+        from apicenter.core.errors import ServerError
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.side_effect = [ServerError("busy", provider="openai"), "Hé"]
+
+        self.center.text("openai", "gpt-4", "Hi", retry=self.retry)
+
+        (record,) = self.records
+        self.assertEqual((record.mode, record.provider, record.model), ("text", "openai", "gpt-4"))
+        self.assertEqual((record.attempts, record.retries), (2, 1))
+        self.assertEqual(record.response_bytes, 3)
+        self.assertIsNone(record.error)
+        self.assertEqual(record.ttfb, record.latency)
+
+    @patch("apicenter.text.text.call_openai")
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    def test_records_errors_and_cache_hits(self, mock_get, mock_call):
+        """Test that failures carry their error class and cached answers are marked."""
+        from apicenter.core.cache import ResponseCache
+        from apicenter.core.errors import AuthenticationError
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.side_effect = AuthenticationError("bad key", provider="openai")
+        with self.assertRaises(AuthenticationError):
+            self.center.text("openai", "gpt-4", "Hi")
+        self.assertEqual(self.records[-1].error, "AuthenticationError")
+
+        self.center.cache = ResponseCache()
+        mock_call.side_effect = None
+        mock_call.return_value = "cached"
+        self.center.text("openai", "gpt-4", "Hi", temperature=0)
+        self.center.text("openai", "gpt-4", "Hi", temperature=0)
+        self.assertEqual([r.cache_hit for r in self.records[1:]], [False, True])
+        self.assertEqual(mock_call.call_count, 2)
+
+    @patch("apicenter.text.text.create_openai_client")
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    def test_provider_reports_usage(self, mock_get, mock_create):
+        """Test that token counts from the provider's response reach the record."""
+        mock_get.return_value = {"api_key": "key"}
+        response = MagicMock(choices=[MagicMock(message=MagicMock(content="Hi"))])
+        response.usage.prompt_tokens = 7
+        response.usage.completion_tokens = 2
+        mock_create.return_value.chat.completions.create.return_value = response
+
+        self.center.text("openai", "gpt-4", "Hello")
+
+        self.assertEqual((self.records[0].input_tokens, self.records[0].output_tokens), (7, 2))
+
+    @patch("apicenter.text.text.stream_openai")
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    def test_stream_records_first_event(self, mock_get, mock_stream):
+        """Test that a stream's record is finished when it ends, with its usage and size."""
+        from apicenter.core.streaming import StreamSummary, TextDelta
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_stream.return_value = iter(
+            [
+                TextDelta("Hel"),
+                TextDelta("lo"),
+                StreamSummary("Hello", "stop", {"output_tokens": 2}),
+            ]
+        )
+
+        events = self.center.text_stream("openai", "gpt-4", "Hi")
+        self.assertEqual(self.records, [])
+        list(events)
+
+        (record,) = self.records
+        self.assertTrue(record.stream)
+        self.assertLessEqual(record.ttfb, record.latency)
+        self.assertEqual((record.response_bytes, record.output_tokens), (5, 2))
+
+    @patch("apicenter.text.text.call_openai")
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    def test_failing_hook_and_disabled_metrics(self, mock_get, mock_call):
+        """Test that a broken hook cannot fail requests and metrics can be switched off."""
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.return_value = "ok"
+        broken = MagicMock(side_effect=RuntimeError("exporter down"))
+        self.center.metrics.add_hook(broken)
+        self.addCleanup(self.center.metrics.remove_hook, broken)
+
+        self.assertEqual(self.center.text("openai", "gpt-4", "Hi"), "ok")
+        broken.assert_called_once()
+
+        self.center.metrics.enabled = False
+        self.addCleanup(setattr, self.center.metrics, "enabled", True)
+        self.center.text("openai", "gpt-4", "Hi")
+        self.assertEqual(len(self.records), 1)
+
+
+class TestAggregation(unittest.TestCase):
+    """Test in-memory aggregation and the Prometheus text format."""
+
+    def make_aggregator(self):
+        """Return an aggregator holding three requests to one model."""
+        aggregator = MetricsAggregator(fold_every=2)
+        aggregator.add(RequestRecord("text", "openai", "gpt-4", latency=0.2, output_tokens=5))
+        aggregator.add(RequestRecord("text", "openai", "gpt-4", latency=3.0, attempts=3))
+        aggregator.add(RequestRecord("text", "openai", "gpt-4", latency=0.01, error="ServerError"))
+        return aggregator
+
+    def test_stats(self):
+        """Test that records are folded into per-model totals."""
+        stats = self.make_aggregator().stats()["text/openai/gpt-4"]
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["errors"], {"ServerError": 1})
+        self.assertEqual(stats["output_tokens"], 5)
+
+    def test_prometheus_text(self):
+        """Test the exposition format, including cumulative histogram buckets."""
+        text = PrometheusExporter(self.make_aggregator()).render()
+        labels = '{mode="text",provider="openai",model="gpt-4"'
+
+        self.assertIn("# TYPE apicenter_requests_total counter", text)
+        self.assertIn(f"apicenter_requests_total{labels}}} 3", text)
+        self.assertIn(f'apicenter_errors_total{labels},error="ServerError"}} 1', text)
+        self.assertIn(f'apicenter_request_duration_seconds_bucket{labels},le="0.05"}} 1', text)
+        self.assertIn(f'apicenter_request_duration_seconds_bucket{labels},le="2.5"}} 2', text)
+        self.assertIn(f'apicenter_request_duration_seconds_bucket{labels},le="+Inf"}} 3', text)
+        self.assertIn(f"apicenter_request_duration_seconds_count{labels}}} 3", text)
+
+        aggregator = MetricsAggregator()
+        aggregator.add(RequestRecord("text", "custom", 'my"model'))
+        self.assertIn('model="my\\"model"', PrometheusExporter(aggregator).render())
+
+    def test_serve(self):
+        """Test that the exporter answers scrapes over HTTP."""
+        server = PrometheusExporter(self.make_aggregator()).serve(port=0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            self.assertIn("version=0.0.4", response.headers["Content-Type"])
+            self.assertIn("apicenter_requests_total", response.read().decode())
+
+
+if __name__ == "__main__":
+    unittest.main()
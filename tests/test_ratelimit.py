@@ -0,0 +1,110 @@
+"""Test client-side rate limiting."""
+
+import time
+import unittest
+from unittest.mock import patch
+
+from apicenter.core.errors import RateLimitError, RateLimitExceeded
+from apicenter.core.ratelimit import RateLimit, RateLimiter, estimate_tokens
+
+
+class TestRateLimit(unittest.TestCase):
+    """Test client-side rate limiting."""
+
+    def test_estimate_tokens(self):
+        """Test that estimates cover the prompt plus the output cap."""
+        self.assertEqual(estimate_tokens("x" * 40, {}), 11)
+        self.assertEqual(estimate_tokens("x" * 40, {"max_tokens": 100}), 111)
+
+        messages = [{"role": "system", "content": "x" * 20}, {"role": "user", "content": "y" * 19}]
+        self.assertEqual(estimate_tokens(messages, {}), 11)
+
+    def test_request_and_token_budgets(self):
+        """Test that both the request and token buckets gate acquisition."""
+        limit = RateLimit(rpm=2, tpm=60000)
+        limit.acquire(tokens=10, mode="fail")
+        limit.acquire(tokens=10, mode="fail")
+
+        with self.assertRaises(RateLimitExceeded) as context:
+            limit.acquire(tokens=10, mode="fail")
+
+        # A refill of one request per 30s takes close to 30s
+        self.assertAlmostEqual(context.exception.retry_after, 30.0, delta=0.5)
+        self.assertIsInstance(context.exception, RateLimitError)
+        self.assertFalse(context.exception.retryable)
+
+        tokens = RateLimit(tpm=600)
+        tokens.acquire(tokens=600, mode="fail")
+        with self.assertRaises(RateLimitExceeded):
+            tokens.acquire(tokens=1, mode="fail")
+
+    def test_block_and_timeout_modes(self):
+        """Test that block waits for capacity and timeout gives up when it cannot arrive."""
+        limit = RateLimit(rpm=600)
+        limit.requests.tokens = 0
+
+        # One request refills every 0.1s
+        started = time.monotonic()
+        limit.acquire(mode="block")
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertEqual(limit.stats()["waits"], 1)
+
+        limit.requests.tokens = 0
+        with self.assertRaises(RateLimitExceeded):
+            limit.acquire(mode="timeout", timeout=0.01)
+        self.assertEqual(limit.stats()["rejections"], 1)
+
+    def test_limiter_resolves_config_and_overrides(self):
+        """Test per-model config, overrides and per-key buckets."""
+        limiter = RateLimiter()
+        config = {"rpm": 500, "tpm": 200000, "models": {"gpt-4o": {"tpm": 30000}}}
+
+        limit = limiter.get("openai", "gpt-4o", "key-a", config)
+        self.assertEqual((limit.rpm, limit.tpm), (500, 30000))
+        self.assertIs(limiter.get("openai", "gpt-4o", "key-a", config), limit)
+        self.assertIsNot(limiter.get("openai", "gpt-4o", "key-b", config), limit)
+        self.assertIsNone(limiter.get("anthropic", "claude", "key-a", None))
+
+        limiter.set_limits("openai", rpm=10, model="gpt-4o")
+        self.assertEqual(limiter.get("openai", "gpt-4o", "key-a", config).rpm, 10)
+
+        # API keys never appear in statistics
+        self.assertNotIn("key-a", " ".join(limiter.stats()))
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_openai")
+    def test_apicenter_fail_fast(self, mock_call, mock_get):
+        """Test that limits from credentials apply to APICenter calls."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "limited-key", "rate_limits": {"rpm": 1}}
+        mock_call.return_value = "Hello"
+        self.addCleanup(apicenter.rate_limiter.reset)
+
+        self.assertEqual(apicenter.text("openai", "gpt-4", "Hi", rate_limit="fail"), "Hello")
+        with self.assertRaises(RateLimitExceeded):
+            apicenter.text("openai", "gpt-4", "Hi", rate_limit="fail")
+
+        self.assertEqual(mock_call.call_count, 1)
+        self.assertNotIn("rate_limit", mock_call.call_args[1])
+        stats = next(iter(apicenter.rate_limit_stats().values()))
+        self.assertEqual(stats["rejections"], 1)
+
+
+class TestAsyncRateLimit(unittest.IsolatedAsyncioTestCase):
+    """Test rate limiting from asyncio."""
+
+    async def test_aacquire_waits(self):
+        """Test that async acquisition sleeps until capacity is available."""
+        limit = RateLimit(rpm=1200)
+        limit.requests.tokens = 0
+
+        await limit.aacquire(mode="block")
+        self.assertEqual(limit.stats()["acquired"], 1)
+
+        with self.assertRaises(RateLimitExceeded):
+            await limit.aacquire(mode="fail")
+
+
+if __name__ == "__main__":
+    unittest.main()
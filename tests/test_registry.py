@@ -0,0 +1,104 @@
+"""Test the provider registry and entry point discovery."""
+
+import unittest
+from importlib.metadata import EntryPoint
+from unittest.mock import patch
+
+from apicenter.core.base import BaseProvider
+
+
+class EchoProvider(BaseProvider[str]):
+    """An in-house text provider that answers with its prompt."""
+
+    def get_mode(self) -> str:
+        """Return the mode identifier for this provider."""
+        return "text"
+
+    def load_config(self):
+        """Use no credentials."""
+        return None
+
+    def call(self) -> str:
+        """Echo the prompt back."""
+        return f"{self.model}: {self.prompt}"
+
+
+class TestRegistry(unittest.TestCase):
+    """Test the provider registry and entry point discovery."""
+
+    def test_builtin_providers(self):
+        """Test that built-in providers resolve to their mode classes, including Deepseek."""
+        from apicenter.apicenter import APICenter
+        from apicenter.audio.audio import AudioProvider
+        from apicenter.text.text import TextProvider
+
+        center = APICenter()
+        self.assertIs(center.get_provider_class("text", "openai"), TextProvider)
+        self.assertIs(center.get_provider_class("text", "deepseek"), TextProvider)
+        self.assertIs(center.get_provider_class("audio", "elevenlabs"), AudioProvider)
+        self.assertIn("deepseek", center.registry.names("text"))
+
+    def test_import_path_loads_on_first_use(self):
+        """Test that a provider given as an import path is imported once, when requested."""
+        from apicenter.core.registry import ProviderRegistry
+
+        registry = ProviderRegistry()
+        with patch("apicenter.core.registry.importlib.import_module") as mock_import:
+            mock_import.return_value.EchoProvider = EchoProvider
+            registry.register("text", "echo", "inhouse.providers:EchoProvider")
+            mock_import.assert_not_called()
+
+            self.assertIs(registry.get("text", "echo"), EchoProvider)
+            self.assertIs(registry.get("text", "echo"), EchoProvider)
+            mock_import.assert_called_once_with("inhouse.providers")
+
+    def test_entry_points(self):
+        """Test that installed packages add providers without overriding registered ones."""
+        from apicenter.core.registry import ENTRY_POINT_GROUP, ProviderRegistry
+
+        found = [
+            EntryPoint("text.echo", "tests.test_registry:EchoProvider", ENTRY_POINT_GROUP),
+            EntryPoint("text.openai", "tests.test_registry:EchoProvider", ENTRY_POINT_GROUP),
+        ]
+        registry = ProviderRegistry({"text": {"openai": "apicenter.text.text:TextProvider"}})
+        with patch("apicenter.core.registry.entry_points", return_value=found) as mock_scan:
+            self.assertIs(registry.get("text", "echo"), EchoProvider)
+            self.assertEqual(registry.get("text", "openai").__name__, "TextProvider")
+            with self.assertRaises(ValueError):
+                registry.get("video", "echo")
+            mock_scan.assert_called_once_with(group=ENTRY_POINT_GROUP)
+
+    def test_rejects_non_providers(self):
+        """Test that a target that is not a provider class fails clearly."""
+        from apicenter.core.registry import ProviderRegistry
+
+        registry = ProviderRegistry({"text": {"bad": "json:loads"}})
+        with self.assertRaises(TypeError):
+            registry.get("text", "bad")
+
+    def test_registered_provider_is_callable(self):
+        """Test that a registered provider is used through the normal interface."""
+        from apicenter.apicenter import APICenter
+
+        center = APICenter()
+        center.register_provider("text", "echo", EchoProvider)
+        self.addCleanup(center.registry.unregister, "text", "echo")
+
+        self.assertEqual(center.text("echo", "v1", "Hi"), "v1: Hi")
+
+    @patch("apicenter.text.text.create_deepseek_client")
+    @patch("apicenter.text.text.call_deepseek")
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    def test_deepseek_is_reachable(self, mock_get, mock_call, mock_create):
+        """Test that Deepseek requests are dispatched to its implementation."""
+        from apicenter.apicenter import APICenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.return_value = "Deepseek response"
+
+        self.assertEqual(APICenter().text("deepseek", "deepseek-chat", "Hi"), "Deepseek response")
+        self.assertEqual(mock_call.call_args.kwargs["prompt"], "Hi")
+
+
+if __name__ == "__main__":
+    unittest.main()
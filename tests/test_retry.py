@@ -0,0 +1,180 @@
+"""Test the retry engine."""
+
+import io
+import unittest
+from unittest.mock import MagicMock, patch
+
+from apicenter.core.errors import (
+    AuthenticationError,
+    RateLimitError,
+    RequestTimeoutError,
+    ServerError,
+)
+from apicenter.core.retry import RetryPolicy, parse_reset, reset_delay
+
+
+class FlakyCall:
+    """Callable that raises the given errors before succeeding."""
+
+    def __init__(self, *errors):
+        """Store the errors to raise, in order."""
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        """Raise the next error or return a result."""
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class TestRetry(unittest.TestCase):
+    """Test the retry engine."""
+
+    def make_policy(self, **kwargs):
+        """Build a policy that records sleeps instead of sleeping."""
+        self.sleeps = []
+        return RetryPolicy(sleep=self.sleeps.append, **kwargs)
+
+    def test_retries_transient_errors_with_jitter(self):
+        """Test that server errors are retried with bounded decorrelated-jitter delays."""
+        policy = self.make_policy(max_attempts=3, base_delay=0.1, max_delay=1.0)
+        func = FlakyCall(ServerError("503"), ServerError("503"))
+
+        self.assertEqual(policy.call(func), "ok")
+        self.assertEqual(func.calls, 3)
+        self.assertEqual(len(self.sleeps), 2)
+        for delay in self.sleeps:
+            self.assertGreaterEqual(delay, 0.1)
+            self.assertLessEqual(delay, 1.0)
+
+        stats = policy.stats.as_dict()
+        self.assertEqual(stats["attempts"], 3)
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["errors"], {"ServerError": 2})
+        self.assertAlmostEqual(stats["sleep_seconds"], round(sum(self.sleeps), 3))
+
+    def test_honours_retry_after_and_gives_up(self):
+        """Test that Retry-After is used and exhausted attempts re-raise the error."""
+        policy = self.make_policy(max_attempts=2)
+        func = FlakyCall(RateLimitError("429", retry_after=2.5), RateLimitError("429"))
+
+        with self.assertRaises(RateLimitError):
+            policy.call(func)
+
+        self.assertEqual(self.sleeps, [2.5])
+        self.assertEqual(policy.stats.as_dict()["give_ups"], 1)
+
+    def test_non_retryable_and_deadline(self):
+        """Test that permanent errors, long waits and unsafe timeouts are not retried."""
+        policy = self.make_policy(max_attempts=5, deadline=10.0)
+
+        with self.assertRaises(AuthenticationError):
+            policy.call(FlakyCall(AuthenticationError("401")))
+
+        # A Retry-After beyond the deadline ends the call immediately
+        with self.assertRaises(RateLimitError):
+            policy.call(FlakyCall(RateLimitError("429", retry_after=60)))
+
+        # Client-side timeouts may have been billed and are only retried on request
+        with self.assertRaises(RequestTimeoutError):
+            policy.call(FlakyCall(RequestTimeoutError("timeout")))
+        self.assertEqual(self.sleeps, [])
+
+        timeouts = self.make_policy(retry_timeouts=True)
+        self.assertEqual(timeouts.call(FlakyCall(RequestTimeoutError("timeout"))), "ok")
+
+        # Non-idempotent calls only retry throttling, which never started any work
+        with self.assertRaises(ServerError):
+            policy.call(FlakyCall(ServerError("500")), idempotent=False)
+        self.assertEqual(policy.call(FlakyCall(RateLimitError("429")), idempotent=False), "ok")
+
+    def test_reset_headers(self):
+        """Test parsing of OpenAI and Anthropic rate-limit reset headers."""
+        self.assertEqual(parse_reset("6m0s"), 360.0)
+        self.assertEqual(parse_reset("20ms"), 0.02)
+        self.assertEqual(parse_reset("1.5s"), 1.5)
+        self.assertEqual(parse_reset("2030-01-01T00:00:00Z") > 0, True)
+
+        headers = {
+            "x-ratelimit-remaining-requests": "10",
+            "x-ratelimit-reset-requests": "1s",
+            "x-ratelimit-remaining-tokens": "0",
+            "x-ratelimit-reset-tokens": "7s",
+        }
+        self.assertEqual(reset_delay(headers), 7.0)
+
+        policy = self.make_policy()
+        policy.call(FlakyCall(RateLimitError("429", headers=headers)))
+        self.assertEqual(self.sleeps, [7.0])
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_openai")
+    def test_provider_policies(self, mock_call, mock_get):
+        """Test per-provider policies, per-call overrides and the sink safeguard."""
+        from apicenter import apicenter
+        from apicenter.audio.audio import AudioProvider
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.side_effect = [ServerError("502"), "Hello"]
+        policy = self.make_policy()
+        apicenter.retry_policies.set("openai", policy)
+        self.addCleanup(apicenter.retry_policies.reset)
+
+        self.assertEqual(apicenter.text("openai", "gpt-4", "Hi"), "Hello")
+        self.assertEqual(apicenter.retry_stats()["openai"]["retries"], 1)
+
+        # retry=False disables retries for one call
+        mock_call.side_effect = ServerError("502")
+        with self.assertRaises(ServerError):
+            apicenter.text("openai", "gpt-4", "Hi", retry=False)
+        self.assertNotIn("retry", mock_call.call_args[1])
+
+        # Writing into a caller's file object cannot be safely repeated
+        self.assertFalse(AudioProvider("elevenlabs", "m", "Hi", sink=io.BytesIO()).is_idempotent())
+        self.assertTrue(AudioProvider("elevenlabs", "m", "Hi", sink="out.mp3").is_idempotent())
+
+    def test_sdk_retries_disabled(self):
+        """Test that provider clients are built without SDK retries, leaving them to RetryPolicy."""
+        from apicenter.audio.providers.elevenlabs import build_params
+        from apicenter.text.providers import anthropic, deepseek, openai
+
+        for module, sync_name, async_name in [
+            (openai, "OpenAI", "AsyncOpenAI"),
+            (anthropic, "Anthropic", "AsyncAnthropic"),
+        ]:
+            with (
+                patch.object(module, sync_name) as sync_cls,
+                patch.object(module, async_name) as async_cls,
+            ):
+                module.create_client({"api_key": "key"})
+                module.create_async_client({"api_key": "key"})
+                sync_cls.assert_called_once_with(api_key="key", max_retries=0)
+                async_cls.assert_called_once_with(api_key="key", max_retries=0)
+
+        with patch.object(deepseek, "OpenAI") as client_cls:
+            deepseek.create_client({"api_key": "key"})
+            self.assertEqual(client_cls.call_args[1]["max_retries"], 0)
+
+        # ElevenLabs takes retries per request rather than per client
+        self.assertEqual(build_params("m", text="Hi")["request_options"], {"max_retries": 0})
+
+
+class TestAsyncRetry(unittest.IsolatedAsyncioTestCase):
+    """Test retries in the async API."""
+
+    async def test_acall_retries(self):
+        """Test that async calls are retried."""
+        func = FlakyCall(ServerError("500"))
+
+        async def call():
+            return func()
+
+        policy = RetryPolicy(base_delay=0.001, max_delay=0.001)
+        self.assertEqual(await policy.acall(call), "ok")
+        self.assertEqual(func.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Test latency- and throughput-aware routing."""
+
+import unittest
+from unittest.mock import patch
+
+from apicenter.core.errors import InvalidRequestError, ServerError
+from apicenter.core.router import Router
+
+POOL = [("openai", "gpt-4o-mini"), ("anthropic", "claude-3-haiku"), ("ollama", "llama3")]
+
+
+class TestRouter(unittest.TestCase):
+    """Test latency- and throughput-aware routing."""
+
+    def make_router(self):
+        """Build a router that never explores and has seen every candidate."""
+        router = Router(explore=0)
+        router.record("text", "openai", "gpt-4o-mini", 1.0, "x" * 400)
+        router.record("text", "anthropic", "claude-3-haiku", 0.5, "x" * 40)
+        router.record("text", "ollama", "llama3", 2.0, "x" * 4000)
+        return router
+
+    def test_unseen_candidates_first(self):
+        """Test that candidates without observations are tried before trusting averages."""
+        router = Router(explore=0)
+        router.record("text", "openai", "gpt-4o-mini", 0.1, "hi")
+        hop = router.choose("text", POOL)
+        self.assertEqual((hop.provider, hop.model), ("anthropic", "claude-3-haiku"))
+        self.assertEqual(router.decisions()[-1].reason, "no observations yet")
+
+    def test_objectives(self):
+        """Test lowest latency, highest throughput and cheapest within SLO."""
+        router = self.make_router()
+        self.assertEqual(router.choose("text", POOL, "latency").model, "claude-3-haiku")
+        self.assertEqual(router.choose("text", POOL, "throughput").model, "llama3")
+
+        router.set_cost("openai", "gpt-4o-mini", 0.6)
+        router.set_cost("anthropic", "claude-3-haiku", 1.25)
+        router.set_cost("ollama", "llama3", 0.0)
+        self.assertEqual(router.choose("text", POOL, "cost", slo=1.5).model, "gpt-4o-mini")
+        self.assertEqual(router.choose("text", POOL, "cost").model, "llama3")
+
+        decision = router.decisions()[-1]
+        self.assertEqual(decision.chosen, ("ollama", "llama3"))
+        self.assertEqual(
+            set(decision.scores),
+            {"openai/gpt-4o-mini", "anthropic/claude-3-haiku", "ollama/llama3"},
+        )
+
+        with self.assertRaises(ValueError):
+            router.choose("text", POOL, "fastest")
+
+    def test_errors_steer_traffic_away(self):
+        """Test that health errors raise a model's error rate and request errors do not."""
+        router = self.make_router()
+        router.record("text", "anthropic", "claude-3-haiku", 0.1, error=InvalidRequestError("400"))
+        self.assertEqual(router.stats()["text/anthropic/claude-3-haiku"]["errors"], 0)
+
+        for _ in range(5):
+            router.record("text", "anthropic", "claude-3-haiku", 0.1, error=ServerError("503"))
+        self.assertEqual(router.choose("text", POOL, "latency").model, "gpt-4o-mini")
+        self.assertGreater(router.stats()["text/anthropic/claude-3-haiku"]["error_rate"], 0.5)
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_ollama")
+    @patch("apicenter.text.text.call_openai")
+    def test_apicenter_route(self, mock_openai, mock_ollama, mock_get):
+        """Test that APICenter.route sends requests to the chosen model with translated options."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_openai.return_value = "Hello from openai"
+        mock_ollama.return_value = "Hello from llama"
+        self.addCleanup(apicenter.router.reset)
+        apicenter.router.reset()
+
+        pool = [("openai", "gpt-4o-mini"), ("ollama", "llama3")]
+        with patch.object(apicenter.router, "explore", 0):
+            self.assertEqual(apicenter.route("text", pool, "Hi", max_tokens=5), "Hello from openai")
+            self.assertEqual(apicenter.route("text", pool, "Hi", max_tokens=5), "Hello from llama")
+        self.assertEqual(mock_ollama.call_args[1]["num_predict"], 5)
+
+        stats = apicenter.route_stats()
+        self.assertEqual(stats["models"]["text/openai/gpt-4o-mini"]["calls"], 1)
+        self.assertEqual(stats["decisions"][-1].chosen, ("ollama", "llama3"))
+
+
+class TestAsyncRouter(unittest.IsolatedAsyncioTestCase):
+    """Test routing from the async API."""
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.acall_openai")
+    async def test_aroute(self, mock_acall, mock_get):
+        """Test that aroute awaits the chosen model and records its latency."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_acall.return_value = "Hello"
+        self.addCleanup(apicenter.router.reset)
+
+        result = await apicenter.aroute("text", [("openai", "gpt-4o-mini")], "Hi")
+        self.assertEqual(result, "Hello")
+        self.assertIn("text/openai/gpt-4o-mini", apicenter.route_stats()["models"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""Test writing image and audio results directly to sinks."""
+
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from apicenter.core.sink import write_to_sink
+
+
+class TestSink(unittest.TestCase):
+    """Test writing image and audio results directly to sinks."""
+
+    def setUp(self):
+        """Create a scratch directory for output files."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_write_to_path_buffer_and_file(self):
+        """Test that chunks are written to paths, buffers and open files."""
+        path = os.path.join(self.tmpdir.name, "out.bin")
+        self.assertEqual(write_to_sink(iter([b"ab", b"", b"cd"]), path), 4)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"abcd")
+
+        buffer = io.BytesIO()
+        self.assertEqual(write_to_sink([b"xy"], buffer, fsync=True), 2)
+        self.assertEqual(buffer.getvalue(), b"xy")
+
+        with open(path, "wb") as f:
+            write_to_sink([b"z"], f, fsync=True)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"z")
+
+    def test_atomic_write_leaves_no_partial_file(self):
+        """Test that a failed atomic write keeps the previous file and removes the temp file."""
+        path = os.path.join(self.tmpdir.name, "clip.mp3")
+        write_to_sink([b"old"], path, atomic=True, fsync=True)
+
+        def failing_chunks():
+            yield b"new"
+            raise ValueError("connection reset")
+
+        with self.assertRaises(ValueError):
+            write_to_sink(failing_chunks(), path, atomic=True)
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"old")
+        self.assertEqual(os.listdir(self.tmpdir.name), ["clip.mp3"])
+
+        # Atomic renames only make sense for paths
+        with self.assertRaises(ValueError):
+            write_to_sink([b"x"], io.BytesIO(), atomic=True)
+
+    @unittest.skipIf(os.name == "nt", "POSIX permissions")
+    def test_atomic_write_uses_umask_mode(self):
+        """Test that atomically written files get the same mode as a plain write."""
+        plain = os.path.join(self.tmpdir.name, "plain.mp3")
+        atomic = os.path.join(self.tmpdir.name, "atomic.mp3")
+        umask = os.umask(0o022)
+        self.addCleanup(os.umask, umask)
+
+        write_to_sink([b"x"], plain)
+
+        # The process-wide umask must not be touched, since other threads create files too
+        with (
+            patch("apicenter.core.sink._UMASK", 0o022),
+            patch("os.umask", side_effect=AssertionError("umask changed")),
+        ):
+            write_to_sink([b"x"], atomic, atomic=True)
+        self.assertEqual(os.stat(atomic).st_mode & 0o777, 0o644)
+        self.assertEqual(os.stat(atomic).st_mode, os.stat(plain).st_mode)
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.audio.audio.stream_elevenlabs")
+    def test_audio_sink(self, mock_stream, mock_get_credentials):
+        """Test that audio chunks are written to the sink and the byte count is returned."""
+        from apicenter import apicenter
+
+        mock_get_credentials.return_value = {"api_key": "test-key"}
+        mock_stream.side_effect = lambda **kwargs: iter([b"aa", b"bb"])
+        path = os.path.join(self.tmpdir.name, "speech.mp3")
+
+        written = apicenter.audio(
+            "elevenlabs", "eleven_multilingual_v2", "Hi", sink=path, atomic=True
+        )
+
+        self.assertEqual(written, 4)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"aabb")
+
+        # Sink options are consumed rather than forwarded to the API
+        for option in ("sink", "atomic", "fsync"):
+            self.assertNotIn(option, mock_stream.call_args[1])
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("requests.Session.post")
+    def test_stability_sink_streams_raw_png(self, mock_post, mock_get_credentials):
+        """Test that Stability AI is asked for raw PNG bytes that are streamed to the sink."""
+        from apicenter import apicenter
+
+        mock_get_credentials.return_value = {"api_key": "test-key"}
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {"content-type": "image/png"}
+        response.iter_content.return_value = iter([b"\x89PNG", b"data"])
+        response.__enter__.return_value = response
+        mock_post.return_value = response
+
+        buffer = io.BytesIO()
+        written = apicenter.image(
+            "stability", "stable-diffusion-xl-1024-v1-0", "A cat", sink=buffer
+        )
+
+        self.assertEqual(written, 8)
+        self.assertEqual(buffer.getvalue(), b"\x89PNGdata")
+        args, kwargs = mock_post.call_args
+        self.assertTrue(kwargs["stream"])
+        self.assertEqual(kwargs["headers"]["Accept"], "image/png")
+
+    def test_openai_image_sink_downloads_url(self):
+        """Test that OpenAI image URLs are downloaded in chunks."""
+        from apicenter.image.providers.openai import stream_openai
+
+        mock_client = MagicMock()
+        mock_client.images.generate.return_value.data = [MagicMock(url="https://img/1.png")]
+
+        download = MagicMock()
+        download.iter_content.return_value = iter([b"img", b"bytes"])
+        download.__enter__.return_value = download
+        session = MagicMock()
+        session.get.return_value = download
+
+        chunks = list(
+            stream_openai("dall-e-3", "A cat", credentials={}, client=mock_client, session=session)
+        )
+
+        self.assertEqual(chunks, [b"img", b"bytes"])
+        session.get.assert_called_once_with("https://img/1.png", stream=True)
+
+
+class TestAsyncSink(unittest.IsolatedAsyncioTestCase):
+    """Test writing results to sinks from the async API."""
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    async def test_aaudio_sink(self, mock_get):
+        """Test that apicenter.aaudio writes async chunks to the sink."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+
+        async def chunks(**kwargs):
+            yield b"one"
+            yield b"two"
+
+        buffer = io.BytesIO()
+        with patch("apicenter.audio.audio.astream_elevenlabs", side_effect=chunks):
+            written = await apicenter.aaudio(
+                "elevenlabs", "eleven_multilingual_v2", "Hi", sink=buffer
+            )
+
+        self.assertEqual(written, 6)
+        self.assertEqual(buffer.getvalue(), b"onetwo")
+        await apicenter.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Test the percentile sketch and per-model percentiles in request metrics."""
+
+import json
+import random
+import unittest
+
+from apicenter.core.metrics import (
+    MetricsAggregator,
+    PrometheusExporter,
+    RequestRecord,
+    merge_snapshots,
+    snapshot_percentiles,
+)
+from apicenter.core.sketch import DDSketch
+
+
+class TestDDSketch(unittest.TestCase):
+    """Test the percentile sketch."""
+
+    def setUp(self):
+        """Draw a long-tailed sample like real request latencies."""
+        rng = random.Random(7)
+        self.values = [rng.lognormvariate(0, 1.5) for _ in range(20000)]
+
+    def exact(self, q):
+        """Return the exact quantile of the sample."""
+        ordered = sorted(self.values)
+        return ordered[int(q * (len(ordered) - 1))]
+
+    def test_relative_accuracy(self):
+        """Test that every quantile is within the sketch's relative error."""
+        sketch = DDSketch(relative_accuracy=0.01)
+        for value in self.values:
+            sketch.add(value)
+
+        for q in (0.5, 0.9, 0.99, 0.999):
+            self.assertAlmostEqual(sketch.quantile(q) / self.exact(q), 1, delta=0.02)
+        self.assertEqual(sketch.quantile(1), max(self.values))
+        self.assertEqual(sketch.percentiles()["count"], len(self.values))
+        self.assertEqual(set(sketch.percentiles()), {"p50", "p90", "p99", "p999", "count"})
+
+    def test_bounded_memory(self):
+        """Test that the number of buckets never exceeds max_bins."""
+        sketch = DDSketch(max_bins=64)
+        for value in self.values:
+            sketch.add(value)
+        self.assertLessEqual(len(sketch.bins), 64)
+        self.assertAlmostEqual(sketch.quantile(0.999) / self.exact(0.999), 1, delta=0.02)
+
+    def test_merge_and_serialize(self):
+        """Test that halves merged after a JSON round trip equal the whole."""
+        whole, left, right = DDSketch(), DDSketch(), DDSketch()
+        for i, value in enumerate(self.values):
+            whole.add(value)
+            (left if i % 2 else right).add(value)
+
+        merged = DDSketch.from_dict(json.loads(json.dumps(left.to_dict())))
+        merged.merge(right)
+        self.assertEqual(merged.count, whole.count)
+        self.assertEqual(merged.quantile(0.99), whole.quantile(0.99))
+
+        with self.assertRaises(ValueError):
+            merged.merge(DDSketch(relative_accuracy=0.05))
+
+    def test_empty_and_zero(self):
+        """Test an empty sketch and values too small to index."""
+        sketch = DDSketch()
+        self.assertIsNone(sketch.quantile(0.5))
+        for value in (0.0, 2.0, 2.0):
+            sketch.add(value)
+        self.assertEqual(sketch.quantile(0.25), 0.0)
+        self.assertAlmostEqual(sketch.quantile(0.75), 2.0, delta=0.02)
+
+
+class TestMetricsPercentiles(unittest.TestCase):
+    """Test per-model percentiles in request metrics."""
+
+    def make_aggregator(self, latencies):
+        """Return an aggregator with one streamed request per latency."""
+        aggregator = MetricsAggregator()
+        for latency in latencies:
+            aggregator.add(
+                RequestRecord(
+                    "text",
+                    "openai",
+                    "gpt-4",
+                    stream=True,
+                    latency=latency,
+                    ttfb=0.1,
+                    output_tokens=100,
+                )
+            )
+        return aggregator
+
+    def test_percentiles(self):
+        """Test latency, ttfb and tokens/second percentiles for a model."""
+        aggregator = self.make_aggregator([1.1] * 990 + [10.1] * 10)
+        result = aggregator.percentiles()["text/openai/gpt-4"]
+
+        self.assertAlmostEqual(result["latency"]["p99"], 1.1, delta=0.02)
+        self.assertAlmostEqual(result["latency"]["p999"], 10.1, delta=0.2)
+        self.assertAlmostEqual(result["ttfb"]["p99"], 0.1, delta=0.002)
+        # 100 tokens over the second after the first event
+        self.assertAlmostEqual(result["tokens_per_second"]["p50"], 100, delta=2)
+
+    def test_fleet_snapshots(self):
+        """Test that snapshots from several processes merge into fleet-wide tails."""
+        fast = self.make_aggregator([1.0] * 900).snapshot()
+        slow = self.make_aggregator([5.0] * 100).snapshot()
+        fleet = merge_snapshots([json.loads(json.dumps(fast)), slow])
+
+        latency = snapshot_percentiles(fleet)["text/openai/gpt-4"]["latency"]
+        self.assertEqual(latency["count"], 1000)
+        self.assertAlmostEqual(latency["p50"], 1.0, delta=0.02)
+        self.assertAlmostEqual(latency["p99"], 5.0, delta=0.1)
+
+    def test_prometheus_quantiles(self):
+        """Test that percentiles are exported as gauges with a quantile label."""
+        text = PrometheusExporter(self.make_aggregator([1.1] * 10)).render()
+        self.assertIn("# TYPE apicenter_request_latency_quantile_seconds gauge", text)
+        self.assertIn(
+            'apicenter_request_latency_quantile_seconds{mode="text",provider="openai",'
+            'model="gpt-4",quantile="0.999"}',
+            text,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
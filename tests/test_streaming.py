@@ -0,0 +1,246 @@
+"""Test streaming text generation across providers."""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from apicenter.core.streaming import StreamSummary, TextDelta
+
+
+def openai_chunk(content=None, finish_reason=None, usage=None, choices=True):
+    """Build a fake OpenAI stream chunk."""
+    delta = SimpleNamespace(content=content)
+    choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+    return SimpleNamespace(choices=[choice] if choices else [], usage=usage)
+
+
+def anthropic_events():
+    """Build a fake sequence of Anthropic stream events."""
+    return [
+        SimpleNamespace(
+            type="message_start",
+            message=SimpleNamespace(usage=SimpleNamespace(input_tokens=12)),
+        ),
+        SimpleNamespace(
+            type="content_block_delta", delta=SimpleNamespace(type="text_delta", text="Hel")
+        ),
+        SimpleNamespace(
+            type="content_block_delta", delta=SimpleNamespace(type="text_delta", text="lo")
+        ),
+        SimpleNamespace(
+            type="message_delta",
+            delta=SimpleNamespace(stop_reason="end_turn"),
+            usage=SimpleNamespace(output_tokens=2),
+        ),
+        SimpleNamespace(type="message_stop"),
+    ]
+
+
+class TestStreaming(unittest.TestCase):
+    """Test streaming text generation across providers."""
+
+    def test_stream_openai(self):
+        """Test that OpenAI chunks become deltas and a summary with usage."""
+        from apicenter.text.providers.openai import stream_openai
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value = iter(
+            [
+                openai_chunk("Hello"),
+                openai_chunk(" world", finish_reason="stop"),
+                openai_chunk(
+                    choices=False,
+                    usage=SimpleNamespace(prompt_tokens=5, completion_tokens=2),
+                ),
+            ]
+        )
+
+        events = list(stream_openai("gpt-4", "Hi", credentials={}, client=mock_client))
+
+        self.assertEqual(events[:2], [TextDelta("Hello"), TextDelta(" world")])
+        summary = events[-1]
+        self.assertIsInstance(summary, StreamSummary)
+        self.assertEqual(summary.text, "Hello world")
+        self.assertEqual(summary.finish_reason, "stop")
+        self.assertEqual(summary.usage, {"input_tokens": 5, "output_tokens": 2, "total_tokens": 7})
+
+        # Check that streaming with usage reporting was requested
+        args, kwargs = mock_client.chat.completions.create.call_args
+        self.assertTrue(kwargs["stream"])
+        self.assertEqual(kwargs["stream_options"], {"include_usage": True})
+
+    def test_stream_anthropic(self):
+        """Test that Anthropic events become deltas and a summary with usage."""
+        from apicenter.text.providers.anthropic import stream_anthropic
+
+        mock_client = MagicMock()
+        mock_client.messages.create.return_value = iter(anthropic_events())
+
+        events = list(
+            stream_anthropic("claude-3-haiku-20240307", "Hi", credentials={}, client=mock_client)
+        )
+
+        self.assertEqual(events[:2], [TextDelta("Hel"), TextDelta("lo")])
+        self.assertEqual(events[-1].text, "Hello")
+        self.assertEqual(events[-1].finish_reason, "end_turn")
+        self.assertEqual(events[-1].usage["total_tokens"], 14)
+
+    @patch("ollama.chat")
+    def test_stream_ollama(self, mock_chat):
+        """Test that Ollama partial messages become deltas and a summary."""
+        from apicenter.text.providers.ollama import stream_ollama
+
+        mock_chat.return_value = iter(
+            [
+                {"message": {"content": "Bon"}, "done": False},
+                {"message": {"content": "jour"}, "done": False},
+                {
+                    "message": {"content": ""},
+                    "done": True,
+                    "done_reason": "stop",
+                    "prompt_eval_count": 4,
+                    "eval_count": 2,
+                },
+            ]
+        )
+
+        events = list(stream_ollama("llama3", "Hi", temperature=0))
+
+        self.assertEqual(events[:2], [TextDelta("Bon"), TextDelta("jour")])
+        self.assertEqual(events[-1].text, "Bonjour")
+        self.assertEqual(events[-1].finish_reason, "stop")
+        self.assertEqual(events[-1].usage["output_tokens"], 2)
+        self.assertTrue(mock_chat.call_args[1]["stream"])
+
+    @patch("ollama.chat")
+    def test_call_ollama_with_stream_flag(self, mock_chat):
+        """Test that call_ollama joins streamed parts instead of failing."""
+        from apicenter.text.providers.ollama import call_ollama
+
+        mock_chat.return_value = iter(
+            [{"message": {"content": "a"}}, {"message": {"content": "b"}}]
+        )
+
+        self.assertEqual(call_ollama("llama3", "Hi", stream=True), "ab")
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.stream_openai")
+    def test_apicenter_text_stream(self, mock_stream, mock_get_credentials):
+        """Test that apicenter.text_stream routes to the provider stream."""
+        from apicenter import apicenter
+
+        mock_get_credentials.return_value = {"api_key": "test-key"}
+        mock_stream.return_value = iter([TextDelta("x"), StreamSummary("x")])
+
+        events = list(apicenter.text_stream("openai", "gpt-4", "Hi"))
+        self.assertEqual(events, [TextDelta("x"), StreamSummary("x")])
+
+        # Check that unsupported providers are rejected up front
+        from apicenter.text.text import TextProvider
+
+        with self.assertRaises(ValueError):
+            TextProvider("deepseek", "deepseek-chat", "Hi").stream()
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.stream_openai")
+    def test_text_stream_uses_limits_and_retries(self, mock_stream, mock_get_credentials):
+        """Test that text_stream is retried and holds a concurrency slot until closed."""
+        from apicenter import apicenter
+        from apicenter.core.errors import ServerError
+        from apicenter.core.retry import RetryPolicy
+
+        mock_get_credentials.return_value = {"api_key": "test-key"}
+        mock_stream.side_effect = [
+            ServerError("503"),
+            iter([TextDelta("x"), StreamSummary("x")]),
+        ]
+        apicenter.retry_policies.set("openai", RetryPolicy(sleep=lambda seconds: None))
+        apicenter.concurrency.enable("openai", initial=1, max_limit=1)
+        apicenter.breakers.enable("openai", min_calls=1, cooldown=60)
+        self.addCleanup(apicenter.retry_policies.reset)
+        self.addCleanup(apicenter.concurrency.disable)
+        self.addCleanup(apicenter.breakers.disable)
+
+        # Opening the stream failed once and was retried
+        events = apicenter.text_stream("openai", "gpt-4", "Hi")
+        self.assertEqual(mock_stream.call_count, 2)
+        self.assertEqual(apicenter.retry_stats()["openai"]["retries"], 1)
+
+        # The slot is held until the stream is closed, and the breaker sees the outcome
+        self.assertEqual(next(events), TextDelta("x"))
+        self.assertEqual(apicenter.concurrency_stats()["openai"]["in_flight"], 1)
+        events.close()
+        self.assertEqual(apicenter.concurrency_stats()["openai"]["in_flight"], 0)
+        self.assertEqual(apicenter.breaker_stats()["text/openai/gpt-4"]["failure_rate"], 0.0)
+
+
+class TestAsyncStreaming(unittest.IsolatedAsyncioTestCase):
+    """Test asynchronous streaming text generation."""
+
+    async def test_astream_openai(self):
+        """Test that async OpenAI streams yield deltas and a summary."""
+        from apicenter.text.providers.openai import astream_openai
+
+        async def chunks():
+            yield openai_chunk("Hi", finish_reason="stop")
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(return_value=chunks())
+
+        events = [
+            event
+            async for event in astream_openai("gpt-4", "Hi", credentials={}, client=mock_client)
+        ]
+
+        self.assertEqual(
+            events, [TextDelta("Hi"), StreamSummary("Hi", "stop", {}, "openai", "gpt-4")]
+        )
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    async def test_apicenter_atext_stream(self, mock_get):
+        """Test that apicenter.atext_stream relays the async provider stream."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+
+        async def events(**kwargs):
+            yield TextDelta("a")
+            yield StreamSummary("a")
+
+        with patch("apicenter.text.text.astream_anthropic", side_effect=events):
+            received = [
+                event
+                async for event in apicenter.atext_stream(
+                    "anthropic", "claude-3-haiku-20240307", "Hi"
+                )
+            ]
+
+        self.assertEqual(received, [TextDelta("a"), StreamSummary("a")])
+        await apicenter.aclose()
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    async def test_atext_stream_holds_slot_until_closed(self, mock_get):
+        """Test that atext_stream takes a concurrency slot and frees it when closed early."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        apicenter.concurrency.enable("anthropic", initial=1, max_limit=1)
+        self.addCleanup(apicenter.concurrency.disable)
+
+        async def events(**kwargs):
+            yield TextDelta("a")
+            yield TextDelta("b")
+            yield StreamSummary("ab")
+
+        with patch("apicenter.text.text.astream_anthropic", side_effect=events):
+            stream = apicenter.atext_stream("anthropic", "claude-3-haiku-20240307", "Hi")
+            self.assertEqual(await stream.__anext__(), TextDelta("a"))
+            self.assertEqual(apicenter.concurrency_stats()["anthropic"]["in_flight"], 1)
+            await stream.aclose()
+
+        self.assertEqual(apicenter.concurrency_stats()["anthropic"]["in_flight"], 0)
+        await apicenter.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Test submitting generations to the shared executor."""
+
+import threading
+import unittest
+from unittest.mock import patch
+
+
+class TestSubmit(unittest.TestCase):
+    """Test submitting generations to the shared executor."""
+
+    def setUp(self):
+        """Use a dedicated APICenter with a single worker."""
+        from apicenter import APICenter
+
+        self.apicenter = APICenter(max_workers=1)
+        self.addCleanup(self.apicenter.shutdown, wait=True, cancel_futures=True)
+
+    @patch("apicenter.apicenter.APICenter.text")
+    def test_submit_returns_future_and_runs_callback(self, mock_text):
+        """Test that submit returns a Future and invokes the callback with it."""
+        mock_text.return_value = "Paris"
+        seen = []
+
+        future = self.apicenter.submit(
+            "text", "openai", "gpt-4", "Capital of France?", callback=seen.append, temperature=0
+        )
+
+        self.assertEqual(future.result(timeout=5), "Paris")
+        mock_text.assert_called_once_with("openai", "gpt-4", "Capital of France?", temperature=0)
+        self.assertEqual(seen, [future])
+
+    @patch("apicenter.apicenter.APICenter.audio")
+    def test_queued_work_can_be_cancelled(self, mock_audio):
+        """Test that work waiting behind a busy worker can be cancelled."""
+        release = threading.Event()
+        mock_audio.side_effect = lambda *args, **kwargs: release.wait(5) and b"audio"
+
+        running = self.apicenter.submit("audio", "elevenlabs", "eleven_multilingual_v2", "a")
+        queued = self.apicenter.submit("audio", "elevenlabs", "eleven_multilingual_v2", "b")
+
+        self.assertTrue(queued.cancel())
+        release.set()
+        self.assertEqual(running.result(timeout=5), b"audio")
+        self.assertEqual(mock_audio.call_count, 1)
+
+    @patch("apicenter.apicenter.APICenter.image")
+    def test_errors_and_shutdown(self, mock_image):
+        """Test that errors surface on the Future and the executor restarts after shutdown."""
+        mock_image.side_effect = ValueError("boom")
+
+        future = self.apicenter.submit("image", "openai", "dall-e-3", "A cat")
+        with self.assertRaises(ValueError):
+            future.result(timeout=5)
+
+        # Unknown modes and providers are rejected before queueing
+        with self.assertRaises(ValueError):
+            self.apicenter.submit("video", "openai", "sora", "A cat")
+
+        executor = self.apicenter.get_executor()
+        self.apicenter.shutdown(wait=True)
+        self.assertIsNot(self.apicenter.get_executor(), executor)
+
+
+if __name__ == "__main__":
+    unittest.main()
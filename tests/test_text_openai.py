@@ -1,8 +1,8 @@
 """Test the OpenAI text provider."""
 
-import unittest
-from unittest.mock import patch, MagicMock
 import sys
+import unittest
+from unittest.mock import MagicMock, patch
 
 
 class TestOpenAI(unittest.TestCase):
@@ -52,7 +52,9 @@ class TestOpenAI(unittest.TestCase):
         self.assertEqual(result, "This is a test response")
 
         # Check that OpenAI was initialized correctly
-        mock_openai_class.assert_called_once_with(api_key="test_key", organization="test_org")
+        mock_openai_class.assert_called_once_with(
+            api_key="test_key", organization="test_org", max_retries=0
+        )
 
         # Get the call arguments
         mock_create.assert_called_once()
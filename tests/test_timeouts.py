@@ -0,0 +1,179 @@
+"""Test per-call timeouts and deadline propagation."""
+
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from apicenter.core.cache import make_key
+from apicenter.core.errors import RequestTimeoutError, ServerError
+from apicenter.core.retry import RetryPolicy
+
+
+class TestTimeouts(unittest.TestCase):
+    """Test per-call timeouts and deadline propagation."""
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_openai")
+    def test_timeout_and_deadline_reach_provider(self, mock_call, mock_get):
+        """Test that the attempt timeout is the smaller of timeout and the deadline left."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.return_value = "Hello"
+
+        apicenter.text("openai", "gpt-4", "Hi")
+        self.assertNotIn("timeout", mock_call.call_args[1])
+
+        apicenter.text("openai", "gpt-4", "Hi", timeout=5)
+        self.assertEqual(mock_call.call_args[1]["timeout"], 5)
+
+        apicenter.text("openai", "gpt-4", "Hi", timeout=5, deadline=1)
+        self.assertLessEqual(mock_call.call_args[1]["timeout"], 1)
+        self.assertNotIn("deadline", mock_call.call_args[1])
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_openai")
+    def test_deadline_caps_retries(self, mock_call, mock_get):
+        """Test that no retry starts past the deadline and a spent deadline raises at once."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.side_effect = ServerError("503", status_code=503)
+        policy = RetryPolicy(max_attempts=5, base_delay=0.5, sleep=lambda s: None)
+
+        with self.assertRaises(ServerError):
+            apicenter.text("openai", "gpt-4", "Hi", retry=policy, deadline=0.2)
+        self.assertEqual(mock_call.call_count, 1)
+
+        mock_call.reset_mock()
+        with self.assertRaises(RequestTimeoutError) as context:
+            apicenter.text("openai", "gpt-4", "Hi", retry=policy, deadline=0)
+        self.assertFalse(context.exception.retryable)
+        mock_call.assert_not_called()
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_openai")
+    @patch("apicenter.text.text.call_anthropic")
+    def test_deadline_shrinks_across_fallbacks(self, mock_anthropic, mock_openai, mock_get):
+        """Test that a fallback hop only gets what is left of the caller's deadline."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+
+        def fail(*args, **kwargs):
+            time.sleep(0.1)
+            raise ServerError("500")
+
+        mock_anthropic.side_effect = fail
+        mock_openai.return_value = "Hello"
+
+        result = apicenter.text(
+            "anthropic", "claude", "Hi", retry=False, deadline=1, fallbacks=[("openai", "gpt-4o")]
+        )
+        self.assertEqual(result, "Hello")
+        self.assertLessEqual(mock_anthropic.call_args[1]["timeout"], 1)
+        self.assertLessEqual(mock_openai.call_args[1]["timeout"], 0.9)
+
+    def test_cache_key_ignores_timeouts(self):
+        """Test that timeouts and deadlines do not split cache entries."""
+        self.assertEqual(
+            make_key("text", "openai", "gpt-4", "Hi", {"temperature": 0}),
+            make_key("text", "openai", "gpt-4", "Hi", {"temperature": 0, "timeout": 3}),
+        )
+
+    @patch("requests.Session.post")
+    def test_stability_timeout_pair(self, mock_post):
+        """Test that Stability requests cap the session's connect and read timeouts."""
+        from apicenter.image.providers.stability import call_stability
+
+        mock_post.return_value = MagicMock(status_code=200)
+        mock_post.return_value.json.return_value = {"artifacts": [{"base64": "aW1n"}]}
+        call_stability("stable-diffusion-v1-6", "A fox", {"api_key": "key"}, timeout=2)
+
+        self.assertEqual(mock_post.call_args[1]["timeout"], (2, 2))
+        self.assertNotIn("timeout", mock_post.call_args[1]["json"])
+
+    def test_elevenlabs_request_options(self):
+        """Test that ElevenLabs timeouts are passed in whole seconds through request_options."""
+        from apicenter.audio.providers.elevenlabs import build_params
+
+        params = build_params("eleven_multilingual_v2", timeout=2.5)
+        self.assertEqual(params["request_options"], {"max_retries": 0, "timeout_in_seconds": 3})
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.call_openai")
+    def test_deadline_bounds_queueing(self, mock_call, mock_get):
+        """Test that waits for a concurrency slot or rate limit budget end at the deadline."""
+        from apicenter import apicenter
+        from apicenter.core.errors import RateLimitExceeded
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_call.return_value = "Hello"
+        apicenter.concurrency.enable("openai", initial=1, max_limit=1)
+        self.addCleanup(apicenter.concurrency.disable)
+
+        # Hold the only slot so the call has to queue
+        limiter = apicenter.concurrency.get("openai")
+        self.assertTrue(limiter.acquire(timeout=0))
+        started = time.monotonic()
+        with self.assertRaises(RequestTimeoutError):
+            apicenter.text("openai", "gpt-4", "Hi", deadline=0.2, retry=False)
+        self.assertLess(time.monotonic() - started, 1)
+        limiter.release(0.1)
+        mock_call.assert_not_called()
+
+        # A blocking rate limit gives up when the budget frees up after the deadline
+        mock_get.return_value = {"api_key": "limited-key", "rate_limits": {"rpm": 1}}
+        self.addCleanup(apicenter.rate_limiter.reset)
+        self.assertEqual(apicenter.text("openai", "gpt-4", "Hi"), "Hello")
+        with self.assertRaises(RateLimitExceeded):
+            apicenter.text("openai", "gpt-4", "Hi", deadline=0.2, retry=False)
+        self.assertEqual(mock_call.call_count, 1)
+
+    def test_ollama_request_timeout(self):
+        """Test that an Ollama timeout is set on the request rather than on a new client."""
+        import httpx
+
+        from apicenter.text.providers.ollama import apply_request_timeout, call_ollama
+
+        client = MagicMock()
+        seen = []
+
+        def chat(**params):
+            """Record the timeout a request sent now would get."""
+            request = httpx.Request("POST", "http://localhost:11434/api/chat")
+            apply_request_timeout(request)
+            seen.append(request.extensions.get("timeout"))
+            return {"message": {"content": "Hello"}}
+
+        client.chat.side_effect = chat
+        with patch("ollama.Client") as mock_client:
+            self.assertEqual(call_ollama("llama3", "Hi", client=client, timeout=3), "Hello")
+            mock_client.assert_not_called()
+        self.assertEqual(seen[0]["read"], 3)
+        self.assertNotIn("timeout", client.chat.call_args[1].get("options", {}))
+
+        # Requests sent afterwards get the client's own timeout again
+        request = httpx.Request("POST", "http://localhost:11434/api/chat")
+        apply_request_timeout(request)
+        self.assertNotIn("timeout", request.extensions)
+
+
+class TestAsyncTimeouts(unittest.IsolatedAsyncioTestCase):
+    """Test timeouts in the async API."""
+
+    @patch("apicenter.core.credentials.CredentialsProvider.get_credentials")
+    @patch("apicenter.text.text.acall_openai")
+    async def test_atext_deadline(self, mock_acall, mock_get):
+        """Test that async requests pass the remaining deadline as the attempt timeout."""
+        from apicenter import apicenter
+
+        mock_get.return_value = {"api_key": "key"}
+        mock_acall.return_value = "Hello"
+
+        self.assertEqual(await apicenter.atext("openai", "gpt-4", "Hi", deadline=2), "Hello")
+        self.assertLessEqual(mock_acall.call_args[1]["timeout"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()